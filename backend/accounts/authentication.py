@@ -0,0 +1,177 @@
+# backend/accounts/authentication.py
+"""
+Stateless JWT authentication from the ``Authorization`` header or the
+``access_token`` cookie set at login.
+
+Tokens issued by ``accounts.tokens`` carry the profile claims, so the
+request user is a ``ClaimsUser`` built from the token and no user row is
+read. Endpoints that need the real model call ``get_full_user``, which is
+served from a short-lived per-worker cache (``USER_CACHE_TTL`` seconds).
+Older tokens without the claims need the model too, and read it through the
+same cache.
+
+A token is trusted until it expires, so deactivating a user takes effect
+at the latest after ``ACCESS_TOKEN_LIFETIME``.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from core.instrumentation import register_collector
+from .tokens import USER_CLAIMS
+
+User = get_user_model()
+
+# Upper bound on cached users per worker; the cache is dropped when full.
+USER_CACHE_MAX = 10000
+
+
+def _claim(name, default=''):
+    return cached_property(lambda self: self.token.get(name, default))
+
+
+class ClaimsUser(TokenUser):
+    """``request.user`` for tokens that carry the profile claims."""
+    email = _claim('email')
+    role = _claim('role', 'client')
+    preferred_language = _claim('preferred_language', 'en')
+    first_name = _claim('first_name')
+    last_name = _claim('last_name')
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+    def __str__(self):
+        return self.email
+
+
+def has_claims(token):
+    return all(claim in token for claim in USER_CLAIMS)
+
+
+def token_user_id(validated_token):
+    try:
+        return validated_token[api_settings.USER_ID_CLAIM]
+    except KeyError as e:
+        raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+
+def check_user(user, validated_token):
+    """The checks simplejwt runs on the user row of a token."""
+    if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    if api_settings.CHECK_REVOKE_TOKEN:
+        if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+
+class CookieJWTAuthentication(JWTAuthentication):
+    def get_raw_request_token(self, request):
+        """Return ``(raw token, from_cookie)``; the header wins over the cookie."""
+        header = self.get_header(request)
+        if header is not None:
+            return self.get_raw_token(header), False
+        cookie = request.COOKIES.get(settings.SIMPLE_JWT.get('AUTH_COOKIE', 'access_token'))
+        return (cookie.encode() if cookie else None), True
+
+    def get_request_token(self, request):
+        """Return ``(validated token, from_cookie)``, or ``None`` for an anonymous request."""
+        raw_token, from_cookie = self.get_raw_request_token(request)
+        if raw_token is None:
+            return None
+        try:
+            return self.get_validated_token(raw_token), from_cookie
+        except (InvalidToken, TokenError):
+            # The login cookie outlives its token; a stale one must not lock
+            # the visitor out of public endpoints. Bad headers still fail.
+            if from_cookie:
+                return None
+            raise
+
+    def authenticate(self, request):
+        token = self.get_request_token(request)
+        if token is None:
+            return None
+        validated_token, from_cookie = token
+        if from_cookie:
+            # Browsers attach cookies to cross-site requests on their own.
+            SessionAuthentication().enforce_csrf(request)
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        if has_claims(validated_token):
+            return ClaimsUser(validated_token)
+        user = user_cache.get(int(token_user_id(validated_token)))
+        check_user(user, validated_token)
+        return user
+
+
+class UserCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}  # id -> (expires, user)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        ttl = getattr(settings, 'USER_CACHE_TTL', 30)
+        now = time.monotonic()
+        entry = self._users.get(user_id)
+        if ttl > 0 and entry is not None and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        try:
+            user = User.objects.get(pk=user_id)
+        except User.DoesNotExist as e:
+            # Deleted since the token was issued.
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+        if ttl > 0:
+            with self._lock:
+                if len(self._users) >= USER_CACHE_MAX:
+                    self._users.clear()
+                self._users[user_id] = (now + ttl, user)
+        return user
+
+    def discard(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+user_cache = UserCache()
+
+
+def get_full_user(user):
+    """
+    The ``User`` model instance behind ``request.user``. Instances may be
+    shared between requests of this worker: treat them as read-only.
+    """
+    if isinstance(user, User):
+        return user
+    return user_cache.get(user.id)
+
+
+@register_collector
+def collect_metrics():
+    return [
+        ('traint_user_cache_size', 'gauge', 'Users held in the per-worker user cache.',
+         [({}, len(user_cache._users))]),
+        ('traint_user_cache_requests_total', 'counter', 'Per-worker user cache lookups.',
+         [({'result': 'hit'}, user_cache.hits), ({'result': 'miss'}, user_cache.misses)]),
+    ]
@@ -0,0 +1,30 @@
+# backend/accounts/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+
+User = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """``ModelBackend`` with password checks on the bounded hashing pool."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway so unknown emails take as long as wrong passwords.
+            hashing.make_password(password)
+            return None
+        valid, must_update = hashing.check_password(password, user.password)
+        if not valid or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            user.password = hashing.make_password(password)
+            user.save(update_fields=['password'])
+        return user
@@ -0,0 +1,104 @@
+# backend/accounts/hashing.py
+"""
+Password hashing on a bounded worker pool.
+
+PBKDF2 is deliberately expensive, and login/registration used to hash on
+the request thread, so a burst of credential requests could occupy every
+core of a worker. Hashes now run on ``PASSWORD_HASH_WORKERS`` threads
+(``hashlib`` releases the GIL while hashing, so request threads serving
+the catalog keep running). At most ``PASSWORD_HASH_QUEUE`` further hashes
+may wait; beyond that ``HashingUnavailable`` (503 with ``Retry-After``) is
+raised instead of queueing more work. Limits are per process.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework.exceptions import APIException
+
+from core.instrumentation import register_collector
+
+
+class HashingUnavailable(APIException):
+    status_code = 503
+    default_detail = 'Too many sign-in requests, please retry shortly.'
+    default_code = 'hashing_unavailable'
+
+    def __init__(self, wait, detail=None, code=None):
+        # DRF's exception handler turns ``wait`` into the Retry-After header.
+        super().__init__(detail, code)
+        self.wait = wait
+
+
+class HashPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._workers = 0
+        self.pending = 0  # running + queued
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def run(self, func, *args):
+        workers = settings.PASSWORD_HASH_WORKERS
+        if workers <= 0:
+            return func(*args)
+        with self._lock:
+            if self._executor is None:
+                self._workers = workers
+                self._executor = ThreadPoolExecutor(workers, thread_name_prefix='password-hash')
+            if self.pending >= self._workers + settings.PASSWORD_HASH_QUEUE:
+                self.rejected += 1
+                raise HashingUnavailable(wait=settings.PASSWORD_HASH_RETRY_AFTER)
+            self.pending += 1
+        submitted = time.perf_counter()
+
+        def task():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self.wait_seconds += waited
+            return func(*args)
+
+        try:
+            return self._executor.submit(task).result()
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    @property
+    def queue_depth(self):
+        return max(self.pending - self._workers, 0)
+
+
+pool = HashPool()
+
+
+def make_password(password):
+    return pool.run(hashers.make_password, password)
+
+
+def check_password(password, encoded):
+    """Return ``(valid, must_update)`` for ``password`` against the stored hash."""
+    def check():
+        upgrade = []
+        valid = hashers.check_password(password, encoded, setter=upgrade.append)
+        return valid, bool(upgrade)
+    return pool.run(check)
+
+
+@register_collector
+def collect_metrics():
+    return [
+        ('traint_password_hash_queue_depth', 'gauge', 'Password hashes waiting for a hashing worker.',
+         [({}, pool.queue_depth)]),
+        ('traint_password_hash_in_progress', 'gauge', 'Password hashes running or queued.',
+         [({}, pool.pending)]),
+        ('traint_password_hashes_total', 'counter', 'Password hashes by outcome.',
+         [({'result': 'completed'}, pool.completed), ({'result': 'rejected'}, pool.rejected)]),
+        ('traint_password_hash_wait_seconds_total', 'counter', 'Time hashes spent queued for a worker.',
+         [({}, pool.wait_seconds)]),
+    ]
@@ -0,0 +1,96 @@
+# backend/accounts/management/commands/bench_auth_load.py
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from core.benchmarking import summarize, test_database
+from fitness.models import Exercise
+from programs.seeding import Seeder
+
+# (label, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE)
+MODES = [
+    ('request thread', 0, 0),
+    ('pool, queue 64', 2, 64),
+    ('pool, queue 4', 2, 4),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Flood the login endpoint with wrong-password attempts from several threads while another thread '
+        'times a catalog endpoint, with passwords hashed on the request threads or on the bounded hashing '
+        'pool. Throttles are disabled; runs in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attackers', type=int, default=8, help='Threads posting logins.')
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--output', help='Write results to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        with test_database():
+            Seeder(log=lambda message: None).run(clients=5, programs=5, plans=5, exercises=50)
+            catalog_path = reverse('exercise-detail', args=[Exercise.objects.order_by('id').first().pk])
+            results = {}
+            for label, workers, queue in MODES:
+                with override_settings(PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_QUEUE=queue,
+                                       AUTH_THROTTLE_IP_RATE=None, AUTH_THROTTLE_EMAIL_RATE=None):
+                    results[label] = self.measure(catalog_path, options['attackers'], options['seconds'])
+                self.stderr.write(
+                    f'{label}: catalog p95={results[label]["catalog"]["p95_ms"]}ms, '
+                    f'logins {results[label]["logins"]}'
+                )
+
+        output = json.dumps({'meta': {key: options[key] for key in ('attackers', 'seconds')}, 'results': results},
+                            indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def measure(self, catalog_path, attackers, seconds):
+        from accounts import hashing
+
+        hashing.pool = hashing.HashPool()  # size the pool for this mode
+        stop = threading.Event()
+        statuses, timings, lock = {}, [], threading.Lock()
+        login = {'email': 'client1@example.com', 'password': 'not-the-password'}
+
+        def attack():
+            client = Client()
+            try:
+                while not stop.is_set():
+                    status = client.post(reverse('login'), login).status_code
+                    with lock:
+                        statuses[status] = statuses.get(status, 0) + 1
+            finally:
+                connection.close()
+
+        def browse():
+            client = Client()
+            try:
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    client.get(catalog_path)
+                    timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attack) for _ in range(attackers)] + [threading.Thread(target=browse)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return {
+            'catalog': {'requests': len(timings), **summarize(timings)},
+            'logins': {str(status): count for status, count in sorted(statuses.items())},
+        }
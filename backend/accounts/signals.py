@@ -0,0 +1,13 @@
+# backend/accounts/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Other workers pick the change up when their entry expires.
+    user_cache.discard(instance.pk)
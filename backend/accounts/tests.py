@@ -1,3 +1,178 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from programs.models import Program, ProgramCategory, UserPlan
+from . import hashing
+from .authentication import ClaimsUser, get_full_user, user_cache
+from .models import User
+from .tokens import UserRefreshToken
+
+
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            email='lifter@example.com', password='liftpass123', first_name='Ada', role='coach',
+            preferred_language='fr',
+        )
+        self.profile = {
+            'id': self.user.id, 'email': 'lifter@example.com', 'first_name': 'Ada', 'last_name': '',
+            'preferred_language': 'fr', 'role': 'coach',
+        }
+
+    def test_login_cookie_authenticates_without_user_lookup(self):
+        response = self.client.post(reverse('login'), {'email': 'lifter@example.com', 'password': 'liftpass123'})
+        self.assertEqual(response.status_code, 200)
+        claims = AccessToken(response.cookies['access_token'].value)
+        self.assertEqual((claims['email'], claims['role']), ('lifter@example.com', 'coach'))
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user-profile'))
+        self.assertEqual(response.json(), self.profile)
+
+    def test_header_tokens_with_and_without_claims(self):
+        token = UserRefreshToken.for_user(self.user)
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user-profile'), HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.assertEqual(response.json(), self.profile)
+
+        refreshed = self.client.post(reverse('token_refresh'), {'refresh': str(token)}).json()['access']
+        self.assertEqual(AccessToken(refreshed)['preferred_language'], 'fr')
+
+        # Tokens issued before the claims existed still work, via the user cache.
+        legacy = RefreshToken.for_user(self.user).access_token
+        with self.assertNumQueries(2):  # the user row once, then the plans
+            response = self.client.get(reverse('user-profile'), HTTP_AUTHORIZATION=f'Bearer {legacy}')
+            self.assertEqual(response.json(), self.profile)
+            response = self.client.get(reverse('user-plans'), HTTP_AUTHORIZATION=f'Bearer {legacy}')
+            self.assertEqual(response.status_code, 200)
+
+        self.user.delete()
+        response = self.client.get(reverse('user-profile'), HTTP_AUTHORIZATION=f'Bearer {legacy}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_cookie_authenticated_writes_require_csrf(self):
+        client = Client(enforce_csrf_checks=True)
+        client.cookies['access_token'] = str(UserRefreshToken.for_user(self.user).access_token)
+        program = Program.objects.create(
+            name={'en': 'P'}, description={}, difficulty='beginner',
+            category=ProgramCategory.objects.create(name={'en': 'C'}), created_by=self.user,
+        )
+        data = {'user': self.user.id, 'program': program.id}
+        self.assertEqual(client.post(reverse('user-plan-create'), data).status_code, 403)
+
+        client.cookies['csrftoken'] = 'a' * 32
+        response = client.post(reverse('user-plan-create'), data, HTTP_X_CSRFTOKEN='a' * 32)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(UserPlan.objects.filter(user=self.user, program=program).exists())
+
+    def test_stale_cookie_is_anonymous_but_bad_header_fails(self):
+        paths = [reverse(name) for name in ('exercise-list', 'program-list', 'exercise-search')]
+        paths.append(reverse('exercise-autocomplete') + '?q=sq')
+        self.client.cookies['access_token'] = 'garbage'
+        for path in paths:
+            self.assertEqual(self.client.get(path).status_code, 200, path)
+        with override_settings(ROOT_URLCONF='core.async_urls'):
+            self.assertEqual(self.client.get(paths[0]).status_code, 200)
+        self.assertEqual(self.client.get(reverse('user-profile')).status_code, 401)
+        self.assertEqual(self.client.get(paths[0], HTTP_AUTHORIZATION='Bearer garbage').status_code, 401)
+
+    @override_settings(USER_CACHE_TTL=30)
+    def test_full_user_cache(self):
+        token_user = ClaimsUser(UserRefreshToken.for_user(self.user).access_token)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_full_user(token_user), self.user)
+            self.assertIs(get_full_user(token_user), get_full_user(token_user))
+
+        self.user.first_name = 'Grace'
+        self.user.save()
+        self.assertEqual(get_full_user(token_user).first_name, 'Grace')
+
+        with override_settings(USER_CACHE_TTL=0), self.assertNumQueries(2):
+            get_full_user(token_user)
+            get_full_user(token_user)
+
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            get_full_user(token_user)
+
+
+class CredentialEndpointTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(email='lifter@example.com', password='liftpass123')
+
+    def login(self, email, password='wrong', **extra):
+        return self.client.post(reverse('login'), {'email': email, 'password': password}, **extra)
+
+    @override_settings(AUTH_THROTTLE_IP_RATE='4/min', AUTH_THROTTLE_EMAIL_RATE='2/min')
+    def test_token_buckets_per_email_and_ip(self):
+        self.assertEqual(self.login('lifter@example.com').status_code, 401)
+        self.assertEqual(self.login('LIFTER@example.com ').status_code, 401)
+        response = self.login('lifter@example.com', 'liftpass123')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+
+        self.assertEqual(self.login('other@example.com').status_code, 401)
+        response = self.client.post(reverse('register'), {'email': 'new@example.com', 'password': 'newpass123'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(self.login('other@example.com', REMOTE_ADDR='10.0.0.2').status_code, 401)
+        # A client-supplied X-Forwarded-For does not open a new bucket.
+        response = self.login('third@example.com', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(response.status_code, 429)
+        with override_settings(REST_FRAMEWORK={'NUM_PROXIES': 1}):
+            response = self.login('third@example.com', HTTP_X_FORWARDED_FOR='203.0.113.9')
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post(reverse('token_obtain_pair'), {'email': 'x@example.com', 'password': 'x'},
+                                    REMOTE_ADDR='10.0.0.3')
+        self.assertEqual(response.status_code, 401)
+        # Bodies that are not JSON objects are rejected, not a server error.
+        for name in ('login', 'register'):
+            for body in ('[]', '"x"'):
+                response = self.client.post(reverse(name), body, content_type='application/json',
+                                            REMOTE_ADDR='10.0.0.4')
+                self.assertIn(response.status_code, (400, 401), (name, body))
+        with override_settings(METRICS_TOKEN='secret'):
+            body = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('traint_auth_throttled_total{scope="email"}', body)
+        self.assertIn('traint_password_hash_queue_depth 0', body)
+
+    @override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=0)
+    def test_full_hashing_pool_sheds_load(self):
+        pool = hashing.HashPool()
+        started, release = threading.Event(), threading.Event()
+
+        def occupy():
+            started.set()
+            release.wait(5)
+
+        with mock.patch.object(hashing, 'pool', pool):
+            worker = threading.Thread(target=pool.run, args=(occupy,))
+            worker.start()
+            started.wait(5)
+            try:
+                self.assertEqual(pool.queue_depth, 0)
+                response = self.login('lifter@example.com', 'liftpass123')
+                self.assertEqual(response.status_code, 503)
+                self.assertEqual(response.headers['Retry-After'], '1')
+                response = self.client.post(reverse('register'), {'email': 'new@example.com', 'password': 'newpass'})
+                self.assertEqual(response.status_code, 503)
+            finally:
+                release.set()
+                worker.join()
+            self.assertEqual((pool.rejected, pool.completed, pool.pending), (2, 1, 0))
+
+            response = self.client.post(reverse('register'), {'email': 'new@example.com', 'password': 'newpass123'})
+            self.assertEqual(response.status_code, 201)
+            self.assertTrue(User.objects.get(email='new@example.com').check_password('newpass123'))
+            self.assertEqual(self.login('new@example.com', 'newpass123').status_code, 200)
+            self.assertEqual(self.login('missing@example.com', 'newpass123').status_code, 401)
+            self.assertEqual(pool.completed, 4)
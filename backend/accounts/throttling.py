@@ -0,0 +1,99 @@
+# backend/accounts/throttling.py
+"""
+Token-bucket throttles for the credential endpoints.
+
+Each client IP and each submitted email gets a bucket of ``<n>/<period>``
+tokens (``AUTH_THROTTLE_IP_RATE`` / ``AUTH_THROTTLE_EMAIL_RATE``): up to
+``n`` attempts in a burst, refilled at ``n`` per period. Buckets live in the
+default cache, which must be shared between workers for the limits to be
+global. Updates are read-modify-write, so concurrent requests may overshoot
+a bucket by a few attempts.
+"""
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from core.instrumentation import register_collector
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_lock = threading.Lock()
+rejections = Counter()
+
+
+def parse_rate(rate):
+    """``'5/min'`` -> ``(5, 60)``; ``None`` disables the throttle."""
+    if not rate:
+        return None
+    num, period = rate.split('/')
+    return int(num), PERIODS[period[0]]
+
+
+class TokenBucketThrottle(BaseThrottle, ABC):
+    scope = None
+    rate_setting = None
+
+    @abstractmethod
+    def get_key(self, request):
+        """The bucket of ``request`` within ``scope``, or ``None`` to let it through."""
+
+    def allow_request(self, request, view):
+        rate = parse_rate(getattr(settings, self.rate_setting))
+        key = self.get_key(request)
+        if rate is None or key is None:
+            return True
+        capacity, period = rate
+        refill = capacity / period
+        cache_key = f'throttle:{self.scope}:{key}'
+
+        now = time.time()
+        tokens, updated = cache.get(cache_key, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * refill)
+        if tokens < 1:
+            self.retry_after = (1 - tokens) / refill
+            with _lock:
+                rejections[self.scope] += 1
+            return False
+        cache.set(cache_key, (tokens - 1, now), timeout=period)
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class IPThrottle(TokenBucketThrottle):
+    scope = 'ip'
+    rate_setting = 'AUTH_THROTTLE_IP_RATE'
+
+    def get_key(self, request):
+        # REMOTE_ADDR, or X-Forwarded-For only as far as NUM_PROXIES trusts it.
+        return self.get_ident(request)
+
+
+class EmailThrottle(TokenBucketThrottle):
+    scope = 'email'
+    rate_setting = 'AUTH_THROTTLE_EMAIL_RATE'
+
+    def get_key(self, request):
+        # JSON bodies may be lists or scalars; only objects carry an email.
+        email = request.data.get('email') if isinstance(request.data, dict) else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+AUTH_THROTTLES = [IPThrottle, EmailThrottle]
+
+
+@register_collector
+def collect_metrics():
+    return [
+        ('traint_auth_throttled_total', 'counter', 'Login/registration attempts rejected by a throttle.',
+         [({'scope': throttle.scope}, rejections[throttle.scope]) for throttle in AUTH_THROTTLES]),
+    ]
@@ -0,0 +1,25 @@
+# backend/accounts/tokens.py
+"""
+JWTs carrying the profile claims that ``CookieJWTAuthentication`` needs to
+authenticate a request without loading the user row.
+
+Claims are copied at issuance; access tokens minted by a refresh carry the
+refresh token's claims, so profile changes show up at the next login.
+"""
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.tokens import RefreshToken
+
+USER_CLAIMS = ('email', 'role', 'preferred_language', 'first_name', 'last_name', 'is_staff')
+
+
+class UserRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = UserRefreshToken
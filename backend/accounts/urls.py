@@ -8,4 +8,9 @@ urlpatterns = [
     path('register/', views.register_user, name='register'),
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.user_profile, name='user-profile'),
-]
\ No newline at end of file
+]
+
+# Served by core.async_urls in front of the routes above.
+async_urlpatterns = [
+    path('profile/', views.user_profile_async, name='user-profile'),
+]
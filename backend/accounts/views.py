@@ -1,18 +1,23 @@
 # backend/accounts/views.py
 from django.contrib.auth import get_user_model
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, throttle_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.middleware.csrf import get_token
+from django.http import JsonResponse
+from . import hashing
+from .throttling import AUTH_THROTTLES
 
 
 User = get_user_model()
 
 @api_view(['POST'])
+@throttle_classes(AUTH_THROTTLES)
 def register_user(request):
-    email = request.data.get('email')
-    password = request.data.get('password')
+    data = request.data if isinstance(request.data, dict) else {}
+    email = data.get('email')
+    password = data.get('password')
     
     if not email or not password:
         return Response({'error': 'Email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
@@ -20,7 +25,8 @@ def register_user(request):
     if User.objects.filter(email=email).exists():
         return Response({'error': 'Email already registered'}, status=status.HTTP_400_BAD_REQUEST)
     
-    user = User.objects.create_user(email=email, password=password)
+    user = User(email=User.objects.normalize_email(email), password=hashing.make_password(password))
+    user.save()
     return Response({'message': 'User created successfully'}, status=status.HTTP_201_CREATED)
 
 
@@ -31,18 +37,22 @@ from rest_framework.response import Response
 from rest_framework import status
 
 class CustomTokenObtainPairView(TokenObtainPairView):
+    throttle_classes = AUTH_THROTTLES
+
     def post(self, request, *args, **kwargs):
         # ✅ Import here — safe!
-        from rest_framework_simplejwt.tokens import RefreshToken
+        from .tokens import UserRefreshToken
 
         serializer = self.get_serializer(data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
+        except hashing.HashingUnavailable:
+            raise
         except Exception as e:
             return Response({'detail': 'Invalid credentials'}, status=status.HTTP_401_UNAUTHORIZED)
 
         user = serializer.user
-        refresh = RefreshToken.for_user(user)
+        refresh = UserRefreshToken.for_user(user)
         access = refresh.access_token
 
         response = Response({'detail': 'Login successful'}, status=status.HTTP_200_OK)
@@ -74,8 +84,10 @@ def logout_view(request):
 
 
 # backend/accounts/views.py
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
+from core import async_api
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
 
@@ -92,4 +104,18 @@ def user_profile(request):
         'last_name': getattr(user, 'last_name', ''),
         'preferred_language': user.preferred_language,
         'role': user.role,
-    })
\ No newline at end of file
+    })
+
+
+@require_GET
+@async_api.authenticated
+async def user_profile_async(request):
+    user = request.user
+    return async_api.json_response({
+        'id': user.id,
+        'email': user.email,
+        'first_name': getattr(user, 'first_name', ''),
+        'last_name': getattr(user, 'last_name', ''),
+        'preferred_language': user.preferred_language,
+        'role': user.role,
+    })
@@ -9,6 +9,7 @@ class Coach(models.Model):
     experience_years = models.PositiveIntegerField(default=0)
     is_featured = models.BooleanField(default=False)
     photo = models.ImageField(upload_to='coaches/', blank=True, null=True)
+    photo_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core/images.py
 
     def __str__(self):
         return f"Coach {self.user.email}"
\ No newline at end of file
@@ -0,0 +1,16 @@
+# backend/coaches/signals.py
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from core import images
+from .models import Coach
+
+
+@receiver(pre_save, sender=Coach)
+def coach_saving(sender, instance, **kwargs):
+    images.refresh(instance, 'photo', 'photo_renditions')
+
+
+@receiver(post_save, sender=Coach)
+def coach_saved(sender, instance, using, **kwargs):
+    images.discard_stale(instance, using)
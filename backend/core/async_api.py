@@ -0,0 +1,75 @@
+# backend/core/async_api.py
+"""
+Helpers for the async (ASGI) read views.
+
+DRF views are synchronous, so under an ASGI server each request occupies a
+worker thread. The ``*_async`` views are plain Django coroutines instead:
+they use the async ORM, render with DRF's ``JSONRenderer`` so the bytes
+match the sync views, and authenticate with ``AsyncJWTAuthentication``,
+which only touches the database for tokens without profile claims.
+They are routed by ``core.async_urls`` (``ASYNC_READ_VIEWS=true``).
+"""
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.authentication import ClaimsUser, CookieJWTAuthentication, check_user, has_claims, token_user_id
+
+
+def json_response(data, status=200, **kwargs):
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json', **kwargs)
+
+
+class AsyncJWTAuthentication(CookieJWTAuthentication):
+    """``CookieJWTAuthentication`` with the fallback user lookup on the async ORM."""
+
+    async def aauthenticate(self, request):
+        # Header/cookie parsing and signature checks do no I/O.
+        token = self.get_request_token(request)
+        if token is None:
+            return None
+        validated_token, from_cookie = token
+        if from_cookie:
+            SessionAuthentication().enforce_csrf(request)
+        if has_claims(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = token_user_id(validated_token)
+        try:
+            user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+        check_user(user, validated_token)
+        return user
+
+
+def authenticated(view):
+    """Async counterpart of ``@permission_classes([IsAuthenticated])`` with JWT auth."""
+    authenticator = AsyncJWTAuthentication()
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            result = await authenticator.aauthenticate(request)
+        except AuthenticationFailed as e:
+            return _unauthorized(request, authenticator, e.detail)
+        except PermissionDenied as e:
+            return json_response({'detail': e.detail}, status=403)
+        if result is None:
+            return _unauthorized(request, authenticator, {'detail': _('Authentication credentials were not provided.')})
+        request.user, request.auth = result
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _unauthorized(request, authenticator, detail):
+    if not isinstance(detail, dict):
+        detail = {'detail': detail}
+    return json_response(detail, status=401, headers={'WWW-Authenticate': authenticator.authenticate_header(request)})
@@ -0,0 +1,17 @@
+# backend/core/async_urls.py
+"""
+ROOT_URLCONF for ASGI deployments (``ASYNC_READ_VIEWS=true``): the catalog and
+profile reads are served by async views, everything else by ``core.urls``.
+"""
+from django.urls import include, path
+
+from accounts.urls import async_urlpatterns as accounts_urlpatterns
+from fitness.urls import async_urlpatterns as fitness_urlpatterns
+from programs.urls import async_urlpatterns as programs_urlpatterns
+
+urlpatterns = [
+    path('api/exercises/', include(fitness_urlpatterns)),
+    path('api/programs/', include(programs_urlpatterns)),
+    path('api/', include(accounts_urlpatterns)),
+    path('', include('core.urls')),
+]
@@ -0,0 +1,179 @@
+# backend/core/catalog.py
+"""
+Pre-rendered snapshots of the public catalog.
+
+The exercise and program lists only change when an admin edits the catalog,
+so each list is rendered to JSON bytes once per language and kept in the
+cache configured by ``CATALOG_CACHE_ALIAS``.
+
+Snapshots are keyed by a catalog-wide version counter. The signal handlers in
+``fitness.signals`` and ``programs.signals`` bump it on every catalog write,
+which retires all snapshots at once and changes the strong ETags emitted by
+the ``conditional`` decorator, so repeat visitors get a 304 after a single
+cache lookup. A body sent under such an ETag is read from the primary, so it
+is never older than the version the ETag names.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.views.decorators.http import condition
+from rest_framework.renderers import JSONRenderer
+
+from core import routers
+
+LANGUAGES = ('en', 'fr', 'ar')
+
+EXERCISES = 'exercises'
+PROGRAMS = 'programs'
+
+VERSION_KEY = 'catalog:version'
+MODIFIED_KEY = 'catalog:modified'
+
+_builders = {}
+
+
+def _cache():
+    return caches[getattr(settings, 'CATALOG_CACHE_ALIAS', 'default')]
+
+
+def _key(name, lang, version):
+    return f'catalog:snapshot:{name}:{lang}:{version}'
+
+
+def register_snapshot(name):
+    """Register ``func(lang) -> data`` as the builder of snapshot ``name``."""
+    def decorator(func):
+        _builders[name] = func
+        return func
+    return decorator
+
+
+def get_snapshot(name, lang, version=None):
+    """Return the rendered JSON bytes of snapshot ``name`` for ``lang``."""
+    cache = _cache()
+    if version is None:
+        version, _ = get_version()
+    # The version is read before building and writers bump it only after
+    # they commit (the signal handlers use on_commit), so bytes built from
+    # rows a write replaced end up under a key nobody will ask for again.
+    key = _key(name, lang, version)
+    content = cache.get(key)
+    if content is None:
+        with routers.primary():
+            content = JSONRenderer().render(_builders[name](lang))
+        cache.set(key, content, timeout=getattr(settings, 'CATALOG_SNAPSHOT_TIMEOUT', 86400))
+    return content
+
+
+def snapshot_response(request, name, lang):
+    version, _ = _request_version(request)
+    return HttpResponse(get_snapshot(name, lang, version), content_type='application/json')
+
+
+async def asnapshot_response(request, name, lang):
+    version, _ = await _arequest_version(request)
+    content = await _cache().aget(_key(name, lang, version))
+    if content is None:
+        content = await sync_to_async(get_snapshot)(name, lang, version)
+    return HttpResponse(content, content_type='application/json')
+
+
+def invalidate():
+    """Retire every snapshot and ETag; return the new version."""
+    return bump_version()
+
+
+def _seed_version(cache):
+    # Seed from the clock rather than 0 so a flushed cache never hands out a
+    # version (and therefore an ETag) that was already used for other data.
+    version = time.time_ns() // 1000
+    modified = time.time()
+    cache.set_many({VERSION_KEY: version, MODIFIED_KEY: modified}, timeout=None)
+    return version, modified
+
+
+def get_version():
+    """Return ``(version, modified_timestamp)`` for the whole catalog."""
+    cache = _cache()
+    values = cache.get_many([VERSION_KEY, MODIFIED_KEY])
+    if VERSION_KEY not in values or MODIFIED_KEY not in values:
+        return _seed_version(cache)
+    return values[VERSION_KEY], values[MODIFIED_KEY]
+
+
+async def aget_version():
+    cache = _cache()
+    values = await cache.aget_many([VERSION_KEY, MODIFIED_KEY])
+    if VERSION_KEY not in values or MODIFIED_KEY not in values:
+        return await sync_to_async(_seed_version)(cache)
+    return values[VERSION_KEY], values[MODIFIED_KEY]
+
+
+def bump_version():
+    """Move the catalog to a new version and return it."""
+    cache = _cache()
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        version, _ = _seed_version(cache)
+    else:
+        cache.set(MODIFIED_KEY, time.time(), timeout=None)
+    return version
+
+
+def _request_version(request):
+    # The ETag, Last-Modified and snapshot key of one request all derive from
+    # the same version; look it up only once.
+    if not hasattr(request, '_catalog_version'):
+        request._catalog_version = get_version()
+    return request._catalog_version
+
+
+async def _arequest_version(request):
+    if not hasattr(request, '_catalog_version'):
+        request._catalog_version = await aget_version()
+    return request._catalog_version
+
+
+def _etag(request, *args, **kwargs):
+    version, _ = _request_version(request)
+    return hashlib.sha1(f'{version}:{request.get_full_path()}'.encode()).hexdigest()
+
+
+def _last_modified(request, *args, **kwargs):
+    _, modified = _request_version(request)
+    return datetime.fromtimestamp(modified, tz=timezone.utc)
+
+
+_condition = condition(etag_func=_etag, last_modified_func=_last_modified)
+
+
+def conditional(view):
+    """ETag and Last-Modified from the catalog version; apply above @api_view so a 304 skips DRF."""
+    conditional_view = _condition(view)
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        # A lagging replica would return old rows under the new version's
+        # ETag, and clients would keep them until the next catalog write.
+        with routers.primary():
+            return conditional_view(request, *args, **kwargs)
+    return wrapper
+
+
+def aconditional(view):
+    """``conditional`` for async views; the version is fetched without blocking the event loop."""
+    conditional_view = _condition(view)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        await _arequest_version(request)
+        with routers.primary():
+            return await conditional_view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,102 @@
+# backend/core/database.py
+"""
+Database connection metrics.
+
+The ``DB_*`` settings choose between psycopg 3's connection pool and
+persistent per-thread connections with health checks. Either way the
+``core.postgresql`` engine runs every new connection through ``acquiring``,
+which times it: with a pool that is the wait for a checkout, without one the
+TCP connect and authentication. The time is added to the request's
+``Server-Timing`` header as ``db_connect`` and totalled per alias for
+/api/_metrics, next to the pool's own utilisation counters.
+"""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import connections
+
+from core.instrumentation import register_collector, timer
+
+_lock = threading.Lock()
+_acquired = defaultdict(int)  # alias -> connections obtained
+_failed = defaultdict(int)
+_wait = defaultdict(float)  # alias -> seconds spent obtaining them
+
+# ConnectionPool.get_stats() key -> (metric, type, help, scale)
+POOL_METRICS = {
+    'pool_max': ('traint_db_pool_max_connections', 'gauge', 'Configured pool size limit.', 1),
+    'pool_size': ('traint_db_pool_connections', 'gauge', 'Connections held by the pool, idle or in use.', 1),
+    'pool_available': ('traint_db_pool_idle_connections', 'gauge', 'Idle connections in the pool.', 1),
+    'requests_waiting': ('traint_db_pool_waiting_requests', 'gauge', 'Requests queued for a connection.', 1),
+    'requests_num': ('traint_db_pool_requests_total', 'counter', 'Connection requests served by the pool.', 1),
+    'requests_wait_ms': ('traint_db_pool_wait_seconds_total', 'counter', 'Time requests spent queued.', 0.001),
+    'requests_errors': ('traint_db_pool_timeouts_total', 'counter', 'Connection requests that timed out.', 1),
+    'usage_ms': ('traint_db_pool_usage_seconds_total', 'counter', 'Time connections spent checked out.', 0.001),
+}
+
+
+@contextmanager
+def acquiring(alias):
+    """Time obtaining a connection for ``alias``."""
+    started = time.perf_counter()
+    try:
+        with timer('db_connect'):
+            yield
+    except Exception:
+        with _lock:
+            _failed[alias] += 1
+        raise
+    elapsed = time.perf_counter() - started
+    with _lock:
+        _acquired[alias] += 1
+        _wait[alias] += elapsed
+
+
+def pools():
+    """``(alias, pool)`` for every database configured with a connection pool."""
+    for alias in connections:
+        connection = connections[alias]
+        if connection.settings_dict.get('OPTIONS', {}).get('pool'):
+            yield alias, connection.pool
+
+
+def totals(alias):
+    """``(connections obtained, seconds spent)`` for ``alias`` since the last ``reset``."""
+    with _lock:
+        return _acquired.get(alias, 0), _wait.get(alias, 0.0)
+
+
+def reset():
+    with _lock:
+        _acquired.clear()
+        _failed.clear()
+        _wait.clear()
+
+
+@register_collector
+def collect():
+    with _lock:
+        acquired, failed, wait = dict(_acquired), dict(_failed), dict(_wait)
+    families = [
+        ('traint_db_connections_acquired_total', 'counter',
+         'New connections (pool checkouts when pooling) handed to Django.',
+         [({'alias': alias}, count) for alias, count in sorted(acquired.items())]),
+        ('traint_db_connection_wait_seconds_total', 'counter', 'Time spent obtaining those connections.',
+         [({'alias': alias}, seconds) for alias, seconds in sorted(wait.items())]),
+        ('traint_db_connection_errors_total', 'counter', 'Failed attempts to obtain a connection.',
+         [({'alias': alias}, count) for alias, count in sorted(failed.items())]),
+    ]
+    samples = defaultdict(list)
+    for alias, pool in pools():
+        stats = pool.get_stats()
+        for key, (name, _, _, scale) in POOL_METRICS.items():
+            samples[name].append(({'alias': alias}, stats.get(key, 0) * scale))
+        in_use = stats.get('pool_size', 0) - stats.get('pool_available', 0)
+        samples['traint_db_pool_utilization'].append(({'alias': alias}, in_use / max(stats.get('pool_max', 1), 1)))
+    if samples:
+        families += [(name, kind, help_text, samples[name]) for name, kind, help_text, _ in POOL_METRICS.values()]
+        families.append(('traint_db_pool_utilization', 'gauge', 'Share of the pool limit checked out.',
+                         samples['traint_db_pool_utilization']))
+    return families
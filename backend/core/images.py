@@ -0,0 +1,142 @@
+# backend/core/images.py
+"""
+Responsive renditions of uploaded images.
+
+Each source image is resized to every ``IMAGE_RENDITION_WIDTHS`` width
+narrower than itself (or just its own width when it is smaller than all of
+them) and encoded as WebP and JPEG next to the original::
+
+    programs/thumbnails/squat.png
+    programs/thumbnails/squat.w320.webp
+    programs/thumbnails/squat.w320.jpg
+
+The storage names are recorded on the model in a JSON field alongside the
+image field (``{'source': ..., 'webp': {'320': name}, 'jpeg': {...}}``), so
+serializers can emit ``srcset`` strings without touching storage.
+Renditions are refreshed from a ``pre_save`` handler (``refresh``) and
+backfilled by the ``build_image_renditions`` command. The ones they replace
+are deleted from ``post_save`` (``discard_stale``) once the save commits,
+so a failed or rolled-back save never leaves a row pointing at deleted files.
+"""
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# format -> (Pillow format, extension, save options)
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'optimize': True, 'progressive': True}),
+}
+
+# (model label, image field, renditions field) for the backfill command
+IMAGE_FIELDS = [
+    ('programs.Program', 'thumbnail', 'thumbnail_renditions'),
+    ('coaches.Coach', 'photo', 'photo_renditions'),
+]
+
+
+def rendition_name(name, width, fmt):
+    root, _ = os.path.splitext(name)
+    return f'{root}.w{width}.{FORMATS[fmt][1]}'
+
+
+def render(storage, name, widths=None, quality=None):
+    """Write the renditions of ``name`` to ``storage`` and return their map."""
+    widths = sorted(widths or settings.IMAGE_RENDITION_WIDTHS)
+    quality = quality or settings.IMAGE_RENDITION_QUALITY
+    with storage.open(name) as f:
+        image = ImageOps.exif_transpose(Image.open(f))
+        image.load()
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+    opaque = image
+    if image.mode == 'RGBA':
+        opaque = Image.new('RGB', image.size, (255, 255, 255))
+        opaque.paste(image, mask=image.getchannel('A'))
+
+    targets = [width for width in widths if width < image.width] or [image.width]
+    renditions = {'source': name, 'width': image.width}
+    for width in targets:
+        height = max(1, round(image.height * width / image.width))
+        for fmt, (pil_format, _, options) in FORMATS.items():
+            source = image if pil_format == 'WEBP' else opaque
+            resized = source if width == image.width else source.resize((width, height), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, pil_format, quality=quality, **options)
+            target = rendition_name(name, width, fmt)
+            if storage.exists(target):
+                storage.delete(target)
+            renditions.setdefault(fmt, {})[str(width)] = storage.save(target, ContentFile(buffer.getvalue()))
+    return renditions
+
+
+def render_job(job):
+    """Process-pool entry point: ``(model label, field, storage name) -> (renditions, error)``."""
+    label, field_name, name = job
+    storage = apps.get_model(label)._meta.get_field(field_name).storage
+    try:
+        return render(storage, name), None
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        return None, str(e)
+
+
+def stored_names(renditions):
+    return [name for fmt in FORMATS for name in renditions.get(fmt, {}).values()]
+
+
+def refresh(instance, field_name, renditions_field):
+    """
+    Bring ``instance.<renditions_field>`` in line with ``instance.<field_name>``,
+    committing a pending upload first. Called before the instance is saved.
+    """
+    file = getattr(instance, field_name)
+    current = getattr(instance, renditions_field) or {}
+    if file and not file._committed:
+        # What FileField.pre_save would do a moment later.
+        file.save(file.name, file.file, save=False)
+    if (file.name or None) == current.get('source'):
+        return
+
+    storage = file.storage
+    renditions = {}
+    if file:
+        try:
+            renditions = render(storage, file.name)
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+            logger.warning('Could not render %s: %s', file.name, e)
+    setattr(instance, renditions_field, renditions)
+    stale = set(stored_names(current)) - set(stored_names(renditions))
+    instance.__dict__.setdefault('_stale_renditions', []).extend((storage, name) for name in stale)
+
+
+def discard_stale(instance, using):
+    """Delete the renditions ``refresh`` replaced once the save commits. Called after the instance is saved."""
+    stale = instance.__dict__.pop('_stale_renditions', None)
+    if stale:
+        transaction.on_commit(lambda: delete(stale), using=using)
+
+
+def delete(names):
+    """Delete ``(storage, name)`` pairs, ignoring files that are already gone."""
+    for storage, name in names:
+        storage.delete(name)
+
+
+def srcset(file, renditions):
+    """``{'webp': 'url 320w, url 640w', 'jpeg': ...}`` for the current image, else ``None``."""
+    if not file or renditions.get('source') != file.name:
+        return None
+    storage = file.storage
+    return {
+        fmt: ', '.join(f'{storage.url(name)} {width}w' for width, name in sorted(
+            renditions[fmt].items(), key=lambda item: int(item[0])))
+        for fmt in FORMATS if renditions.get(fmt)
+    } or None
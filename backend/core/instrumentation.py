@@ -0,0 +1,248 @@
+# backend/core/instrumentation.py
+"""
+Per-request timing and query instrumentation.
+
+``InstrumentationMiddleware`` records wall time, database queries/time,
+serializer time and response size for every request, labelled by resolved
+URL name. Results are added to an ``Server-Timing`` header, requests slower
+than ``SLOW_REQUEST_MS`` are logged with their slowest SQL, and totals are
+aggregated into Prometheus histograms/counters served by ``metrics_view``.
+
+Other modules can time a block of a request with ``timer(name)`` and expose
+extra metrics with ``register_collector``.
+"""
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTER_HELP = {
+    'traint_request_db_queries_total': 'Database queries issued.',
+    'traint_request_db_seconds_total': 'Time spent in database queries.',
+    'traint_request_serializer_seconds_total': 'Time spent serializing response data.',
+    'traint_response_bytes_total': 'Response body bytes.',
+}
+
+_current = ContextVar('request_stats', default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.slowest_sql = None
+        self.slowest_time = 0.0
+        self.timings = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        # Database execute_wrapper: time every statement on every connection.
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if elapsed >= self.slowest_time:
+                self.slowest_time = elapsed
+                self.slowest_sql = sql
+
+
+@contextmanager
+def timer(name):
+    """Add the duration of the block to the current request's ``name`` timing."""
+    stats = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.timings[name] += time.perf_counter() - started
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collectors = []
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.durations = defaultdict(lambda: Histogram(DURATION_BUCKETS))
+            self.requests = defaultdict(int)  # (view, status) -> count
+            self.counters = defaultdict(float)  # (metric, view) -> total
+
+    def observe(self, view, status, duration, stats, size):
+        with self._lock:
+            self.durations[view].observe(duration)
+            self.requests[(view, status)] += 1
+            self.counters[('traint_request_db_queries_total', view)] += stats.queries
+            self.counters[('traint_request_db_seconds_total', view)] += stats.db_time
+            self.counters[('traint_request_serializer_seconds_total', view)] += stats.timings.get('serialize', 0.0)
+            self.counters[('traint_response_bytes_total', view)] += size
+
+    def register_collector(self, collector):
+        """``collector()`` returns ``[(name, type, help, [(labels, value), ...]), ...]``."""
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+
+        with self._lock:
+            lines.append('# HELP traint_request_duration_seconds Request wall time.')
+            lines.append('# TYPE traint_request_duration_seconds histogram')
+            for view, histogram in sorted(self.durations.items()):
+                view = _escape(view)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'traint_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {count}')
+                lines.append(f'traint_request_duration_seconds_bucket{{view="{view}",le="+Inf"}} {histogram.count}')
+                lines.append(f'traint_request_duration_seconds_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(f'traint_request_duration_seconds_count{{view="{view}"}} {histogram.count}')
+
+            family('traint_requests_total', 'counter', 'Requests by view and status code.', [
+                ({'view': view, 'status': str(status)}, count)
+                for (view, status), count in sorted(self.requests.items())
+            ])
+            counters = defaultdict(list)
+            for (name, view), value in sorted(self.counters.items()):
+                counters[name].append(({'view': view}, value))
+            for name, samples in counters.items():
+                family(name, 'counter', COUNTER_HELP[name], samples)
+
+        for collector in list(self._collectors):
+            try:
+                for name, kind, help_text, collected in collector():
+                    family(name, kind, help_text, collected)
+            except Exception:
+                logger.exception('Metrics collector %r failed', collector)
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = Registry()
+register_collector = registry.register_collector
+
+
+def _dispatch(execute, sql, params, many, context):
+    # Installed on every connection; forwards to the stats of the request
+    # whose context issued the query. Contexts are copied into
+    # sync_to_async threads, so this also covers async views.
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    return stats(execute, sql, params, many, context)
+
+
+def _install(connection, **kwargs):
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch)
+
+
+connection_created.connect(_install)
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, started = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, stats, started)
+
+    async def __acall__(self, request):
+        stats, token, started = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, stats, started)
+
+    @staticmethod
+    def _start():
+        # Connections opened before this module was imported never saw
+        # connection_created.
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        stats = RequestStats()
+        return stats, _current.set(stats), time.perf_counter()
+
+    def _finish(self, request, response, stats, started):
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name if match else None) or 'unresolved'
+        size = 0 if response.streaming else len(response.content)
+        registry.observe(view, response.status_code, duration, stats, size)
+
+        timings = [f'total;dur={duration * 1000:.1f}', f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"']
+        timings += [f'{name};dur={seconds * 1000:.1f}' for name, seconds in stats.timings.items()]
+        response['Server-Timing'] = ', '.join(timings)
+
+        if duration * 1000 >= getattr(settings, 'SLOW_REQUEST_MS', 500):
+            logger.warning(
+                'Slow request %s %s (%s): %.1fms, %d queries in %.1fms; slowest SQL (%.1fms): %s',
+                request.method, request.path, view, duration * 1000, stats.queries,
+                stats.db_time * 1000, stats.slowest_time * 1000, stats.slowest_sql,
+            )
+        return response
+
+
+def metrics_view(request):
+    """Prometheus text exposition; requires METRICS_TOKEN as a bearer token, or a staff session."""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    header = request.headers.get('Authorization', '')
+    if token and hmac.compare_digest(header.encode(), f'Bearer {token}'.encode()):
+        pass
+    elif not (getattr(request, 'user', None) and request.user.is_staff):
+        return HttpResponseForbidden('Forbidden')
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,11 @@
+# backend/core/postgresql/base.py
+"""``django.db.backends.postgresql`` with connection setup timed by ``core.database``."""
+from django.db.backends.postgresql import base
+
+from core import database
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_new_connection(self, conn_params):
+        with database.acquiring(self.alias):
+            return super().get_new_connection(conn_params)
@@ -0,0 +1,218 @@
+# backend/core/routers.py
+"""
+Read-replica routing for the catalog.
+
+``ReplicaRouter`` sends reads of the catalog models (exercises, programs and
+their categories, sessions and documents) to the aliases listed in
+``REPLICA_DATABASES``. Each request or command picks one replica,
+round-robin, and stays on it. Every write, and every read of user data,
+goes to ``default``.
+
+A replica is pinged at most every ``DB_REPLICA_CHECK_SECONDS``. One that
+fails the ping, or raises a connection error mid-query, is ejected for
+``DB_REPLICA_EJECT_SECONDS``. While no replica is healthy, reads fall back
+to ``default``.
+
+Once a request writes, its remaining reads use ``default``.
+``ReplicaPinningMiddleware`` also sets a cookie, so the client's requests
+for the next ``DB_REPLICA_PIN_SECONDS`` read their own writes despite
+replication lag. Code that builds long-lived state from the catalog (the
+snapshots, program documents and the autocomplete index) runs inside
+``primary()``, so it never caches a lagging replica; so do the imports,
+seeding and plan changes that decide between insert and update by reading
+existing rows, and the views behind ``catalog.conditional``, whose ETags
+name the catalog version their body must be at least as new as.
+"""
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, InterfaceError, OperationalError, connections
+from django.db.backends.signals import connection_created
+
+CATALOG_MODELS = {
+    'fitness.exercise',
+    'programs.program',
+    'programs.programcategory',
+    'programs.programsession',
+    'programs.sessionexercise',
+    'programs.programdocument',
+    'translations.translation',
+}
+
+PIN_COOKIE = 'db_primary'
+
+_lock = threading.Lock()
+_ejected = {}  # alias -> monotonic time it may be retried
+_checked = {}  # alias -> monotonic time of the last successful ping
+_turn = itertools.count()
+
+
+class Routing:
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+        self.replica = None
+
+
+_routing = ContextVar('db_routing', default=None)
+
+
+def current():
+    routing = _routing.get()
+    if routing is None:
+        # Outside a request (commands, shells) the scope is the whole context.
+        routing = Routing()
+        _routing.set(routing)
+    return routing
+
+
+@contextmanager
+def scope(pinned=False):
+    """Route the block with fresh state; ``pinned`` keeps all of it on ``default``."""
+    outer = _routing.get()
+    routing = Routing(pinned)
+    token = _routing.set(routing)
+    try:
+        yield routing
+    finally:
+        _routing.reset(token)
+        if routing.wrote and outer is not None:
+            # A write in a nested scope still pins the request around it.
+            outer.pinned = outer.wrote = True
+
+
+def primary():
+    return scope(pinned=True)
+
+
+def replicas():
+    return list(getattr(settings, 'REPLICA_DATABASES', []))
+
+
+def eject(alias):
+    with _lock:
+        _ejected[alias] = time.monotonic() + getattr(settings, 'DB_REPLICA_EJECT_SECONDS', 30)
+        _checked.pop(alias, None)
+
+
+def reset():
+    with _lock:
+        _ejected.clear()
+        _checked.clear()
+
+
+def healthy(alias):
+    now = time.monotonic()
+    with _lock:
+        if _ejected.get(alias, 0) > now:
+            return False
+        if now - _checked.get(alias, float('-inf')) < getattr(settings, 'DB_REPLICA_CHECK_SECONDS', 5):
+            return True
+    connection = connections[alias]
+    _install(connection)
+    try:
+        connection.ensure_connection()
+        if not connection.is_usable():
+            raise OperationalError(f'{alias} is not usable')
+    except DatabaseError:
+        # The request cycle's close_old_connections() drops the broken connection.
+        eject(alias)
+        return False
+    with _lock:
+        _ejected.pop(alias, None)
+        _checked[alias] = now
+    return True
+
+
+def choose():
+    """The next healthy replica in turn, or ``None``."""
+    aliases = replicas()
+    start = next(_turn)
+    for i in range(len(aliases)):
+        alias = aliases[(start + i) % len(aliases)]
+        if healthy(alias):
+            return alias
+    return None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.label_lower not in CATALOG_MODELS:
+            return None
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Follow relations on the database the object came from.
+            return instance._state.db
+        routing = current()
+        if routing.pinned or not replicas():
+            return DEFAULT_DB_ALIAS
+        if routing.replica is None or not healthy(routing.replica):
+            routing.replica = choose()
+        return routing.replica or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = current()
+        routing.pinned = routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication; never run
+        # ``migrate --database`` against one.
+        return None
+
+
+def _watch(execute, sql, params, many, context):
+    try:
+        return execute(sql, params, many, context)
+    except (OperationalError, InterfaceError):
+        if context['connection'].alias in replicas():
+            eject(context['connection'].alias)
+        raise
+
+
+def _install(connection, **kwargs):
+    if _watch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_watch)
+
+
+connection_created.connect(_install)
+
+
+class ReplicaPinningMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with scope(pinned=PIN_COOKIE in request.COOKIES) as routing:
+            response = self.get_response(request)
+        return self._finish(response, routing)
+
+    async def __acall__(self, request):
+        with scope(pinned=PIN_COOKIE in request.COOKIES) as routing:
+            response = await self.get_response(request)
+        return self._finish(response, routing)
+
+    @staticmethod
+    def _finish(response, routing):
+        if routing.wrote and replicas():
+            response.set_cookie(PIN_COOKIE, '1', max_age=getattr(settings, 'DB_REPLICA_PIN_SECONDS', 5),
+                                httponly=True, samesite='Lax')
+        return response
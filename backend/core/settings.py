@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import timedelta
@@ -51,6 +52,8 @@ INSTALLED_APPS = [
     'accounts',
     'programs',
     'coaches',
+    'workouts',
+    'translations',
 ]
 
 MIDDLEWARE = [
@@ -62,9 +65,14 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.instrumentation.InstrumentationMiddleware',
+    'core.routers.ReplicaPinningMiddleware',
 ]
 
-ROOT_URLCONF = 'core.urls'
+# Serve the catalog/profile reads with async views; only useful under ASGI (core.asgi)
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+
+ROOT_URLCONF = 'core.async_urls' if ASYNC_READ_VIEWS else 'core.urls'
 
 TEMPLATES = [
     {
@@ -93,18 +101,125 @@ CORS_ALLOWED_ORIGINS = [
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Database (PostgreSQL)
+# Connection management (metrics in core/database.py). DB_POOL=true hands out
+# connections from psycopg 3's pool (pip install "psycopg[pool]"; "auto" uses
+# it when installed): DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections per
+# process, requests wait up to DB_POOL_TIMEOUT seconds for one. Otherwise each
+# worker thread keeps its connection for DB_CONN_MAX_AGE seconds ("none":
+# forever, 0: reconnect every request), pinged before reuse when
+# DB_CONN_HEALTH_CHECKS is on.
+DB_POOL = os.getenv('DB_POOL', 'auto').lower()
+if DB_POOL == 'auto':
+    DB_POOL = find_spec('psycopg') is not None and find_spec('psycopg_pool') is not None
+else:
+    DB_POOL = DB_POOL == 'true'
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 2))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 10))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '60')
+DB_CONN_HEALTH_CHECKS = os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+
+# Database (PostgreSQL; core.postgresql times connection setup)
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.postgresql',
         'NAME': os.getenv('DB_NAME'),
         'USER': os.getenv('DB_USER'),
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # The pool keeps connections itself; Django must hand them back after each request.
+        'CONN_MAX_AGE': 0 if DB_POOL else None if DB_CONN_MAX_AGE == 'none' else int(DB_CONN_MAX_AGE),
+        'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+        'OPTIONS': {
+            'pool': {'min_size': DB_POOL_MIN_SIZE, 'max_size': DB_POOL_MAX_SIZE, 'timeout': DB_POOL_TIMEOUT},
+        } if DB_POOL else {},
+    }
+}
+
+# Read replicas of the default database (core/routers.py): a comma-separated
+# list of host[:port], each reachable as alias "replica<N>" with the default
+# database's name and credentials. Catalog reads are spread over the healthy
+# ones; a replica failing a ping (every DB_REPLICA_CHECK_SECONDS) or a query
+# is skipped for DB_REPLICA_EJECT_SECONDS. After a write, the client reads
+# from the primary for DB_REPLICA_PIN_SECONDS.
+DB_REPLICA_HOSTS = [host.strip() for host in os.getenv('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+REPLICA_DATABASES = []
+for number, replica_host in enumerate(DB_REPLICA_HOSTS, 1):
+    replica_host, _, replica_port = replica_host.partition(':')
+    DATABASES[f'replica{number}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'PORT': replica_port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(f'replica{number}')
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+DB_REPLICA_CHECK_SECONDS = float(os.getenv('DB_REPLICA_CHECK_SECONDS', 5))
+DB_REPLICA_EJECT_SECONDS = float(os.getenv('DB_REPLICA_EJECT_SECONDS', 30))
+DB_REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', 5))
+
+
+# Cache
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. django.core.cache.backends.redis.RedisCache) in production so
+# catalog invalidations reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'traint'),
     }
 }
 
+# Cache alias holding the pre-rendered catalog snapshots (see core/catalog.py)
+CATALOG_CACHE_ALIAS = os.getenv('CATALOG_CACHE_ALIAS', 'default')
+CATALOG_SNAPSHOT_TIMEOUT = int(os.getenv('CATALOG_SNAPSHOT_TIMEOUT', 86400))
+
+# Request instrumentation (core/instrumentation.py): requests slower than this
+# are logged with their slowest SQL; /api/_metrics accepts METRICS_TOKEN as a
+# bearer token (staff sessions are always allowed).
+SLOW_REQUEST_MS = float(os.getenv('SLOW_REQUEST_MS', 500))
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Upper bound on (token, exercise) entries in each worker's autocomplete index
+AUTOCOMPLETE_MAX_TERMS = int(os.getenv('AUTOCOMPLETE_MAX_TERMS', 200000))
+
+# Seconds a worker may reuse a User row loaded for a token user (0 disables)
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))
+
+# Login/registration token buckets, "<attempts>/<s|min|hour|day>"; empty disables
+AUTH_THROTTLE_IP_RATE = os.getenv('AUTH_THROTTLE_IP_RATE', '30/min')
+AUTH_THROTTLE_EMAIL_RATE = os.getenv('AUTH_THROTTLE_EMAIL_RATE', '10/min')
+
+# Reverse proxies in front of the app. The client IP the throttles key on is
+# read that many hops from the end of X-Forwarded-For; 0 uses REMOTE_ADDR and
+# ignores the header, which clients can set to anything.
+NUM_PROXIES = int(os.getenv('NUM_PROXIES', 0))
+
+# Threads hashing passwords per process (0 hashes on the request thread) and
+# how many more hashes may queue before requests are refused with a 503
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 16))
+# Retry-After (seconds) sent with that 503
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv('PASSWORD_HASH_RETRY_AFTER', 1))
+
+# Rebuild materialized program documents on a background thread (false: on commit, inline)
+PROGRAM_DOCUMENTS_BACKGROUND = os.getenv('PROGRAM_DOCUMENTS_BACKGROUND', 'True').lower() == 'true'
+
+# manage.py test: the default runner with PROGRAM_DOCUMENTS_BACKGROUND off
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
+# Where the catalog's translations are read from (translations/storage.py):
+# "json" uses the {"en", "fr", "ar"} JSON fields, "table" also keeps one
+# Translation row per language so reads fetch and index a single language.
+# Run sync_translations after switching to "table".
+TRANSLATION_STORAGE = os.getenv('TRANSLATION_STORAGE', 'json')
+
+# 5x5 progression defaults; per-exercise overrides live in workouts.ProgressionRule
+PROGRESSION_INCREMENT_KG = os.getenv('PROGRESSION_INCREMENT_KG', '2.5')
+PROGRESSION_DELOAD_AFTER = int(os.getenv('PROGRESSION_DELOAD_AFTER', 3))
+PROGRESSION_DELOAD_FACTOR = os.getenv('PROGRESSION_DELOAD_FACTOR', '0.9')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -145,6 +260,10 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Widths (px) of the WebP/JPEG renditions generated for uploaded images (core/images.py)
+IMAGE_RENDITION_WIDTHS = [int(width) for width in os.getenv('IMAGE_RENDITION_WIDTHS', '160,320,640,1280').split(',')]
+IMAGE_RENDITION_QUALITY = int(os.getenv('IMAGE_RENDITION_QUALITY', 80))
+
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
@@ -152,11 +271,14 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+AUTHENTICATION_BACKENDS = ['accounts.backends.PooledModelBackend']
+
 # JWT Auth
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CookieJWTAuthentication',
     ),
+    'NUM_PROXIES': NUM_PROXIES,
 }
 
 # CORS (for React dev)
@@ -169,6 +291,7 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'UPDATE_LAST_LOGIN': True,
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.tokens.UserTokenObtainPairSerializer',
 
     # Cookie settings (optional, but safe)
     'AUTH_COOKIE': 'access_token',
@@ -0,0 +1,21 @@
+# backend/core/test_runner.py
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    The default runner, with program documents rebuilt inline on commit.
+
+    A background rebuild thread would otherwise write to the test database
+    while later tests run, and outlive the transactions it was rebuilding for.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.inline_documents = override_settings(PROGRAM_DOCUMENTS_BACKGROUND=False)
+        self.inline_documents.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.inline_documents.disable()
+        super().teardown_test_environment(**kwargs)
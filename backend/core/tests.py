@@ -0,0 +1,289 @@
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connections
+from django.db.utils import ConnectionHandler
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from fitness.models import Exercise
+from accounts.tokens import UserRefreshToken
+from programs import library
+from programs.models import Program, ProgramCategory, UserPlan
+from programs.tests import make_exercise, make_program
+from . import database, routers
+from .instrumentation import registry
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        Exercise.objects.create(name={'en': 'Squat'}, description={}, instructions={}, category={})
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get(reverse('exercise-list'))
+        self.assertRegex(response.headers['Server-Timing'], r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn('serialize;dur=', response.headers['Server-Timing'])
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        with override_settings(METRICS_TOKEN='secret'):
+            self.assertEqual(self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer sécret').status_code, 403)
+            response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('traint_request_duration_seconds_bucket{view="exercise-list",le="+Inf"} 1', body)
+        self.assertIn('traint_requests_total{view="exercise-list",status="200"} 1', body)
+        self.assertIn('traint_request_db_queries_total{view="exercise-list"}', body)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_slowest_sql(self):
+        with self.assertLogs('core.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('exercise-detail', args=[Exercise.objects.get().pk]))
+        self.assertIn('slowest SQL', logs.output[0])
+        self.assertIn('fitness_exercise', logs.output[0])
+
+
+class FakePool:
+    def get_stats(self):
+        return {'pool_min': 2, 'pool_max': 10, 'pool_size': 4, 'pool_available': 1, 'requests_num': 40,
+                'requests_wait_ms': 1500}
+
+
+class ConnectionMetricsTests(TestCase):
+    def setUp(self):
+        database.reset()
+        self.addCleanup(database.reset)
+
+    def metrics(self):
+        return registry.render()
+
+    def test_connection_setup_is_timed(self):
+        with database.acquiring('default'):
+            pass
+        acquired, seconds = database.totals('default')
+        self.assertEqual(acquired, 1)
+        self.assertGreaterEqual(seconds, 0)
+        self.assertIn('traint_db_connections_acquired_total{alias="default"} 1', self.metrics())
+
+    def test_postgresql_engine_counts_failed_connections(self):
+        handler = ConnectionHandler({
+            'default': {},
+            'pg': {'ENGINE': 'core.postgresql', 'NAME': 'traint', 'HOST': '127.0.0.1', 'PORT': '1'},
+        })
+        with self.assertRaises(OperationalError):
+            handler['pg'].ensure_connection()
+        self.assertEqual(database.totals('pg'), (0, 0.0))
+        self.assertIn('traint_db_connection_errors_total{alias="pg"} 1', self.metrics())
+
+    def test_pool_utilization(self):
+        with mock.patch.object(database, 'pools', return_value=[('default', FakePool())]):
+            body = self.metrics()
+        self.assertIn('traint_db_pool_connections{alias="default"} 4', body)
+        self.assertIn('traint_db_pool_idle_connections{alias="default"} 1', body)
+        self.assertIn('traint_db_pool_utilization{alias="default"} 0.3', body)
+        self.assertIn('traint_db_pool_wait_seconds_total{alias="default"} 1.5', body)
+        self.assertIn('traint_db_pool_timeouts_total{alias="default"} 0', body)
+
+    def test_no_pool_metrics_without_a_pool(self):
+        self.assertNotIn('traint_db_pool_', self.metrics())
+
+
+@override_settings(REPLICA_DATABASES=['replica1'])
+class ReplicaRoutingTests(TestCase):
+    # setUpClass adds two SQLite databases (only replica1 gets the schema)
+    # before '__all__' is resolved.
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        configured = connections.configure_settings({
+            'default': {},
+            **{alias: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(Path(cls.directory.name, alias))}
+               for alias in ('replica1', 'replica2')},
+        })
+        for alias in ('replica1', 'replica2'):
+            connections.settings[alias] = configured[alias]
+        call_command('migrate', database='replica1', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in ('replica1', 'replica2'):
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        cls.directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        routers.reset()
+        self.addCleanup(routers.reset)
+
+    def exercise(self, name, using='default', **kwargs):
+        return Exercise.objects.using(using).create(
+            name={'en': name}, description={}, instructions={}, category={}, **kwargs,
+        )
+
+    def test_catalog_reads_use_a_replica(self):
+        exercise = self.exercise('Squat')
+        self.exercise('Squat (lagging)', using='replica1', pk=exercise.pk)
+        with routers.scope():
+            self.assertEqual(Exercise.objects.get(pk=exercise.pk).name['en'], 'Squat (lagging)')
+            self.assertEqual(Program.objects.all().db, 'replica1')
+            self.assertEqual(UserPlan.objects.all().db, 'default')
+            self.assertEqual(User.objects.all().db, 'default')
+
+    def test_writes_pin_the_request_and_the_client(self):
+        with routers.scope() as routing:
+            self.assertEqual(Exercise.objects.all().db, 'replica1')
+            Exercise.objects.create(name={'en': 'Row'}, description={}, instructions={}, category={})
+            self.assertTrue(routing.wrote)
+            self.assertEqual(Exercise.objects.all().db, 'default')
+
+        user = User.objects.create_user(email='writer@example.com', password='x')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        program = Program.objects.create(name={'en': 'P'}, description={}, difficulty='beginner', category=category,
+                                         created_by=user)
+        for row in (user, category, program):
+            row.save(using='replica1')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {UserRefreshToken.for_user(user).access_token}'
+        self.assertNotIn(routers.PIN_COOKIE, self.client.get(reverse('user-plans')).cookies)
+        response = self.client.post(reverse('user-plans'), {'add': [program.pk]}, content_type='application/json')
+        self.assertEqual(response.cookies[routers.PIN_COOKIE]['max-age'], 5)
+
+        pinned = routers.ReplicaPinningMiddleware(lambda request: HttpResponse(Exercise.objects.all().db))
+        request = RequestFactory().get('/')
+        self.assertEqual(pinned(request).content, b'replica1')
+        request.COOKIES[routers.PIN_COOKIE] = '1'
+        self.assertEqual(pinned(request).content, b'default')
+
+    def test_conditional_views_read_the_primary(self):
+        # Their ETag names the current catalog version; a lagging body
+        # would be cached under it.
+        exercise = self.exercise('Deadlift')
+        self.exercise('Deadlift (lagging)', using='replica1', pk=exercise.pk)
+        response = self.client.get(reverse('exercise-detail', args=[exercise.pk]))
+        self.assertEqual(response.json()['name'], 'Deadlift')
+        response = self.client.get(reverse('exercise-search'), {'q': 'dead'})
+        self.assertEqual([row['name'] for row in response.json()['results']], ['Deadlift'])
+        with override_settings(ROOT_URLCONF='core.async_urls'):
+            response = self.client.get(reverse('exercise-detail', args=[exercise.pk]))
+        self.assertEqual(response.json()['name'], 'Deadlift')
+
+    @override_settings(REPLICA_DATABASES=['replica1', 'replica2'])
+    def test_round_robin_skips_unhealthy_replicas(self):
+        def picks():
+            result = []
+            for _ in range(4):
+                with routers.scope():
+                    result.append(Exercise.objects.all().db)
+            return result
+
+        first = picks()
+        self.assertEqual(set(first), {'replica1', 'replica2'})
+        self.assertNotEqual(first[0], first[1])
+
+        routers.reset()
+        with mock.patch.object(connections['replica2'], 'ensure_connection', side_effect=OperationalError('down')):
+            self.assertEqual(picks(), ['replica1'] * 4)
+        self.assertEqual(picks(), ['replica1'] * 4)  # still ejected
+
+        routers.eject('replica1')
+        self.assertEqual(picks(), ['default'] * 4)
+        with override_settings(DB_REPLICA_EJECT_SECONDS=0):
+            routers.eject('replica1')
+            routers.eject('replica2')
+        self.assertEqual(set(picks()), {'replica1', 'replica2'})
+
+    @override_settings(REPLICA_DATABASES=['replica2'])
+    def test_failing_queries_eject_the_replica(self):
+        exercise = self.exercise('Squat')
+        with routers.scope(), self.assertRaises(OperationalError):
+            Exercise.objects.get(pk=exercise.pk)  # replica2 has no tables
+        with routers.scope():
+            self.assertEqual(Exercise.objects.get(pk=exercise.pk).name['en'], 'Squat')
+
+    def test_upserts_match_existing_rows_on_the_primary(self):
+        user = User.objects.create_user(email='admin@example.com', password='x')
+        squat = self.exercise('Squat')  # not on the replica yet
+        record = json.dumps({'type': 'exercise', 'name': {'en': 'Squat'}, 'main_muscle': 'Legs'})
+        with routers.scope():
+            importer = library.Importer(owner_id=user.pk).run([record])
+        self.assertEqual(importer.stats['exercise']['created'], 0)
+        self.assertEqual(list(Exercise.objects.using('default').values_list('pk', 'main_muscle')), [(squat.pk, 'Legs')])
+
+        # Plans can be added for a program the replica has not seen.
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        program = Program.objects.create(name={'en': 'P'}, description={}, difficulty='beginner', category=category,
+                                         created_by=user)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {UserRefreshToken.for_user(user).access_token}'
+        response = self.client.post(reverse('user-plans'), {'add': [program.pk]}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+
+class AsyncReadViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='reader@example.com', password='x', first_name='Read')
+        self.auth = {'AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        self.exercise = make_exercise('Squat')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.program = make_program(self.user, category, [self.exercise, make_exercise('Row')], sessions=2)
+        self.requests = [
+            (reverse('exercise-list'), {'lang': 'fr'}),
+            (reverse('exercise-list'), {'limit': 1, 'fields': 'id,name'}),
+            (reverse('exercise-list'), {'fields': 'secret'}),
+            (reverse('exercise-detail', args=[self.exercise.pk]), {'lang': 'ar'}),
+            (reverse('exercise-detail', args=[0]), {}),
+            (reverse('program-list'), {}),
+            (reverse('program-detail', args=[self.program.pk]), {'lang': 'fr'}),
+            (reverse('program-detail', args=[self.program.pk]), {'shape': 'normalized'}),
+            (reverse('program-detail', args=[self.program.pk]), {'shape': 'flat'}),
+            (reverse('user-profile'), {}),
+        ]
+
+    async def test_async_views_match_sync_views(self):
+        expected = []
+        for path, params in self.requests:
+            response = await self.async_client.get(path, params, headers=self.auth)
+            expected.append((response.status_code, response.content))
+
+        with override_settings(ROOT_URLCONF='core.async_urls'):
+            for (path, params), (status, content) in zip(self.requests, expected):
+                response = await self.async_client.get(path, params, headers=self.auth)
+                self.assertTrue(response.resolver_match.func.__name__.endswith('_async'), path)
+                self.assertEqual((response.status_code, response.content), (status, content), path)
+
+    @override_settings(ROOT_URLCONF='core.async_urls')
+    async def test_conditional_requests_and_instrumentation(self):
+        path = reverse('exercise-detail', args=[self.exercise.pk])
+        response = await self.async_client.get(path)
+        self.assertRegex(response.headers['Server-Timing'], r'desc="1 queries"')
+        response = await self.async_client.get(path, headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(response.status_code, 304)
+        response = await self.async_client.post(path)
+        self.assertEqual(response.status_code, 405)
+
+    @override_settings(ROOT_URLCONF='core.async_urls')
+    async def test_async_authentication(self):
+        path = reverse('user-profile')
+        response = await self.async_client.get(path)
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('WWW-Authenticate', response.headers)
+        response = await self.async_client.get(path, headers={'Authorization': 'Bearer nope'})
+        self.assertEqual((response.status_code, response.json()['code']), (401, 'token_not_valid'))
+
+        self.user.is_active = False
+        await self.user.asave()
+        response = await self.async_client.get(path, headers=self.auth)
+        self.assertEqual(response.status_code, 401)
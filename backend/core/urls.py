@@ -19,14 +19,20 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from accounts.throttling import AUTH_THROTTLES
+from core.instrumentation import metrics_view
+from programs.urls import user_plan_urlpatterns
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/exercises/', include('fitness.urls')),
     path('api/programs/', include('programs.urls')),
-    path('api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('api/workouts/', include('workouts.urls')),
+    path('api/user-plans/', include(user_plan_urlpatterns)),
+    path('api/token/', TokenObtainPairView.as_view(throttle_classes=AUTH_THROTTLES), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/_metrics', metrics_view, name='metrics'),
     path('api/', include('accounts.urls')), 
 ]
 
@@ -0,0 +1,248 @@
+# backend/fitness/autocomplete.py
+"""
+In-process prefix index over ``Exercise.name`` for type-ahead.
+
+Each worker builds the index lazily on first use and keeps it current from
+the ``Exercise`` save/delete signals once the write commits. Writes made by other workers are
+picked up through the catalog version: when it moves without a local
+update, the index is rebuilt on the next query.
+"""
+import bisect
+import heapq
+import logging
+import re
+import sys
+import threading
+import unicodedata
+
+from django.conf import settings
+
+from core import catalog, routers
+from core.instrumentation import register_collector
+
+logger = logging.getLogger(__name__)
+
+# Alef/hamza carriers and final forms that are spelled interchangeably.
+ARABIC_FOLDS = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ؤ': 'و', 'ئ': 'ي', 'ى': 'ي', 'ة': 'ه',
+    'ـ': None,  # tatweel
+})
+TOKEN_RE = re.compile(r'\w+')
+
+# Upper bound on the number of matches ranked per query.
+MAX_CANDIDATES = 1000
+
+
+def normalize(text):
+    """Fold case, Latin accents, Arabic diacritics and alef/hamza variants."""
+    text = text.translate(ARABIC_FOLDS)
+    # NFKD splits é into e + U+0301 and separates harakat/hamza marks from
+    # their base letters; dropping the combining marks folds both.
+    text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return text.casefold()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+class AutocompleteIndex:
+    def __init__(self, max_terms):
+        self.max_terms = max_terms
+        self.truncated = False
+        self.version = None
+        self._lock = threading.Lock()
+        self._terms = {lang: [] for lang in catalog.LANGUAGES}  # sorted (term, id)
+        self._names = {}  # id -> {lang: name}
+        self._folded = {}  # id -> {lang: normalized name}, for ranking
+        self._size = 0
+
+    def add(self, pk, names):
+        with self._lock:
+            self._remove(pk)
+            self._add(pk, names)
+
+    def remove(self, pk):
+        with self._lock:
+            self._remove(pk)
+
+    def load(self, rows):
+        """Bulk-load ``(id, names)`` rows into an empty index."""
+        with self._lock:
+            for pk, names in rows:
+                self._add(pk, names, insert=list.append)
+            for terms in self._terms.values():
+                terms.sort()
+
+    def _add(self, pk, names, insert=bisect.insort):
+        entries = {
+            lang: sorted({(token, pk) for token in tokenize(names.get(lang) or '')})
+            for lang in catalog.LANGUAGES
+        }
+        count = sum(len(terms) for terms in entries.values())
+        if self._size + count > self.max_terms:
+            if not self.truncated:
+                logger.warning('Autocomplete index is full (%d terms); further exercises are not indexed', self._size)
+            self.truncated = True
+            return
+        for lang, terms in entries.items():
+            for entry in terms:
+                insert(self._terms[lang], entry)
+        self._names[pk] = {lang: names.get(lang) for lang in catalog.LANGUAGES if names.get(lang)}
+        self._folded[pk] = {lang: normalize(name) for lang, name in self._names[pk].items()}
+        self._size += count
+
+    def _remove(self, pk):
+        names = self._names.pop(pk, None)
+        if names is None:
+            return
+        del self._folded[pk]
+        for lang, name in names.items():
+            terms = self._terms[lang]
+            for token in set(tokenize(name)):
+                i = bisect.bisect_left(terms, (token, pk))
+                if i < len(terms) and terms[i] == (token, pk):
+                    del terms[i]
+                    self._size -= 1
+
+    def search(self, query, lang, limit=10):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        langs = list(dict.fromkeys([lang, 'en']))
+        with self._lock:
+            matches = set()
+            for pk in self._candidates(tokens, langs):
+                matches.add(pk)
+                if len(matches) >= MAX_CANDIDATES:
+                    break
+            query = normalize(query)
+            ranked = heapq.nsmallest(limit, ((self._rank(pk, lang, query), pk) for pk in matches))
+            return [{'id': pk, 'name': self._display_name(pk, lang)} for _, pk in ranked]
+
+    def _candidates(self, tokens, langs):
+        # Walk the entries of the rarest token only and test the other tokens
+        # against each exercise's own names, so a common prefix ("s") never
+        # costs a scan of its whole range nor cuts matches before the cap.
+        ranges = {token: [(lang, *self._prefix_range(self._terms[lang], token)) for lang in langs]
+                  for token in set(tokens)}
+        rarest = min(ranges, key=lambda token: sum(end - start for _, start, end in ranges[token]))
+        others = [token for token in ranges if token != rarest]
+        seen = set()
+        for lang, start, end in ranges[rarest]:
+            terms = self._terms[lang]
+            for i in range(start, end):
+                pk = terms[i][1]
+                if pk in seen:
+                    continue
+                seen.add(pk)
+                words = [word for code in langs for word in TOKEN_RE.findall(self._folded[pk].get(code, ''))]
+                if all(any(word.startswith(token) for word in words) for token in others):
+                    yield pk
+
+    @staticmethod
+    def _prefix_range(terms, prefix):
+        # Tokens are \w runs, so none sorts at or after prefix + U+10FFFF.
+        return bisect.bisect_left(terms, (prefix,)), bisect.bisect_left(terms, (prefix + '\U0010ffff',))
+
+    def _rank(self, pk, lang, query):
+        # Whole-name prefix matches first, then shorter names.
+        folded = self._folded[pk]
+        name = folded.get(lang) or folded.get('en', '')
+        return (not name.startswith(query), len(name))
+
+    def _display_name(self, pk, lang):
+        names = self._names[pk]
+        return names.get(lang) or names.get('en') or next(iter(names.values()), '')
+
+    def stats(self):
+        """Approximate memory held by the index, in bytes."""
+        with self._lock:
+            size = 0
+            for terms in self._terms.values():
+                size += sys.getsizeof(terms)
+                size += sum(sys.getsizeof(entry) + sys.getsizeof(entry[0]) for entry in terms)
+            for table in (self._names, self._folded):
+                size += sys.getsizeof(table)
+                for names in table.values():
+                    size += sys.getsizeof(names) + sum(sys.getsizeof(n) for n in names.values())
+            return {
+                'exercises': len(self._names),
+                'terms': self._size,
+                'max_terms': self.max_terms,
+                'truncated': self.truncated,
+                'bytes': size,
+            }
+
+
+_index = None
+_build_lock = threading.Lock()
+
+
+def get_index():
+    global _index
+    version, _ = catalog.get_version()
+    index = _index
+    if index is not None and index.version == version:
+        return index
+    with _build_lock:
+        if _index is None or _index.version != version:
+            _index = _build(version)
+        return _index
+
+
+def _build(version):
+    from .models import Exercise
+
+    index = AutocompleteIndex(getattr(settings, 'AUTOCOMPLETE_MAX_TERMS', 200000))
+    with routers.primary():
+        rows = Exercise.objects.values_list('id', 'name').iterator(chunk_size=2000)
+        index.load((pk, names) for pk, names in rows if isinstance(names, dict))
+    index.version = version
+    logger.info('Built exercise autocomplete index: %s', index.stats())
+    return index
+
+
+def exercise_saved(exercise, version):
+    """Apply a committed save that moved the catalog to ``version``."""
+    index = _index
+    if index is not None:
+        index.add(exercise.pk, exercise.name if isinstance(exercise.name, dict) else {})
+        _advance(index, version)
+
+
+def exercise_deleted(pk, version):
+    index = _index
+    if index is not None:
+        index.remove(pk)
+        _advance(index, version)
+
+
+def _advance(index, version):
+    # Only past our own bump. Any other one (another worker's write, or a
+    # program's) may carry changes this index lacks, so the version is left
+    # behind and get_index() rebuilds.
+    if version == index.version + 1:
+        index.version = version
+
+
+@register_collector
+def collect_metrics():
+    index = _index
+    if index is None:
+        return []
+    stats = index.stats()
+    return [
+        ('traint_autocomplete_index_bytes', 'gauge', 'Approximate memory held by the autocomplete index.',
+         [({}, stats['bytes'])]),
+        ('traint_autocomplete_index_terms', 'gauge', 'Entries in the autocomplete index.',
+         [({}, stats['terms'])]),
+        ('traint_autocomplete_index_truncated', 'gauge', '1 if the index hit AUTOCOMPLETE_MAX_TERMS.',
+         [({}, int(stats['truncated']))]),
+    ]
+
+
+def reset():
+    global _index
+    _index = None
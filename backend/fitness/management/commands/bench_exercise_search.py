@@ -0,0 +1,72 @@
+# backend/fitness/management/commands/bench_exercise_search.py
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from core.benchmarking import summarize, test_database
+from fitness.models import Exercise
+
+MUSCLES = ['chest', 'back', 'quads', 'hamstrings', 'glutes', 'shoulders', 'biceps', 'triceps', 'core']
+EQUIPMENT = ['Barbell', 'Dumbbell', 'Cable', 'Machine', 'Bodyweight', 'Kettlebell']
+WORDS = ['Bench', 'Press', 'Squat', 'Row', 'Curl', 'Deadlift', 'Lunge', 'Fly', 'Raise', 'Pull', 'Push', 'Dip']
+
+QUERIES = [
+    {'q': 'bench', 'match': 'prefix'},
+    {'q': 'press'},
+    {'q': 'squat', 'lang': 'fr'},
+    {'equipment': 'Barbell', 'main_muscle': 'chest'},
+    {'target_muscles': 'glutes'},
+    {'q': 'row', 'target_muscles': 'back', 'difficulty': 'intermediate'},
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark /api/exercises/search/ against a synthetic exercise library in a throwaway test database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with test_database():
+            self._populate(options['count'])
+            self._run(options['repeat'])
+
+    def _populate(self, count):
+        rng = random.Random(5)
+        started = time.perf_counter()
+        batch = []
+        for i in range(count):
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}"
+            batch.append(Exercise(
+                name={'en': name, 'fr': f'{name} fr', 'ar': f'{name} ar'},
+                description={'en': f'{name} description'},
+                instructions={'en': ['Step 1', 'Step 2']},
+                category={'en': 'Synthetic'},
+                difficulty=rng.choice(['beginner', 'intermediate', 'advanced']),
+                target_muscles=rng.sample(MUSCLES, 2),
+                main_muscle=rng.choice(MUSCLES),
+                equipment=rng.choice(EQUIPMENT),
+            ))
+            if len(batch) == 5000:
+                Exercise.objects.bulk_create(batch)
+                batch = []
+        Exercise.objects.bulk_create(batch)
+        self.stdout.write(f'Seeded {count} exercises in {time.perf_counter() - started:.1f}s ({connection.vendor})')
+
+    def _run(self, repeat):
+        client = Client()
+        for params in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                response = client.get('/api/exercises/search/', params)
+                timings.append((time.perf_counter() - started) * 1000)
+            stats = summarize(timings)
+            self.stdout.write(
+                f'{params}: p50={stats["p50_ms"]:.1f}ms p95={stats["p95_ms"]:.1f}ms '
+                f'results={len(response.json()["results"])}'
+            )
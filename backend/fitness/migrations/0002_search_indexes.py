@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fitness', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['main_muscle'], name='fitness_ex_main_muscle_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['equipment'], name='fitness_ex_equipment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['mechanics'], name='fitness_ex_mechanics_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['difficulty'], name='fitness_ex_difficulty_idx'),
+        ),
+    ]
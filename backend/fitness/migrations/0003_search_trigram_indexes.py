@@ -0,0 +1,39 @@
+from django.db import migrations
+
+LANGUAGES = ('en', 'fr', 'ar')
+
+
+def create_indexes(apps, schema_editor):
+    # Trigram and jsonb GIN indexes only exist on Postgres; on other backends
+    # the search endpoint falls back to scans over these columns.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for lang in LANGUAGES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS fitness_ex_name_{lang}_trgm ON fitness_exercise '
+            f"USING gin ((LOWER((name ->> '{lang}'))) gin_trgm_ops)"
+        )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS fitness_ex_target_muscles_gin ON fitness_exercise '
+        'USING gin (target_muscles jsonb_path_ops)'
+    )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for lang in LANGUAGES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS fitness_ex_name_{lang}_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS fitness_ex_target_muscles_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fitness', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
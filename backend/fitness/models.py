@@ -1,6 +1,14 @@
 # backend/fitness/models.py
 from django.db import models
 
+from translations.query import LocalizedQuerySet
+
+
+class ExerciseQuerySet(LocalizedQuerySet):
+    # '' for every field, instructions included: what ExerciseSerializer has always returned.
+    localized_fields = {'name': '', 'description': '', 'instructions': '', 'category': ''}
+
+
 class Exercise(models.Model):
     # ✅ Use JSONField for multilingual support
     name = models.JSONField()  # {"en": "...", "ar": "...", "fr": "..."}
@@ -21,5 +29,17 @@ class Exercise(models.Model):
     equipment = models.CharField(max_length=50, default='Bodyweight')
     mechanics = models.CharField(max_length=20, default='Compound')
 
+    objects = ExerciseQuerySet.as_manager()
+
+    class Meta:
+        # Filters of /api/exercises/search/. The per-language name and
+        # target_muscles indexes are Postgres-only; see migration 0003.
+        indexes = [
+            models.Index(fields=['main_muscle'], name='fitness_ex_main_muscle_idx'),
+            models.Index(fields=['equipment'], name='fitness_ex_equipment_idx'),
+            models.Index(fields=['mechanics'], name='fitness_ex_mechanics_idx'),
+            models.Index(fields=['difficulty'], name='fitness_ex_difficulty_idx'),
+        ]
+
     def __str__(self):
         return self.name.get('en', 'Unnamed Exercise')
\ No newline at end of file
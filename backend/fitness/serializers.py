@@ -1,6 +1,14 @@
 # backend/fitness/serializers.py
+from functools import lru_cache
+from operator import attrgetter
+
 from rest_framework import serializers
-from .models import Exercise
+from translations.query import resolve
+from .models import Exercise, ExerciseQuerySet
+
+LOCALIZED_FIELDS = ('name', 'description', 'category', 'instructions')
+# Shared with the SQL path so a missing translation reads the same everywhere.
+LOCALIZED_DEFAULTS = ExerciseQuerySet.localized_fields
 
 class ExerciseSerializer(serializers.ModelSerializer):
     class Meta:
@@ -14,7 +22,35 @@ class ExerciseSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         lang = self.context.get('lang', 'en')
         data = super().to_representation(instance)
-        for field in ['name', 'description', 'category', 'instructions']:
+        for field in LOCALIZED_FIELDS:
             if field in data:
-                data[field] = getattr(instance, field, {}).get(lang, getattr(instance, field, {}).get('en', ''))
-        return data
\ No newline at end of file
+                data[field] = resolve(instance, field, lang, LOCALIZED_DEFAULTS[field])
+        return data
+
+
+# Lean read path: the same output as ExerciseSerializer (see the parity tests)
+# without DRF field machinery, from a field plan compiled once per language.
+# Exercises loaded with ``Exercise.objects.localized(lang)`` skip the
+# per-row translation lookup.
+
+def localized_getter(field, lang, default):
+    def get(obj):
+        return resolve(obj, field, lang, default)
+    return get
+
+
+@lru_cache(maxsize=None)
+def exercise_field_plan(lang):
+    return tuple(
+        (field, localized_getter(field, lang, LOCALIZED_DEFAULTS[field]) if field in LOCALIZED_FIELDS else attrgetter(field))
+        for field in ExerciseSerializer.Meta.fields
+    )
+
+
+def serialize_exercise(exercise, lang):
+    return {field: get(exercise) for field, get in exercise_field_plan(lang)}
+
+
+def serialize_exercises(exercises, lang):
+    plan = exercise_field_plan(lang)
+    return [{field: get(exercise) for field, get in plan} for exercise in exercises]
@@ -0,0 +1,22 @@
+# backend/fitness/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from core import catalog
+from . import autocomplete
+from .models import Exercise
+
+
+@receiver(post_save, sender=Exercise)
+def exercise_saved(sender, instance, using, **kwargs):
+    # After commit, so no reader caches pre-commit rows under the new version
+    # and a rollback leaves the autocomplete index alone. The index learns
+    # which version this write produced.
+    transaction.on_commit(lambda: autocomplete.exercise_saved(instance, catalog.invalidate()), using=using)
+
+
+@receiver(post_delete, sender=Exercise)
+def exercise_deleted(sender, instance, using, **kwargs):
+    pk = instance.pk  # cleared by delete() before commit
+    transaction.on_commit(lambda: autocomplete.exercise_deleted(pk, catalog.invalidate()), using=using)
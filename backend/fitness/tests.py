@@ -1,3 +1,205 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction
 from django.test import TestCase
+from django.urls import reverse
+
+from core import catalog
+from . import autocomplete
+from .models import Exercise
+from .serializers import ExerciseSerializer, serialize_exercise, serialize_exercises
+
+
+def make_exercise(name_en, **kwargs):
+    defaults = {
+        'name': {'en': name_en, 'ar': f'{name_en} (ar)', 'fr': f'{name_en} (fr)'},
+        'description': {'en': f'{name_en} description', 'fr': f'{name_en} description (fr)'},
+        'instructions': {'en': ['Step 1', 'Step 2'], 'fr': ['Étape 1', 'Étape 2']},
+        'category': {'en': 'Chest', 'fr': 'Pectoraux'},
+    }
+    defaults.update(kwargs)
+    return Exercise.objects.create(**defaults)
+
+
+class ExerciseListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_list_is_served_from_snapshot_and_invalidated_on_write(self):
+        exercise = make_exercise('Bench Press')
+        response = self.client.get(reverse('exercise-list'), {'lang': 'fr'})
+        self.assertEqual(response.json()[0]['name'], 'Bench Press (fr)')
+        self.assertEqual(response.json()[0]['instructions'], ['Étape 1', 'Étape 2'])
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('exercise-list'), {'lang': 'fr'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            exercise.delete()
+        self.assertEqual(self.client.get(reverse('exercise-list'), {'lang': 'fr'}).json(), [])
+
+    def test_conditional_get_returns_304_until_catalog_changes(self):
+        exercise = make_exercise('Squat')
+        url = reverse('exercise-detail', args=[exercise.pk])
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn('Last-Modified', response.headers)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        list_etag = self.client.get(reverse('exercise-list')).headers['ETag']
+        self.assertNotEqual(list_etag, etag)
+
+        exercise.difficulty = 'advanced'
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            exercise.save()
+            # Until the write commits, readers keep the old version.
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertTrue(callbacks)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['difficulty'], 'advanced')
+
+    def test_paginated_list_walks_cursor_and_projects_fields(self):
+        exercises = [make_exercise(f'Exercise {i}') for i in range(5)]
+        exercises[0].name = {'en': 'English only'}
+        exercises[0].save()
+
+        url = reverse('exercise-list')
+        response = self.client.get(url, {'lang': 'fr', 'limit': 2, 'fields': 'id,name,instructions'})
+        page = response.json()
+        self.assertEqual(page['results'][0], {
+            'id': exercises[0].pk, 'name': 'English only', 'instructions': ['Étape 1', 'Étape 2'],
+        })
+        self.assertEqual(page['next_cursor'], exercises[1].pk)
+
+        seen = [r['id'] for r in page['results']]
+        while page['next_cursor']:
+            page = self.client.get(url, {'limit': 2, 'cursor': page['next_cursor']}).json()
+            seen += [r['id'] for r in page['results']]
+        self.assertEqual(seen, [e.pk for e in exercises])
+        self.assertEqual(set(page['results'][0]), set(ExerciseSerializer.Meta.fields))
+
+    def test_paginated_list_matches_serializer_output(self):
+        make_exercise('Deadlift')
+        full = self.client.get(reverse('exercise-list'), {'lang': 'ar'}).json()
+        page = self.client.get(reverse('exercise-list'), {'lang': 'ar', 'limit': 10}).json()
+        self.assertEqual(page['results'], full)
+
+    def test_paginated_list_rejects_unknown_fields(self):
+        response = self.client.get(reverse('exercise-list'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FastSerializerParityTests(TestCase):
+    def test_matches_exercise_serializer(self):
+        make_exercise('Bench Press', target_muscles=['chest'], demo_video_url='https://example.com/v')
+        make_exercise('Only English', name={'en': 'Only English'}, category={'fr': 'Pectoraux'})
+        exercises = list(Exercise.objects.order_by('id'))
+        for lang in ('en', 'fr', 'ar'):
+            expected = ExerciseSerializer(exercises, many=True, context={'lang': lang}).data
+            self.assertEqual(serialize_exercises(exercises, lang), expected)
+
+    def test_missing_translations_default_alike_on_every_path(self):
+        exercise = make_exercise('Bare', description={}, instructions={}, category={})
+        detail = self.client.get(reverse('exercise-detail', args=[exercise.pk])).json()
+        self.assertEqual(detail['instructions'], '')
+        self.assertEqual(detail['category'], '')
+        self.assertEqual(self.client.get(reverse('exercise-list')).json(), [detail])
+        page = self.client.get(reverse('exercise-list'), {'limit': 10}).json()
+        self.assertEqual(page['results'], [detail])
+        search = self.client.get(reverse('exercise-search'), {'q': 'bare'}).json()
+        self.assertEqual(search['results'], [detail])
+        exercise.refresh_from_db()
+        self.assertEqual(ExerciseSerializer(exercise).data, detail)
+        self.assertEqual(serialize_exercise(exercise, 'en'), detail)
+
+
+class ExerciseSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.bench = make_exercise('Bench Press', main_muscle='Chest', equipment='Barbell',
+                                   target_muscles=['chest', 'triceps'])
+        self.incline = make_exercise('Incline Bench Press', main_muscle='Chest', equipment='Dumbbell',
+                                     target_muscles=['chest', 'shoulders'])
+        self.squat = make_exercise('Squat', main_muscle='Legs', equipment='Barbell',
+                                   target_muscles=['quads', 'glutes'])
+
+    def search(self, **params):
+        response = self.client.get(reverse('exercise-search'), params)
+        self.assertEqual(response.status_code, 200)
+        return [r['id'] for r in response.json()['results']]
+
+    def test_name_substring_and_prefix(self):
+        self.assertEqual(self.search(q='bench'), [self.bench.pk, self.incline.pk])
+        self.assertEqual(self.search(q='bench', match='prefix'), [self.bench.pk])
+        self.assertEqual(self.search(q='squat (fr', lang='fr'), [self.squat.pk])
+        # English names still match when searching in another language.
+        self.assertEqual(self.search(q='squat', lang='ar'), [self.squat.pk])
+
+    def test_filters(self):
+        self.assertEqual(self.search(equipment='Barbell'), [self.bench.pk, self.squat.pk])
+        self.assertEqual(self.search(main_muscle='Chest', equipment='Dumbbell'), [self.incline.pk])
+        self.assertEqual(self.search(target_muscles='chest'), [self.bench.pk, self.incline.pk])
+        self.assertEqual(self.search(target_muscles=['chest', 'triceps']), [self.bench.pk])
+        self.assertEqual(self.search(q='press', target_muscles='glutes'), [])
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete.reset()
+
+    def suggest(self, q, lang='en'):
+        response = self.client.get(reverse('exercise-autocomplete'), {'q': q, 'lang': lang})
+        return [r['name'] for r in response.json()['results']]
+
+    def test_normalization(self):
+        self.assertEqual(autocomplete.normalize('Développé Élevé'), 'developpe eleve')
+        self.assertEqual(autocomplete.normalize('إِسْتِرَاحَة'), autocomplete.normalize('استراحه'))
+        self.assertEqual(autocomplete.normalize('أ آ إ ٱ'), 'ا ا ا ا')
+
+    def test_prefix_search_is_kept_current_by_signals(self):
+        make_exercise('Bench Press', name={'en': 'Bench Press', 'fr': 'Développé couché', 'ar': 'ضغط البنش'})
+        make_exercise('Incline Bench Press')
+        self.assertEqual(self.suggest('ben'), ['Bench Press', 'Incline Bench Press'])
+        self.assertEqual(self.suggest('bench inc'), ['Incline Bench Press'])
+        self.assertEqual(self.suggest('deve', 'fr'), ['Développé couché'])
+        self.assertEqual(self.suggest('البنش', 'ar'), ['ضغط البنش'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            squat = make_exercise('Front Squat')
+        self.assertEqual(self.suggest('squ'), ['Front Squat'])
+        with self.captureOnCommitCallbacks(execute=True):
+            squat.delete()
+        self.assertEqual(self.suggest('squ'), [])
+        self.assertEqual(autocomplete.get_index().stats()['exercises'], 2)
+
+        # Rolled-back writes never reach the index.
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                make_exercise('Ghost Row')
+                raise ValueError
+        self.assertEqual(self.suggest('ghost'), [])
+
+    def test_changes_from_other_workers_are_not_skipped(self):
+        make_exercise('Front Squat')
+        self.assertEqual(self.suggest('squ'), ['Front Squat'])
+        # Another worker commits an exercise; only the version tells us.
+        Exercise.objects.bulk_create([Exercise(name={'en': 'Back Squat'}, description={}, instructions={},
+                                               category={})])
+        catalog.bump_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            make_exercise('Squat Jump')
+        self.assertEqual(sorted(self.suggest('squ')), ['Back Squat', 'Front Squat', 'Squat Jump'])
 
-# Create your tests here.
+    def test_common_prefixes_do_not_drop_multi_word_matches(self):
+        index = autocomplete.AutocompleteIndex(max_terms=1000)
+        index.load([(pk, {'en': f'Split Squat {pk}'}) for pk in range(1, 50)] + [(50, {'en': 'Sumo Squat'})])
+        with mock.patch.object(autocomplete, 'MAX_CANDIDATES', 10):
+            self.assertEqual([r['id'] for r in index.search('squat sumo', 'fr')], [50])
+            self.assertEqual(len(index.search('s', 'en', limit=100)), 10)
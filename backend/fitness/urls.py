@@ -4,4 +4,12 @@ from . import views
 urlpatterns = [
     path('exercises/', views.exercise_list, name='exercise-list'),
     path('exercises/<int:pk>/', views.exercise_detail, name='exercise-detail'),
-]
\ No newline at end of file
+    path('search/', views.exercise_search, name='exercise-search'),
+    path('autocomplete/', views.exercise_autocomplete, name='exercise-autocomplete'),
+]
+
+# Served by core.async_urls in front of the routes above.
+async_urlpatterns = [
+    path('exercises/', views.exercise_list_async, name='exercise-list'),
+    path('exercises/<int:pk>/', views.exercise_detail_async, name='exercise-detail'),
+]
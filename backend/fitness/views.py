@@ -1,18 +1,101 @@
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Lower
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from core import catalog
+from core.async_api import json_response
+from core.instrumentation import timer
+from translations import storage as translations
+from . import autocomplete
 from .models import Exercise
-from .serializers import ExerciseSerializer
+from .serializers import LOCALIZED_FIELDS, ExerciseSerializer, serialize_exercise, serialize_exercises
 
+EXERCISE_FIELDS = ExerciseSerializer.Meta.fields
+SEARCH_FILTER_FIELDS = ('main_muscle', 'equipment', 'mechanics', 'difficulty')
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_AUTOCOMPLETE_RESULTS = 20
+
+@catalog.register_snapshot(catalog.EXERCISES)
+def build_exercise_list(lang):
+    # Only the resolved language leaves the database.
+    exercises = list(Exercise.objects.localized(lang).defer(*LOCALIZED_FIELDS))
+    with timer('serialize'):
+        return serialize_exercises(exercises, lang)
+
+def _page_query(request, lang, exercises=None):
+    """Return ``(error, None)`` or ``(None, (queryset, fields, localized, limit))``."""
+    fields = request.GET.get('fields')
+    fields = [f for f in fields.split(',') if f] if fields else list(EXERCISE_FIELDS)
+    unknown = [f for f in fields if f not in EXERCISE_FIELDS]
+    if unknown:
+        return f"Unknown fields: {', '.join(unknown)}", None
+    try:
+        cursor = int(request.GET.get('cursor', 0))
+        limit = min(int(request.GET.get('limit', DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+    except ValueError:
+        return 'cursor and limit must be integers', None
+    if limit < 1:
+        return 'limit must be positive', None
+
+    # Pull only the requested language (falling back to 'en') out of the
+    # translations in SQL instead of loading every one.
+    translated = [f for f in fields if f in LOCALIZED_FIELDS]
+    localized = [f'{f}_l10n' for f in translated]
+    columns = ['id'] + [f for f in fields if f != 'id' and f not in translated]
+    queryset = (Exercise.objects.all() if exercises is None else exercises).filter(id__gt=cursor).order_by('id')
+    if translated:
+        queryset = queryset.localized(lang, *translated)
+    queryset = queryset.values(*columns, *localized)[:limit + 1]
+    return None, (queryset, fields, localized, limit)
+
+def _page_body(rows, fields, localized, limit):
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    results = []
+    with timer('serialize'):
+        for row in rows:
+            results.append({
+                f: row[f'{f}_l10n'] if f'{f}_l10n' in localized else row[f]
+                for f in fields
+            })
+    return {
+        'results': results,
+        'next_cursor': rows[-1]['id'] if has_more else None,
+    }
+
+def _exercise_page(request, lang, exercises=None):
+    error, page = _page_query(request, lang, exercises)
+    if error:
+        return Response({'error': error}, status=400)
+    queryset, fields, localized, limit = page
+    return Response(_page_body(list(queryset), fields, localized, limit))
+
+async def _aexercise_page(request, lang):
+    error, page = _page_query(request, lang)
+    if error:
+        return json_response({'error': error}, status=400)
+    queryset, fields, localized, limit = page
+    return json_response(_page_body([row async for row in queryset], fields, localized, limit))
+
+@catalog.conditional
 @api_view(['GET'])
 def exercise_list(request):
     lang = request.GET.get('lang', 'en')
-    if lang not in ['en', 'fr', 'ar']:
+    if lang not in catalog.LANGUAGES:
         lang = 'en'
 
-    exercises = Exercise.objects.all()
-    serializer = ExerciseSerializer(exercises, many=True, context={'lang': lang})
-    return Response(serializer.data)
+    # The bare list stays a snapshot for existing clients; asking for a page
+    # or a projection switches to keyset pagination on id.
+    if {'cursor', 'limit', 'fields'} & request.GET.keys():
+        return _exercise_page(request, lang)
+    return catalog.snapshot_response(request, catalog.EXERCISES, lang)
 
+@catalog.conditional
 @api_view(['GET'])
 def exercise_detail(request, pk):
     lang = request.GET.get('lang', 'en')
@@ -20,8 +103,88 @@ def exercise_detail(request, pk):
         lang = 'en'
 
     try:
-        exercise = Exercise.objects.get(pk=pk)
-        serializer = ExerciseSerializer(exercise, context={'lang': lang})
-        return Response(serializer.data)
+        exercise = Exercise.objects.localized(lang).get(pk=pk)
+        with timer('serialize'):
+            return Response(serialize_exercise(exercise, lang))
     except Exercise.DoesNotExist:
-        return Response({'error': 'Exercise not found'}, status=404)
\ No newline at end of file
+        return Response({'error': 'Exercise not found'}, status=404)
+
+@catalog.aconditional
+@require_GET
+async def exercise_list_async(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    if {'cursor', 'limit', 'fields'} & request.GET.keys():
+        return await _aexercise_page(request, lang)
+    return await catalog.asnapshot_response(request, catalog.EXERCISES, lang)
+
+@catalog.aconditional
+@require_GET
+async def exercise_detail_async(request, pk):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    try:
+        exercise = await Exercise.objects.localized(lang).aget(pk=pk)
+    except Exercise.DoesNotExist:
+        return json_response({'error': 'Exercise not found'}, status=404)
+    with timer('serialize'):
+        return json_response(serialize_exercise(exercise, lang))
+
+def _with_target_muscle(exercises, muscle):
+    if connections[exercises.db].vendor == 'postgresql':
+        # jsonb @> is served by the GIN index from migration 0003.
+        return exercises.filter(target_muscles__contains=[muscle])
+    table = Exercise._meta.db_table
+    return exercises.filter(RawSQL(
+        f'EXISTS (SELECT 1 FROM json_each("{table}"."target_muscles") WHERE json_each.value = %s)',
+        [muscle],
+        output_field=BooleanField(),
+    ))
+
+@catalog.conditional
+@api_view(['GET'])
+def exercise_search(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+
+    exercises = Exercise.objects.all()
+    q = request.GET.get('q', '').strip().lower()
+    if q:
+        match = request.GET.get('match', 'substring')
+        if match not in ('prefix', 'substring'):
+            return Response({'error': "match must be 'prefix' or 'substring'"}, status=400)
+        lookup = 'startswith' if match == 'prefix' else 'contains'
+        # Match the requested language and English; the LOWER(name->>lang)
+        # expressions are what the trigram indexes are built on.
+        if translations.enabled():
+            exercises = exercises.filter(pk__in=translations.name_matches(Exercise, {lang, 'en'}, lookup, q))
+        else:
+            condition = Q()
+            for key in dict.fromkeys([lang, 'en']):
+                exercises = exercises.alias(**{f'name_{key}': Lower(KeyTextTransform(key, 'name'))})
+                condition |= Q(**{f'name_{key}__{lookup}': q})
+            exercises = exercises.filter(condition)
+
+    for field in SEARCH_FILTER_FIELDS:
+        if field in request.GET:
+            exercises = exercises.filter(**{field: request.GET[field]})
+    for muscle in request.GET.getlist('target_muscles'):
+        exercises = _with_target_muscle(exercises, muscle)
+
+    return _exercise_page(request, lang, exercises)
+
+@api_view(['GET'])
+def exercise_autocomplete(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    try:
+        limit = min(int(request.GET.get('limit', 10)), MAX_AUTOCOMPLETE_RESULTS)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=400)
+
+    results = autocomplete.get_index().search(request.GET.get('q', ''), lang, limit)
+    return Response({'results': results})
@@ -0,0 +1,205 @@
+# backend/programs/documents.py
+"""
+Materialized ``program_detail`` responses.
+
+``ProgramDocument`` holds the rendered JSON of every public program for each
+language and response shape, so ``program_detail`` is one indexed read
+instead of the Program -> sessions -> exercises joins.
+
+When a program, session, session exercise or exercise changes, the signal
+handlers call ``invalidate``. It deletes the affected documents right away,
+inside the writing transaction, and queues a rebuild on a background
+thread once that transaction commits. Until the rebuild lands the view
+renders live, so a missing document only costs speed. The view never
+writes documents itself. A reader that raced a writer could otherwise store
+a document rendered from the old rows after the writer's delete.
+
+A rebuild can race a writer the same way: it may read the rows before the
+write commits and store its documents after the write's delete. Writers bump
+the catalog version once they commit, so a rebuild notes the version before
+reading and, if it has moved by the time a chunk is rendered, drops that
+chunk and queues itself again. That leaves only the moment between the
+check and the upsert, which ``check_program_documents`` covers.
+
+Rebuilds run on one thread per process (``PROGRAM_DOCUMENTS_BACKGROUND``;
+set it to false to rebuild synchronously on commit). Pending program ids
+are coalesced, and each change queues a rebuild after any that is already
+running, so documents converge to the committed state. Bulk writes that
+bypass signals call ``invalidate()`` with no ids. ``check_program_documents``
+finds and repairs documents that drifted anyway.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from core import catalog, routers
+from .models import Program, ProgramDocument, ProgramSession
+from .serializers import PROGRAM_SHAPES
+
+logger = logging.getLogger(__name__)
+
+ALL = None
+
+_lock = threading.Lock()
+_pending = set()
+_pending_all = False
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='program-documents')
+
+# Set inside ``deferred()``: program ids to invalidate on exit (ALL: everything).
+_deferred = ContextVar('program_documents_deferred', default=False)
+
+
+def render(program):
+    """``{(lang, shape): content}`` for a program loaded ``with_sessions()``."""
+    renderer = JSONRenderer()
+    return {
+        (lang, shape): renderer.render(serialize(program, lang)).decode()
+        for lang in catalog.LANGUAGES
+        for shape, serialize in PROGRAM_SHAPES.items()
+    }
+
+
+def _content(program_id, lang, shape):
+    documents = ProgramDocument.objects.filter(program_id=program_id, lang=lang, shape=shape)
+    return documents.values_list('content', flat=True)
+
+
+def get(program_id, lang, shape):
+    """The stored body, or ``None`` when it has not been (re)built yet."""
+    return _content(program_id, lang, shape).first()
+
+
+async def aget(program_id, lang, shape):
+    return await _content(program_id, lang, shape).afirst()
+
+
+def public_programs():
+    return Program.objects.with_sessions().filter(is_custom=False).order_by('id')
+
+
+def _rows(programs):
+    return [
+        ProgramDocument(program_id=program.pk, lang=lang, shape=shape, content=content)
+        for program in programs
+        for (lang, shape), content in render(program).items()
+    ]
+
+
+def write(programs):
+    """Upsert the documents of ``programs`` (loaded ``with_sessions()``)."""
+    return _upsert(_rows(programs))
+
+
+def _upsert(rows):
+    ProgramDocument.objects.bulk_create(
+        rows, batch_size=500, update_conflicts=True,
+        unique_fields=['program', 'lang', 'shape'], update_fields=['content', 'built_at'],
+    )
+    return len(rows)
+
+
+def rebuild(program_ids=ALL, chunk_size=100):
+    """Render documents for ``program_ids`` (all public programs by default); return the count."""
+    programs = public_programs()
+    if program_ids is not ALL:
+        programs = programs.filter(pk__in=program_ids)
+    written, chunk = 0, []
+    version, _ = catalog.get_version()
+
+    def unchanged():
+        return catalog.get_version()[0] == version
+
+    # Documents outlive replication lag; render them from the primary.
+    with routers.primary():
+        for program in programs.iterator(chunk_size=chunk_size):
+            chunk.append(program)
+            if len(chunk) < chunk_size:
+                continue
+            rows, chunk = _rows(chunk), []
+            if not unchanged():
+                break
+            written += _upsert(rows)
+        else:
+            rows = _rows(chunk)
+            if unchanged():
+                return written + _upsert(rows)
+    # A write committed while we read; its rows may be newer than ours.
+    logger.info('The catalog changed during a program document rebuild; starting over')
+    schedule(program_ids)
+    return written
+
+
+def invalidate(program_ids=ALL):
+    """Drop the documents of ``program_ids`` (all if omitted) and rebuild them after commit."""
+    deferred = _deferred.get()
+    if deferred is not False:
+        if deferred is not ALL:
+            _deferred.set(ALL if program_ids is ALL else deferred | set(program_ids))
+        return
+    documents = ProgramDocument.objects.all()
+    if program_ids is not ALL:
+        program_ids = set(program_ids)
+        if not program_ids:
+            return
+        documents = documents.filter(program_id__in=program_ids)
+    documents.delete()
+    transaction.on_commit(lambda: schedule(program_ids))
+
+
+@contextmanager
+def deferred(everything=False):
+    """
+    Collect the invalidations of the block into one. With ``everything`` all
+    documents are invalidated on exit and per-row signals cost no queries.
+    """
+    token = _deferred.set(ALL if everything else set())
+    try:
+        yield
+    finally:
+        program_ids = _deferred.get()
+        _deferred.reset(token)
+    invalidate(program_ids)
+
+
+def programs_using(exercise_id=None, session_id=None):
+    sessions = ProgramSession.objects.all()
+    if exercise_id is not None:
+        sessions = sessions.filter(exercises__exercise_id=exercise_id)
+    if session_id is not None:
+        sessions = sessions.filter(pk=session_id)
+    return sessions.values_list('program_id', flat=True).distinct()
+
+
+def schedule(program_ids=ALL):
+    global _pending_all
+    if not getattr(settings, 'PROGRAM_DOCUMENTS_BACKGROUND', True):
+        rebuild(program_ids)
+        return
+    with _lock:
+        if program_ids is ALL:
+            _pending_all = True
+        else:
+            _pending.update(program_ids)
+    _executor.submit(_drain)
+
+
+def _drain():
+    global _pending_all
+    with _lock:
+        program_ids = ALL if _pending_all else set(_pending)
+        _pending.clear()
+        _pending_all = False
+    if program_ids is not ALL and not program_ids:
+        return  # an earlier drain already took them
+    try:
+        rebuild(program_ids)
+    except Exception:
+        logger.exception('Rebuilding program documents failed; check_program_documents --repair will catch up')
+    finally:
+        connection.close()
@@ -0,0 +1,322 @@
+# backend/programs/library.py
+"""
+NDJSON import/export of the public catalog.
+
+One JSON document per line, parents before children::
+
+    {"type": "exercise", "name": {"en": "Bench Press", ...}, "category": {...}, ...}
+    {"type": "category", "name": {"en": "Strength", ...}}
+    {"type": "program", "name": {...}, "category": "Strength", "coach": "coach@traint.com",
+     "sessions": [{"day_number": 1, "name": {...},
+                   "exercises": [{"exercise": "Bench Press", "sets": 5, "reps": 5, "order": 1}]}]}
+
+Rows are identified by natural key, like ``Seeder``: exercises by English
+name (case-insensitive), categories by English name, non-custom programs by
+English name, sessions by (program, day) and session exercises by
+(session, order). Import upserts in batches against in-memory key maps, so
+existing ids (and the workouts that point at them) survive; a program's
+sessions and exercises are replaced by the ones in the file. Export streams
+through ``iterator(chunk_size=...)`` and import reads line by line, so
+memory stays flat however large the library is. Images are not included.
+"""
+import json
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+
+from coaches.models import Coach
+from core import catalog, routers
+from fitness.models import Exercise
+from translations import storage as translations
+from . import documents
+from .models import Program, ProgramCategory, ProgramSession, SessionExercise
+
+EXERCISE_FIELDS = [
+    'name', 'description', 'instructions', 'category', 'difficulty', 'demo_video_url', 'target_muscles',
+    'main_muscle', 'equipment', 'mechanics',
+]
+PROGRAM_FIELDS = ['name', 'description', 'difficulty', 'duration_weeks']
+# Record type -> (model, fields checked before the record is buffered)
+RECORD_FIELDS = {
+    'exercise': (Exercise, EXERCISE_FIELDS),
+    'category': (ProgramCategory, ['name']),
+    'program': (Program, PROGRAM_FIELDS),
+}
+
+# Record types in the order they must appear in a file.
+TYPES = ('exercise', 'category', 'program')
+
+MAX_ERRORS = 100
+
+
+class LibraryError(ValueError):
+    pass
+
+
+def clean(model, fields, values):
+    """
+    Convert ``values[field]`` for each of ``fields`` present with the model
+    field, checking types, lengths, choices and bounds, so a bad value is
+    reported against its line instead of failing the whole import.
+    """
+    for name in fields:
+        if name not in values:
+            continue
+        field = model._meta.get_field(name)
+        try:
+            if isinstance(field, models.CharField) and not isinstance(values[name], (str, type(None))):
+                # to_python would store str() of a list or number.
+                raise ValidationError('Enter a string.', code='invalid')
+            value = field.to_python(values[name])
+            if value is None and not field.null:
+                raise ValidationError(field.error_messages['null'], code='null')
+            # Empty translations ({}) are allowed, unlike in forms.
+            if value not in field.empty_values:
+                field.validate(value, None)
+                field.run_validators(value)
+        except ValidationError as e:
+            raise LibraryError(f'{name}: {" ".join(e.messages)}') from e
+        values[name] = value
+    return values
+
+
+def english(name):
+    return name.get('en', '') if isinstance(name, dict) else ''
+
+
+def exercise_key(name):
+    return english(name).strip().lower()
+
+
+def export_lines(chunk_size=500):
+    """Yield the catalog as NDJSON lines."""
+    def line(record):
+        return json.dumps(record, ensure_ascii=False, sort_keys=True) + '\n'
+
+    for values in Exercise.objects.order_by('id').values(*EXERCISE_FIELDS).iterator(chunk_size=chunk_size):
+        yield line({'type': 'exercise', **values})
+    for name in ProgramCategory.objects.order_by('id').values_list('name', flat=True).iterator(chunk_size=chunk_size):
+        yield line({'type': 'category', 'name': name})
+
+    programs = (
+        Program.objects.with_sessions().filter(is_custom=False).select_related('category', 'coach__user')
+        .order_by('id')
+    )
+    for program in programs.iterator(chunk_size=chunk_size):
+        yield line({
+            'type': 'program',
+            **{field: getattr(program, field) for field in PROGRAM_FIELDS},
+            'category': english(program.category.name),
+            'coach': program.coach.user.email if program.coach else None,
+            'sessions': [
+                {
+                    'day_number': session.day_number,
+                    'name': session.name,
+                    'exercises': [
+                        {'exercise': english(item.exercise.name), 'sets': item.sets, 'reps': item.reps,
+                         'order': item.order}
+                        for item in session.exercises.all()
+                    ],
+                }
+                for session in program.sessions.all()
+            ],
+        })
+
+
+class Importer:
+    def __init__(self, owner_id, batch_size=500):
+        self.owner_id = owner_id
+        self.batch_size = batch_size
+        self.stats = {kind: {'created': 0, 'updated': 0, 'unchanged': 0} for kind in TYPES}
+        self.errors = []  # the first MAX_ERRORS messages
+        self.error_count = 0
+        self.pending = {kind: [] for kind in TYPES}
+        self.touched = defaultdict(set)  # model -> ids created or changed
+        # Natural keys decide insert vs update: a lagging replica would
+        # turn updates into duplicates, so read them from the primary.
+        with routers.primary():
+            self.exercises = {exercise_key(name): pk for pk, name in Exercise.objects.values_list('id', 'name')}
+            self.categories = {english(name): pk for pk, name in ProgramCategory.objects.values_list('id', 'name')}
+            self.programs = {
+                english(name): pk for pk, name in Program.objects.filter(is_custom=False).values_list('id', 'name')
+            }
+            self.coaches = dict(Coach.objects.values_list('user__email', 'id'))
+
+    def run(self, lines):
+        """Import an iterable of NDJSON lines (str or bytes); return ``self``."""
+        with routers.primary(), transaction.atomic(), documents.deferred(everything=True):
+            for number, raw in enumerate(lines, 1):
+                if not raw.strip():
+                    continue
+                try:
+                    record = json.loads(raw)
+                    kind = record.pop('type')
+                    if kind not in TYPES:
+                        raise LibraryError(f'unknown type {kind!r}')
+                    if not english(record.get('name')):
+                        raise LibraryError('name needs an "en" entry')
+                    clean(*RECORD_FIELDS[kind], record)
+                except (ValueError, KeyError, AttributeError) as e:
+                    self.error(number, e)
+                    continue
+                self.pending[kind].append((number, record))
+                if len(self.pending[kind]) >= self.batch_size:
+                    self.flush(kind)
+            for kind in TYPES:
+                self.flush(kind)
+            # Bulk writes bypass the post_save handlers.
+            translations.sync_objects(self.touched)
+        catalog.invalidate()
+        return self
+
+    def error(self, number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(f'line {number}: {message}')
+
+    def flush(self, kind):
+        # Children resolve against their parents' keys, so write those first.
+        for parent in TYPES[:TYPES.index(kind)]:
+            self.flush(parent)
+        batch, self.pending[kind] = self.pending[kind], []
+        if batch:
+            getattr(self, f'import_{kind}')(batch)
+
+    def _upsert(self, kind, model, keys, rows, update_fields):
+        new, changed = [], []
+        for key, row in rows:
+            row.pk = keys.get(key)
+            (changed if row.pk else new).append((key, row))
+        model.objects.bulk_create([row for _, row in new], batch_size=self.batch_size)
+        changed = self._update(model, [row for _, row in changed], update_fields)
+        for key, row in new:
+            keys[key] = row.pk
+            self.touched[model].add(row.pk)
+        self.stats[kind]['created'] += len(new)
+        self.stats[kind]['updated'] += changed
+        self.stats[kind]['unchanged'] += len(rows) - len(new) - changed
+
+    def _update(self, model, rows, fields):
+        """``bulk_update`` the rows that differ from the database; return how many did."""
+        if not rows:
+            return 0
+        attnames = [model._meta.get_field(field).attname for field in fields]
+        current = {
+            values[0]: values[1:]
+            for values in model.objects.filter(pk__in=[row.pk for row in rows]).values_list('pk', *attnames)
+        }
+        changed = [row for row in rows if current.get(row.pk) != tuple(getattr(row, name) for name in attnames)]
+        # bulk_update's CASE statements are costly; re-imports mostly change nothing.
+        model.objects.bulk_update(changed, fields, batch_size=self.batch_size)
+        self.touched[model].update(row.pk for row in changed)
+        return len(changed)
+
+    def _unique(self, batch, key):
+        # A later line for the same key wins.
+        return list({key(record): (number, record) for number, record in batch}.values())
+
+    def import_exercise(self, batch):
+        rows = []
+        for number, record in self._unique(batch, lambda record: exercise_key(record['name'])):
+            fields = {field: record[field] for field in EXERCISE_FIELDS if field in record}
+            rows.append((exercise_key(record['name']), Exercise(**{
+                'description': {}, 'instructions': {}, 'category': {}, **fields,
+            })))
+        # The key is only the English text; the other languages can still change.
+        self._upsert('exercise', Exercise, self.exercises, rows, EXERCISE_FIELDS)
+
+    def import_category(self, batch):
+        rows = [
+            (english(record['name']), ProgramCategory(name=record['name']))
+            for _, record in self._unique(batch, lambda record: english(record['name']))
+        ]
+        self._upsert('category', ProgramCategory, self.categories, rows, ['name'])
+
+    def import_program(self, batch):
+        rows, trees = [], []
+        for number, record in self._unique(batch, lambda record: english(record['name'])):
+            try:
+                program, sessions = self.build_program(record)
+            except (LibraryError, AttributeError, KeyError, TypeError, ValueError) as e:
+                self.error(number, e)
+                continue
+            rows.append((english(record['name']), program))
+            trees.append((program, sessions))
+        self._upsert('program', Program, self.programs, rows,
+                     ['name', 'description', 'difficulty', 'duration_weeks', 'category', 'coach'])
+        self.replace_sessions(trees)
+
+    def build_program(self, record):
+        category = self.categories.get(record.get('category'))
+        if category is None:
+            raise LibraryError(f'unknown category {record.get("category")!r}')
+        coach = None
+        if record.get('coach'):
+            coach = self.coaches.get(record['coach'])
+            if coach is None:
+                raise LibraryError(f'unknown coach {record["coach"]!r}')
+        sessions = []
+        for session in record.get('sessions', []):
+            exercises = []
+            for item in session.get('exercises', []):
+                exercise = self.exercises.get(item['exercise'].strip().lower())
+                if exercise is None:
+                    raise LibraryError(f'unknown exercise {item["exercise"]!r}')
+                item = clean(SessionExercise, ['sets', 'reps', 'order'], {'sets': 5, 'reps': 5, **item})
+                exercises.append(SessionExercise(
+                    exercise_id=exercise, sets=item['sets'], reps=item['reps'], order=item['order'],
+                ))
+            day = clean(ProgramSession, ['day_number'], {'day_number': session['day_number']})['day_number']
+            if len({item.order for item in exercises}) != len(exercises):
+                raise LibraryError(f'duplicate exercise order on day {day}')
+            sessions.append((ProgramSession(day_number=day, name=session.get('name') or {}), exercises))
+        days = [session.day_number for session, _ in sessions]
+        if len(set(days)) != len(days):
+            raise LibraryError('duplicate day_number')
+        program = Program(
+            **{'description': {}, **{field: record[field] for field in PROGRAM_FIELDS if field in record}},
+            category_id=category, coach_id=coach, is_custom=False,
+        )
+        if not self.programs.get(english(record['name'])):
+            program.created_by_id = self.owner_id
+        return program, sessions
+
+    def replace_sessions(self, trees):
+        """Upsert sessions by (program, day) and their exercises by (session, order); drop the rest."""
+        program_ids = [program.pk for program, _ in trees]
+        existing = {
+            (program_id, day): pk
+            for pk, program_id, day in ProgramSession.objects.filter(program_id__in=program_ids)
+            .values_list('id', 'program_id', 'day_number')
+        }
+        sessions, kept = [], set()
+        for program, items in trees:
+            for session, _ in items:
+                session.program_id = program.pk
+                session.pk = existing.get((program.pk, session.day_number))
+                kept.add(session.pk)
+                sessions.append(session)
+        # delete() sends post_delete, which drops the sessions' translations.
+        ProgramSession.objects.filter(pk__in=set(existing.values()) - kept).delete()
+        self._update(ProgramSession, [s for s in sessions if s.pk], ['name'])
+        created = ProgramSession.objects.bulk_create([s for s in sessions if not s.pk], batch_size=self.batch_size)
+        self.touched[ProgramSession].update(session.pk for session in created)
+
+        session_ids = [session.pk for session in sessions]
+        existing = {
+            (session_id, order): pk
+            for pk, session_id, order in SessionExercise.objects.filter(session_id__in=session_ids)
+            .values_list('id', 'session_id', 'order')
+        }
+        exercises, kept = [], set()
+        for _, items in trees:
+            for session, session_exercises in items:
+                for item in session_exercises:
+                    item.session_id = session.pk
+                    item.pk = existing.get((session.pk, item.order))
+                    kept.add(item.pk)
+                    exercises.append(item)
+        SessionExercise.objects.filter(pk__in=set(existing.values()) - kept).delete()
+        self._update(SessionExercise, [e for e in exercises if e.pk], ['exercise', 'sets', 'reps'])
+        SessionExercise.objects.bulk_create([e for e in exercises if not e.pk], batch_size=self.batch_size)
@@ -0,0 +1,175 @@
+# backend/programs/management/commands/bench_api.py
+import json
+import platform
+import time
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from accounts.models import User
+from accounts.tokens import UserRefreshToken
+from core.benchmarking import summarize, test_database
+from fitness.models import Exercise
+from programs.models import Program, SessionExercise
+from programs.seeding import Seeder
+
+# URL names that are not part of the API surface.
+SKIPPED_URL_NAMES = {None}
+
+
+def url_names(resolver=None):
+    for pattern in (resolver or get_resolver()).url_patterns:
+        if isinstance(pattern, URLResolver):
+            if pattern.namespace == 'admin':
+                continue
+            yield from url_names(pattern)
+        elif isinstance(pattern, URLPattern):
+            yield pattern.name
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a synthetic dataset in a throwaway test database and measure latency percentiles, '
+        'queries per request and response size for every API endpoint. Emits JSON for diffing between commits.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--exercises', type=int, default=500)
+        parser.add_argument('--programs', type=int, default=100)
+        parser.add_argument('--plans', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--output', help='Write results to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        with test_database():
+            started = time.perf_counter()
+            Seeder(log=lambda message: None).run(
+                clients=options['users'],
+                programs=options['programs'],
+                plans=options['plans'],
+                exercises=options['exercises'],
+            )
+            self.stderr.write(f'Seeded dataset in {time.perf_counter() - started:.1f}s')
+            # Background document rebuilds would race library-import's writes
+            # on the shared in-memory SQLite test database.
+            with override_settings(METRICS_TOKEN='bench', AUTH_THROTTLE_IP_RATE=None, AUTH_THROTTLE_EMAIL_RATE=None,
+                                   PROGRAM_DOCUMENTS_BACKGROUND=False):
+                results = self.run_cases(options['repeat'])
+
+        report = {
+            'meta': {
+                'vendor': connection.vendor,
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'repeat': options['repeat'],
+                'dataset': {key: options[key] for key in ('users', 'exercises', 'programs', 'plans')},
+            },
+            'results': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def cases(self):
+        """(case name, url name, method, path, request kwargs); kwargs may be a callable."""
+        user = User.objects.get(email='client1@example.com')
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(user).access_token}'}
+        refresh = str(UserRefreshToken.for_user(user))
+        exercise = Exercise.objects.order_by('id').first()
+        program = Program.objects.order_by('id').first()
+        plan_ids = list(Program.objects.filter(is_custom=False).order_by('id').values_list('id', flat=True)[:20])
+        planned = list(SessionExercise.objects.filter(session__program=program, session__day_number=1).order_by('order'))
+        workout = {
+            'session': planned[0].session_id,
+            'sets': [
+                {'session_exercise': item.pk, 'weight': '60.0', 'reps': item.reps, 'rpe': '8'}
+                for item in planned for _ in range(item.sets)
+            ],
+        }
+        emails = (f'bench{i}@example.com' for i in range(10 ** 9))
+        login = {'email': 'client1@example.com', 'password': 'clientpass123'}
+
+        superuser = User.objects.get(is_superuser=True)
+        admin = {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(superuser).access_token}'}
+        library = b''.join(self.client.get(reverse('library-export'), **admin).streaming_content)
+
+        exercise_list = reverse('exercise-list')
+        etag = self.client.get(exercise_list, {'lang': 'fr'}).headers['ETag']
+        return [
+            ('exercise-list', 'exercise-list', 'get', exercise_list, {'data': {'lang': 'fr'}}),
+            ('exercise-list (304)', 'exercise-list', 'get', exercise_list,
+             {'data': {'lang': 'fr'}, 'HTTP_IF_NONE_MATCH': etag}),
+            ('exercise-list (page)', 'exercise-list', 'get', exercise_list,
+             {'data': {'lang': 'fr', 'limit': 50, 'fields': 'id,name,main_muscle'}}),
+            ('exercise-detail', 'exercise-detail', 'get', reverse('exercise-detail', args=[exercise.pk]), {}),
+            ('exercise-search', 'exercise-search', 'get', reverse('exercise-search'),
+             {'data': {'q': 'press', 'target_muscles': 'chest'}}),
+            ('exercise-autocomplete', 'exercise-autocomplete', 'get', reverse('exercise-autocomplete'),
+             {'data': {'q': 'syn ex', 'lang': 'ar'}}),
+            ('program-list', 'program-list', 'get', reverse('program-list'), {'data': {'lang': 'ar'}}),
+            ('program-detail', 'program-detail', 'get', reverse('program-detail', args=[program.pk]), {}),
+            ('program-detail (normalized)', 'program-detail', 'get', reverse('program-detail', args=[program.pk]),
+             {'data': {'shape': 'normalized'}}),
+            ('user-plan-create', 'user-plan-create', 'post', reverse('user-plan-create'),
+             {'data': {'program': program.pk}, **auth}),
+            ('user-plans', 'user-plans', 'get', reverse('user-plans'), {'data': {'lang': 'fr'}, **auth}),
+            ('user-plans (batch)', 'user-plans', 'post', reverse('user-plans'),
+             {'data': {'add': plan_ids[5:], 'remove': plan_ids[:5]}, 'content_type': 'application/json', **auth}),
+            ('workout-ingest', 'workout-ingest', 'post', reverse('workout-ingest'),
+             {'data': workout, 'content_type': 'application/json', **auth}),
+            ('workout-next', 'workout-next', 'get', reverse('workout-next'), {'data': {'lang': 'fr'}, **auth}),
+            ('workout-stats', 'workout-stats', 'get', reverse('workout-stats'), auth),
+            ('token_obtain_pair', 'token_obtain_pair', 'post', reverse('token_obtain_pair'), {'data': login}),
+            ('token_refresh', 'token_refresh', 'post', reverse('token_refresh'), {'data': {'refresh': refresh}}),
+            ('login', 'login', 'post', reverse('login'), {'data': login}),
+            ('register', 'register', 'post', reverse('register'),
+             lambda: {'data': {'email': next(emails), 'password': 'benchpass123'}}),
+            ('logout', 'logout', 'get', reverse('logout'), {}),
+            ('user-profile', 'user-profile', 'get', reverse('user-profile'), auth),
+            ('metrics', 'metrics', 'get', reverse('metrics'), {'HTTP_AUTHORIZATION': 'Bearer bench'}),
+            ('library-export', 'library-export', 'get', reverse('library-export'), admin),
+            ('library-import', 'library-import', 'post', reverse('library-import'),
+             {'data': library, 'content_type': 'application/x-ndjson', **admin}),
+        ]
+
+    def run_cases(self, repeat):
+        self.client = Client()
+        cases = self.cases()
+        uncovered = set(url_names()) - SKIPPED_URL_NAMES - {case[1] for case in cases}
+        if uncovered:
+            self.stderr.write(f'No benchmark case for: {", ".join(sorted(uncovered))}')
+
+        results = {}
+        for name, _, method, path, kwargs in cases:
+            timings, queries, sizes, statuses = [], [], [], set()
+            for i in range(repeat + 1):
+                request_kwargs = kwargs() if callable(kwargs) else kwargs
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = getattr(self.client, method)(path, **request_kwargs)
+                    content = b''.join(response.streaming_content) if response.streaming else response.content
+                    elapsed = (time.perf_counter() - started) * 1000
+                if i == 0:
+                    continue  # warm-up
+                timings.append(elapsed)
+                queries.append(len(captured))
+                sizes.append(len(content))
+                statuses.add(response.status_code)
+            results[name] = {
+                'method': method.upper(),
+                'path': path,
+                'status': sorted(statuses),
+                **summarize(timings),
+                'queries': max(queries),
+                'bytes': max(sizes),
+            }
+            self.stderr.write(f'{name}: p50={results[name]["p50_ms"]}ms queries={results[name]["queries"]}')
+        return results
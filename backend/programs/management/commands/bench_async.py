@@ -0,0 +1,107 @@
+# backend/programs/management/commands/bench_async.py
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from accounts.tokens import UserRefreshToken
+from core.benchmarking import summarize, test_database
+from fitness.models import Exercise
+from programs.models import Program
+from programs.seeding import Seeder
+
+URLCONFS = {'sync': 'core.urls', 'async': 'core.async_urls'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput and latency of the sync (DRF) and async read views when driven concurrently '
+        'through the ASGI handler, in a throwaway test database. --db-latency-ms adds a sleep to every '
+        'query to stand in for a remote database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=400, help='Requests per case and concurrency level.')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 10, 50])
+        parser.add_argument('--db-latency-ms', type=float, default=0)
+        parser.add_argument('--output', help='Write results to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        with test_database():
+            Seeder(log=lambda message: None).run(clients=50, programs=20, plans=10, exercises=200)
+            results = asyncio.run(self.run_cases(options))
+
+        output = json.dumps({'meta': {key: options[key] for key in ('requests', 'concurrency', 'db_latency_ms')},
+                             'results': results}, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    async def run_cases(self, options):
+        user = await User.objects.aget(email='client1@example.com')
+        auth = {'Authorization': f'Bearer {UserRefreshToken.for_user(user).access_token}'}
+        exercise = await Exercise.objects.order_by('id').afirst()
+        program = await Program.objects.order_by('id').afirst()
+        cases = [
+            ('exercise-list', reverse('exercise-list'), {'lang': 'fr'}, {}),
+            ('exercise-list (page)', reverse('exercise-list'), {'limit': 50, 'fields': 'id,name'}, {}),
+            ('exercise-detail', reverse('exercise-detail', args=[exercise.pk]), {}, {}),
+            ('program-detail', reverse('program-detail', args=[program.pk]), {'lang': 'ar'}, {}),
+            ('user-profile', reverse('user-profile'), {}, auth),
+        ]
+
+        latency = options['db_latency_ms'] / 1000
+
+        def slow_database(execute, sql, params, many, context):
+            time.sleep(latency)
+            return execute(sql, params, many, context)
+
+        results = {}
+        for mode, urlconf in URLCONFS.items():
+            with override_settings(ROOT_URLCONF=urlconf):
+                for name, path, params, headers in cases:
+                    for concurrency in options['concurrency']:
+                        result = await self.measure(
+                            path, params, headers, concurrency, options['requests'], slow_database if latency else None,
+                        )
+                        results.setdefault(name, {}).setdefault(mode, {})[str(concurrency)] = result
+                        self.stderr.write(
+                            f'{name} [{mode}] c={concurrency}: {result["rps"]} req/s p95={result["p95_ms"]}ms'
+                        )
+        return results
+
+    async def measure(self, path, params, headers, concurrency, total, wrapper):
+        client = AsyncClient()
+        await client.get(path, params, headers=headers)  # warm-up
+        queue = iter(range(total))
+        timings, statuses = [], set()
+
+        async def worker():
+            for _ in queue:
+                started = time.perf_counter()
+                response = await client.get(path, params, headers=headers)
+                timings.append((time.perf_counter() - started) * 1000)
+                statuses.add(response.status_code)
+
+        # Sync views and async ORM calls both run on the thread-sensitive
+        # sync_to_async thread; wrap the connection that thread uses.
+        wrappers = await sync_to_async(lambda: connections['default'].execute_wrappers)()
+        if wrapper:
+            wrappers.append(wrapper)
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        finally:
+            if wrapper:
+                wrappers.remove(wrapper)
+        elapsed = time.perf_counter() - started
+        return {'rps': round(total / elapsed, 1), 'status': sorted(statuses), **summarize(timings)}
@@ -0,0 +1,126 @@
+# backend/programs/management/commands/bench_connections.py
+import json
+import threading
+import time
+from importlib.util import find_spec
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from accounts.tokens import UserRefreshToken
+from core import database
+from core.benchmarking import summarize, test_database
+from fitness.models import Exercise
+from programs.models import Program
+from programs.seeding import Seeder
+
+# (label, settings applied to the default database)
+MODES = [
+    ('reconnect per request', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': None}),
+    ('persistent + health checks', {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'pool': None}),
+    ('psycopg pool', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'pool': {'min_size': 2, 'max_size': 8}}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure per-request latency of cheap catalog reads against PostgreSQL when every request opens '
+        'its own connection, with persistent connections, and with the psycopg 3 pool (when installed). '
+        'Runs in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per case and thread count.')
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 8])
+        parser.add_argument('--output', help='Write results to this file instead of stdout.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('bench_connections needs PostgreSQL; point DB_* at a local server.')
+        with test_database():
+            Seeder(log=lambda message: None).run(clients=5, programs=10, plans=5, exercises=50)
+            results = {}
+            for label, mode in MODES:
+                if mode['pool'] and not (find_spec('psycopg') and find_spec('psycopg_pool')):
+                    self.stderr.write(f'{label}: skipped, pip install "psycopg[pool]"')
+                    continue
+                self.configure(mode)
+                try:
+                    results[label] = self.run_cases(options)
+                finally:
+                    self.configure(MODES[0][1])
+
+        output = json.dumps({'meta': {key: options[key] for key in ('requests', 'threads')}, 'results': results},
+                            indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def configure(self, mode):
+        # settings_dict is shared by every thread's wrapper for the alias.
+        connection.close()
+        connection.close_pool()
+        connection.settings_dict['CONN_MAX_AGE'] = mode['CONN_MAX_AGE']
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = mode['CONN_HEALTH_CHECKS']
+        connection.settings_dict['OPTIONS'].pop('pool', None)
+        if mode['pool']:
+            connection.settings_dict['OPTIONS']['pool'] = mode['pool']
+
+    def run_cases(self, options):
+        user = User.objects.get(email='client1@example.com')
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(user).access_token}'}
+        cases = [
+            ('exercise-detail', reverse('exercise-detail', args=[Exercise.objects.order_by('id').first().pk]), {}),
+            ('program-detail', reverse('program-detail', args=[Program.objects.order_by('id').first().pk]), {}),
+            ('user-plans', reverse('user-plans'), auth),
+        ]
+        connection.close()
+        results = {}
+        for name, path, headers in cases:
+            for threads in options['threads']:
+                result = self.measure(path, headers, threads, options['requests'])
+                results.setdefault(name, {})[str(threads)] = result
+                self.stderr.write(f'{name} [{threads} threads]: p50={result["p50_ms"]}ms p95={result["p95_ms"]}ms '
+                                  f'connections={result["connections"]}')
+        return results
+
+    def measure(self, path, headers, threads, total):
+        queue = iter(range(total))
+        lock = threading.Lock()
+        timings, statuses = [], set()
+
+        def worker():
+            client = Client()
+            try:
+                for _ in queue:
+                    # The test client disconnects the request_started/finished
+                    # handlers that recycle connections; run them here.
+                    started = time.perf_counter()
+                    close_old_connections()
+                    response = client.get(path, **headers)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    close_old_connections()
+                    with lock:
+                        timings.append(elapsed)
+                        statuses.add(response.status_code)
+            finally:
+                connection.close()
+
+        database.reset()
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        acquired, wait = database.totals(connection.alias)
+        return {
+            'status': sorted(statuses),
+            **summarize(timings),
+            'connections': acquired,
+            'connect_ms_mean': round(wait / acquired * 1000, 3) if acquired else 0,
+        }
@@ -0,0 +1,68 @@
+# backend/programs/management/commands/build_image_renditions.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core import catalog, images
+from programs import documents
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the WebP/JPEG renditions (core/images.py) of program thumbnails and coach photos that do '
+        'not have current ones yet, on a pool of worker processes. --force re-renders every image.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Processes; 1 renders inline.')
+        parser.add_argument('--force', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows per bulk update.')
+
+    def handle(self, *args, **options):
+        jobs = []
+        for label, field, renditions_field in images.IMAGE_FIELDS:
+            rows = (apps.get_model(label).objects.exclude(**{f'{field}__isnull': True}).exclude(**{field: ''})
+                    .values_list('pk', field, renditions_field))
+            for pk, name, renditions in rows.iterator():
+                if options['force'] or renditions.get('source') != name:
+                    jobs.append((label, field, renditions_field, pk, name, renditions))
+        if not jobs:
+            self.stdout.write('All renditions are up to date.')
+            return
+
+        started = time.perf_counter()
+        tasks = [(label, field, name) for label, field, _, _, name, _ in jobs]
+        if options['workers'] > 1:
+            # Workers only touch storage; don't let them inherit open DB connections.
+            connections.close_all()
+            with ProcessPoolExecutor(options['workers'], initializer=django.setup) as executor:
+                results = list(executor.map(images.render_job, tasks, chunksize=4))
+        else:
+            results = [images.render_job(task) for task in tasks]
+
+        updates, stale, failed = {}, [], 0
+        for (label, field, renditions_field, pk, name, previous), (renditions, error) in zip(jobs, results):
+            if error:
+                failed += 1
+                self.stderr.write(f'{label} {pk}: {name}: {error}')
+                continue
+            storage = apps.get_model(label)._meta.get_field(field).storage
+            stale += [(storage, name) for name in set(images.stored_names(previous)) - set(images.stored_names(renditions))]
+            model = apps.get_model(label)
+            updates.setdefault((model, renditions_field), []).append(model(pk=pk, **{renditions_field: renditions}))
+        for (model, renditions_field), objs in updates.items():
+            model.objects.bulk_update(objs, [renditions_field], batch_size=options['batch_size'])
+        # Only once no row points at them any more.
+        images.delete(stale)
+        catalog.invalidate()
+        documents.invalidate()
+
+        rendered = len(jobs) - failed
+        self.stdout.write(self.style.SUCCESS(
+            f'Rendered {rendered} images ({failed} failed) in {time.perf_counter() - started:.1f}s'
+        ))
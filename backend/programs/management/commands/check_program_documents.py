@@ -0,0 +1,66 @@
+# backend/programs/management/commands/check_program_documents.py
+from django.core.management.base import BaseCommand, CommandError
+
+from core import catalog
+from programs import documents
+from programs.models import ProgramDocument
+from programs.serializers import PROGRAM_SHAPES
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-render every public program and compare it with its stored ProgramDocuments. Reports stale, '
+        'missing and orphaned documents and exits non-zero; --repair rewrites or deletes them instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repair', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        stale = missing = checked = programs = 0
+        chunk = []
+
+        def check(chunk):
+            nonlocal stale, missing, checked
+            stored = {
+                (program_id, lang, shape): content
+                for program_id, lang, shape, content in ProgramDocument.objects.filter(
+                    program_id__in=[program.pk for program in chunk]
+                ).values_list('program_id', 'lang', 'shape', 'content')
+            }
+            broken = []
+            for program in chunk:
+                expected = documents.render(program)
+                differ = [key for key, content in expected.items() if stored.get((program.pk, *key)) != content]
+                missing += sum((program.pk, *key) not in stored for key in differ)
+                stale += sum((program.pk, *key) in stored for key in differ)
+                checked += len(expected)
+                if differ:
+                    broken.append(program)
+                    self.stdout.write(f'Program {program.pk}: {", ".join("/".join(key) for key in differ)}')
+            if options['repair'] and broken:
+                documents.write(broken)
+
+        for program in documents.public_programs().iterator(chunk_size=options['chunk_size']):
+            programs += 1
+            chunk.append(program)
+            if len(chunk) == options['chunk_size']:
+                check(chunk)
+                chunk = []
+        check(chunk)
+
+        orphans = ProgramDocument.objects.exclude(
+            program__is_custom=False, lang__in=catalog.LANGUAGES, shape__in=list(PROGRAM_SHAPES),
+        )
+        orphaned = orphans.count()
+        if options['repair'] and orphaned:
+            orphans.delete()
+
+        problems = f'{stale} stale, {missing} missing, {orphaned} orphaned documents'
+        if not (stale or missing or orphaned):
+            self.stdout.write(self.style.SUCCESS(f'{checked} documents for {programs} programs are up to date'))
+        elif options['repair']:
+            self.stdout.write(self.style.SUCCESS(f'Repaired {problems}'))
+        else:
+            raise CommandError(f'{problems}; rerun with --repair to fix them')
@@ -0,0 +1,24 @@
+# backend/programs/management/commands/export_catalog.py
+from django.core.management.base import BaseCommand
+
+from programs import library
+
+
+class Command(BaseCommand):
+    help = 'Write exercises, program categories and programs (with sessions) as NDJSON; see programs/library.py.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Write to this file instead of stdout.')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        lines = library.export_lines(options['chunk_size'])
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+        count = 0
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            for count, line in enumerate(lines, 1):
+                f.write(line)
+        self.stderr.write(f'Exported {count} records to {options["output"]}')
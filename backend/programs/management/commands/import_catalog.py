@@ -0,0 +1,49 @@
+# backend/programs/management/commands/import_catalog.py
+import sys
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from programs import library
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Upsert exercises, program categories and programs from an NDJSON file (or - for stdin) by natural key; '
+        'see programs/library.py. Imported programs replace their sessions.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--owner', help='Email of the created_by user of new programs (default: first superuser).')
+
+    def handle(self, *args, **options):
+        if options['owner']:
+            owners = User.objects.filter(email=options['owner'])
+        else:
+            owners = User.objects.filter(is_superuser=True).order_by('id')
+        owner_id = owners.values_list('id', flat=True).first()
+        if owner_id is None:
+            raise CommandError('No owner for new programs; create a superuser or pass --owner.')
+
+        started = time.perf_counter()
+        importer = library.Importer(owner_id, batch_size=options['batch_size'])
+        if options['path'] == '-':
+            importer.run(sys.stdin)
+        else:
+            with open(options['path'], encoding='utf-8') as f:
+                importer.run(f)
+
+        for message in importer.errors:
+            self.stderr.write(message)
+        summary = ', '.join(
+            f'{kind}: {counts["created"]} created, {counts["updated"]} updated, {counts["unchanged"]} unchanged'
+            for kind, counts in importer.stats.items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{summary}; {importer.error_count} errors in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,29 @@
+# backend/programs/management/commands/seed.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from programs import seed_data
+from programs.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = 'Idempotently seed users, coaches, exercises, programs and user plans in one transaction.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=seed_data.CLIENT_COUNT, help='Number of client accounts.')
+        parser.add_argument('--programs', type=int, default=None, help='Number of programs (padded with synthetic ones).')
+        parser.add_argument('--exercises', type=int, default=None, help='Number of exercises (padded with synthetic ones).')
+        parser.add_argument('--plans', type=int, default=10, help='Number of clients that get a user plan.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.stdout.write('🚀 Starting data seeding...')
+        Seeder(batch_size=options['batch_size'], log=self.stdout.write).run(
+            clients=options['users'],
+            programs=options['programs'],
+            plans=options['plans'],
+            exercises=options['exercises'],
+        )
+        self.stdout.write(f'🎉 All data seeded in {time.perf_counter() - started:.2f}s')
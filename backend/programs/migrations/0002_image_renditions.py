@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='program',
+            name='thumbnail_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programs', '0002_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgramDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lang', models.CharField(max_length=5)),
+                ('shape', models.CharField(max_length=20)),
+                ('content', models.TextField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('program', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='programs.program')),
+            ],
+            options={
+                'unique_together': {('program', 'lang', 'shape')},
+            },
+        ),
+    ]
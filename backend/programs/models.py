@@ -1,7 +1,9 @@
 # backend/programs/models.py
 from django.db import models
+from django.db.models.functions import Cast, Concat
 from accounts.models import User
 from coaches.models import Coach
+from translations.query import LocalizedQuerySet
 
 class ProgramCategory(models.Model):
     name = models.JSONField()  # {"en": "Fat Loss", ...}
@@ -9,6 +11,28 @@ class ProgramCategory(models.Model):
     def __str__(self):
         return self.name.get('en', 'Uncategorized')
 
+class ProgramQuerySet(LocalizedQuerySet):
+    localized_fields = {'name': 'Program', 'description': ''}
+
+    def with_sessions(self, lang=None):
+        # Load the whole sessions -> exercises -> Exercise tree in three
+        # queries, already ordered the way the serializers emit it. With
+        # ``lang`` the program and session names come back resolved.
+        programs, sessions = self, ProgramSession.objects.order_by('day_number')
+        if lang is not None:
+            programs, sessions = programs.localized(lang), sessions.localized(lang)
+        return programs.prefetch_related(
+            models.Prefetch(
+                'sessions',
+                queryset=sessions.prefetch_related(
+                    models.Prefetch(
+                        'exercises',
+                        queryset=SessionExercise.objects.select_related('exercise').order_by('order'),
+                    )
+                ),
+            )
+        )
+
 class Program(models.Model):
     name = models.JSONField()
     description = models.JSONField()
@@ -24,12 +48,22 @@ class Program(models.Model):
     coach = models.ForeignKey(Coach, on_delete=models.SET_NULL, null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     thumbnail = models.ImageField(upload_to='programs/thumbnails/', blank=True, null=True)
+    thumbnail_renditions = models.JSONField(default=dict, blank=True, editable=False)  # see core/images.py
+
+    objects = ProgramQuerySet.as_manager()
+
+class ProgramSessionQuerySet(LocalizedQuerySet):
+    localized_fields = {
+        'name': Concat(models.Value('Day '), Cast('day_number', models.TextField()), output_field=models.TextField()),
+    }
 
 class ProgramSession(models.Model):
     program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='sessions')
     day_number = models.PositiveIntegerField()
     name = models.JSONField()  # {"en": "Day 1: Full Body", ...}
 
+    objects = ProgramSessionQuerySet.as_manager()
+
 class SessionExercise(models.Model):
     session = models.ForeignKey(ProgramSession, on_delete=models.CASCADE, related_name='exercises')
     exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE)
@@ -43,4 +77,16 @@ class UserPlan(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        unique_together = ('user', 'program')
\ No newline at end of file
+        unique_together = ('user', 'program')
+
+class ProgramDocument(models.Model):
+    # Pre-rendered program_detail body per language and shape; maintained
+    # by programs/documents.py.
+    program = models.ForeignKey(Program, on_delete=models.CASCADE, related_name='documents')
+    lang = models.CharField(max_length=5)
+    shape = models.CharField(max_length=20)
+    content = models.TextField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('program', 'lang', 'shape')
@@ -0,0 +1,137 @@
+# backend/programs/seed_data.py
+"""Base catalog and accounts used by the seeding engine (programs/seeding.py)."""
+
+ADMIN = {'email': 'admin@traint.com', 'first_name': 'Admin', 'role': 'admin', 'is_staff': True, 'is_superuser': True}
+COACH_EMAILS = ['coach1@traint.com', 'coach2@traint.com', 'coach3@traint.com']
+CLIENT_COUNT = 18
+
+PASSWORDS = {
+    'admin': 'securepassword123',
+    'coach': 'coachpass123',
+    'client': 'clientpass123',
+}
+
+COACH_SPECIALTIES = {
+    'en': ['Strength', 'Fat Loss', 'Mobility'],
+    'ar': ['القوة', 'حرق الدهون', 'المرونة'],
+    'fr': ['Force', 'Perte de graisse', 'Mobilité']
+}
+
+COACH_BIO = {
+    'en': 'Certified Strength & Conditioning Coach with 10+ years of experience.',
+    'ar': 'مدرب معتمد في القوة والتحمل بخبرة أكثر من 10 سنوات.',
+    'fr': 'Entraîneur certifié en force et conditionnement avec plus de 10 ans d’expérience.'
+}
+
+# (name, category, target muscles, difficulty, demo video)
+EXERCISES = [
+    (
+        {"en": "Bench Press", "ar": "بنش برس", "fr": "Développé couché"},
+        {"en": "Chest", "ar": "الصدر", "fr": "Pectoraux"},
+        ["chest", "triceps"],
+        "beginner",
+        "https://www.youtube.com/watch?v=QGQ6BkX8KqU"
+    ),
+    (
+        {"en": "Pull-up", "ar": "سحب عكسي", "fr": "Traction"},
+        {"en": "Back", "ar": "الظهر", "fr": "Dos"},
+        ["back", "biceps"],
+        "intermediate",
+        "https://www.youtube.com/watch?v=eGo4IYlbE5g"
+    ),
+    (
+        {"en": "Barbell Squat", "ar": "سكوات بالبار", "fr": "Squat à la barre"},
+        {"en": "Legs", "ar": "الساقين", "fr": "Jambes"},
+        ["quads", "glutes"],
+        "beginner",
+        "https://www.youtube.com/watch?v=aclHkVaku9U"
+    ),
+    (
+        {"en": "Overhead Press", "ar": "ضغط الكتف", "fr": "Développé militaire"},
+        {"en": "Shoulders", "ar": "الكتفين", "fr": "Épaules"},
+        ["shoulders", "triceps"],
+        "beginner",
+        "https://www.youtube.com/watch?v=2yjwXTZQDDI"
+    ),
+    (
+        {"en": "Bicep Curl", "ar": "تمرين العضلة ذات الرأسين", "fr": "Curl biceps"},
+        {"en": "Arms", "ar": "الذراعين", "fr": "Bras"},
+        ["biceps"],
+        "beginner",
+        "https://www.youtube.com/watch?v=ykJmrZ5v0Oo"
+    ),
+    (
+        {"en": "Tricep Dip", "ar": "تمرين ثلاثية الرؤوس", "fr": "Dips triceps"},
+        {"en": "Arms", "ar": "الذراعين", "fr": "Bras"},
+        ["triceps"],
+        "beginner",
+        "https://www.youtube.com/watch?v=0326dy_-CzM"
+    ),
+    (
+        {"en": "Plank", "ar": "البلانك", "fr": "Gainage"},
+        {"en": "Core", "ar": "العضلات الأساسية", "fr": "Gainage"},
+        ["core", "abs"],
+        "beginner",
+        "https://www.youtube.com/watch?v=pSHjTRCQxIw"
+    ),
+    (
+        {"en": "Deadlift", "ar": "رفع ميت", "fr": "Soulevé de terre"},
+        {"en": "Back", "ar": "الظهر", "fr": "Dos"},
+        ["back", "hamstrings", "glutes"],
+        "intermediate",
+        "https://www.youtube.com/watch?v=1ZXobT27o5k"
+    ),
+    (
+        {"en": "Lunges", "ar": "الاندفاعات", "fr": "Fentes"},
+        {"en": "Legs", "ar": "الساقين", "fr": "Jambes"},
+        ["quads", "glutes"],
+        "beginner",
+        "https://www.youtube.com/watch?v=QXvXQ8X4cFk"
+    ),
+    (
+        {"en": "Push-up", "ar": "ضغط", "fr": "Pompes"},
+        {"en": "Chest", "ar": "الصدر", "fr": "Pectoraux"},
+        ["chest", "triceps", "core"],
+        "beginner",
+        "https://www.youtube.com/watch?v=IODxDxX7oi4"
+    ),
+]
+
+# Each program gets three full-body sessions of five exercises.
+PROGRAMS = [
+    {
+        'name': {"en": "Complete Fat Destroyer Program", "ar": "برنامج تدمير الدهون الكامل", "fr": "Programme Complet de Destruction des Graisses"},
+        'desc': {"en": "12-week fat loss program for beginners.", "ar": "برنامج فقدان الدهون لمدة 12 أسبوعًا للمبتدئين.", "fr": "Programme de perte de graisse de 12 semaines pour débutants."},
+        'difficulty': 'beginner',
+        'weeks': 12,
+        'category_name': 'Fat Loss'
+    },
+    {
+        'name': {"en": "Strength And Bulk Beginner Workout", "ar": "تمرين القوة والكتلة للمبتدئين", "fr": "Entraînement Force et Masse pour Débutants"},
+        'desc': {"en": "10-week strength program for beginners.", "ar": "برنامج القوة لمدة 10 أسابيع للمبتدئين.", "fr": "Programme de force de 10 semaines pour débutants."},
+        'difficulty': 'beginner',
+        'weeks': 10,
+        'category_name': 'Strength'
+    },
+    {
+        'name': {"en": "Complete Beginner Program", "ar": "البرنامج الكامل للمبتدئين", "fr": "Programme Complet pour Débutants"},
+        'desc': {"en": "6-week muscle building for beginners.", "ar": "بناء العضلات لمدة 6 أسابيع للمبتدئين.", "fr": "Développement musculaire de 6 semaines pour débutants."},
+        'difficulty': 'beginner',
+        'weeks': 6,
+        'category_name': 'Muscle Building'
+    },
+    {
+        'name': {"en": "Home Based Abs Workout", "ar": "تمارين البطن المنزلية", "fr": "Programme d’Abdos à Domicile"},
+        'desc': {"en": "6-week core program for beginners.", "ar": "برنامج العضلات الأساسية لمدة 6 أسابيع للمبتدئين.", "fr": "Programme de gainage de 6 semaines pour débutants."},
+        'difficulty': 'beginner',
+        'weeks': 6,
+        'category_name': 'Abs'
+    },
+    {
+        'name': {"en": "Big Arms Fast", "ar": "ذراعان كبيرتان بسرعة", "fr": "Gros Bras Rapidement"},
+        'desc': {"en": "4-week arm specialization for beginners.", "ar": "برنامج تخصص الذراعين لمدة 4 أسابيع للمبتدئين.", "fr": "Spécialisation bras de 4 semaines pour débutants."},
+        'difficulty': 'beginner',
+        'weeks': 4,
+        'category_name': 'Arms'
+    },
+]
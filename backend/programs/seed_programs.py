@@ -6,10 +6,14 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 django.setup()
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from accounts.models import User
 from coaches.models import Coach
-from programs.models import Program, ProgramSession, SessionExercise
 from fitness.models import Exercise
+from core import catalog, routers
+from programs import documents
+from programs.seeding import Seeder
+from translations import storage as translations
 
 def create_real_programs():
     User = get_user_model()
@@ -26,16 +30,11 @@ def create_real_programs():
     coach_user, _ = User.objects.get_or_create(email='coach@traint.com', defaults={'first_name': 'Mohammed', 'role': 'coach'})
     coach, _ = Coach.objects.get_or_create(user=coach_user)
 
-    # Get all exercises
-    exercises = Exercise.objects.all()
+    # Get all exercises, keyed by lower-cased English name
     exercise_map = {}
-    for ex in exercises:
-        name_en = ex.name.get('en', '').lower()
-        exercise_map[name_en] = ex
-
-    # Helper to get exercise safely
-    def get_ex(name):
-        return exercise_map.get(name.lower())
+    for pk, name in Exercise.objects.values_list('id', 'name'):
+        name_en = name.get('en', '').lower()
+        exercise_map[name_en] = pk
 
     programs_data = [
         # Fat Loss
@@ -265,39 +264,15 @@ def create_real_programs():
         }
     ]
 
-    for program_data in programs_data:
-        program, created = Program.objects.get_or_create(
-            name=program_data['name'],
-            defaults={
-                'description': program_data['description'],
-                'difficulty': program_data['difficulty'],
-                'duration_weeks': program_data['weeks'],
-                'coach': coach,
-                'created_by': admin_user,
-                'is_custom': False
-            }
-        )
-        if not created:
-            print(f"✅ Program already exists: {program_data['name']['en']}")
-            continue
-
-        for i, session_data in enumerate(program_data['sessions'], 1):
-            session = ProgramSession.objects.create(
-                program=program,
-                day_number=i,
-                name=session_data['name']
-            )
-            for j, (ex_name, sets, reps) in enumerate(session_data['exercises'], 1):
-                exercise = get_ex(ex_name)
-                if exercise:
-                    SessionExercise.objects.create(
-                        session=session,
-                        exercise=exercise,
-                        sets=sets,
-                        reps=reps,
-                        order=j
-                    )
-        print(f"✅ Seeded program: {program_data['name']['en']}")
+    # Programs that already exist keep their sessions; new ones get theirs in
+    # a handful of bulk inserts.
+    seeder = Seeder()
+    with seeder.phase(f'Seeded {len(programs_data)} programs'):
+        with routers.primary(), transaction.atomic():
+            seeder.seed_programs(programs_data, [coach], exercise_map, owner_id=admin_user.id)
+            translations.sync_objects(seeder.touched)
+    catalog.invalidate()
+    documents.invalidate()
 
 if __name__ == '__main__':
     create_real_programs()
\ No newline at end of file
@@ -0,0 +1,309 @@
+# backend/programs/seeding.py
+"""
+Bulk, idempotent seeding of accounts and the catalog.
+
+Every phase upserts by natural key in batches instead of issuing one
+``get_or_create`` per row:
+
+* users by email, coaches by user, user plans by (user, program) – through
+  their unique constraints with ``bulk_create(update_conflicts=...)``;
+* exercises, categories and programs by English name – through an in-memory
+  map of existing rows, like ``seed_programs.get_ex``.
+
+Passwords are hashed once per role and shared by every seeded account.
+"""
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import CommandError
+from django.db import transaction
+
+from coaches.models import Coach
+from core import catalog, routers
+from fitness.models import Exercise
+from translations import storage as translations
+from . import documents, seed_data
+from .models import Program, ProgramCategory, ProgramSession, SessionExercise, UserPlan
+
+User = get_user_model()
+
+LANGS = ('en', 'ar', 'fr')
+
+
+class Seeder:
+    def __init__(self, batch_size=1000, log=print):
+        self.batch_size = batch_size
+        self.log = log
+        self.touched = defaultdict(set)  # model -> ids created or updated
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        yield
+        self.log(f'✅ {name} ({time.perf_counter() - started:.2f}s)')
+
+    def run(self, clients=seed_data.CLIENT_COUNT, programs=None, plans=10, exercises=None):
+        """
+        Seed the base dataset, scaled to ``clients`` users, ``programs``
+        programs and ``exercises`` exercises.
+        """
+        # The upserts match existing rows by name; read them from the primary.
+        with routers.primary(), transaction.atomic():
+            with self.phase('Users'):
+                users = self.seed_users(clients)
+            with self.phase('Coaches'):
+                coaches = self.seed_coaches(users['coach'])
+            with self.phase('Exercises'):
+                exercises = self.seed_exercises(base_exercises(exercises))
+            with self.phase('Programs'):
+                specs = base_program_specs(list(exercises), programs)
+                program_ids = self.seed_programs(specs, coaches, exercises)
+            with self.phase('User plans'):
+                self.seed_user_plans(users['client'][:plans], program_ids)
+            # bulk_create bypasses post_save, so sync the translations and
+            # retire catalog snapshots here.
+            translations.sync_objects(self.touched)
+        catalog.invalidate()
+        documents.invalidate()
+
+    def seed_users(self, clients):
+        hashes = {role: make_password(password) for role, password in seed_data.PASSWORDS.items()}
+        rows = [dict(seed_data.ADMIN)]
+        rows += [
+            {'email': email, 'first_name': f'Coach{i}', 'role': 'coach'}
+            for i, email in enumerate(seed_data.COACH_EMAILS, 1)
+        ]
+        rows += [
+            {
+                'email': f'client{i}@example.com',
+                'first_name': f'Client{i}',
+                'role': 'client',
+                'preferred_language': 'en' if i % 3 == 0 else 'ar' if i % 3 == 1 else 'fr',
+            }
+            for i in range(1, clients + 1)
+        ]
+        for start in range(0, len(rows), self.batch_size):
+            User.objects.bulk_create(
+                [User(password=hashes[row['role']], **row) for row in rows[start:start + self.batch_size]],
+                update_conflicts=True,
+                unique_fields=['email'],
+                # is_staff/is_superuser only on insert: re-seeding must not
+                # demote an account that was promoted by hand.
+                update_fields=['first_name', 'role', 'preferred_language'],
+            )
+
+        by_role = {'admin': [], 'coach': [], 'client': []}
+        emails = [row['email'] for row in rows]
+        for start in range(0, len(emails), self.batch_size):
+            chunk = emails[start:start + self.batch_size]
+            ids = dict(User.objects.filter(email__in=chunk).values_list('email', 'id'))
+            for row in rows[start:start + self.batch_size]:
+                by_role[row['role']].append(ids[row['email']])
+        return by_role
+
+    def seed_coaches(self, coach_user_ids):
+        Coach.objects.bulk_create(
+            [
+                Coach(
+                    user_id=user_id,
+                    bio=seed_data.COACH_BIO,
+                    specialties=seed_data.COACH_SPECIALTIES,
+                    experience_years=8 + i,
+                    is_featured=i == 1,
+                )
+                for i, user_id in enumerate(coach_user_ids, 1)
+            ],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['bio', 'specialties', 'experience_years', 'is_featured'],
+        )
+        return list(Coach.objects.filter(user_id__in=coach_user_ids).order_by('user_id'))
+
+    def seed_exercises(self, exercises_data):
+        """Upsert exercises by English name; return {english name: id}."""
+        rows = []
+        for name, category, muscles, level, video in exercises_data:
+            rows.append(Exercise(
+                name=name,
+                description={
+                    "en": f"{name['en']} exercise for {category['en'].lower()}",
+                    "ar": f"تمرين {name['ar']} لل{category['ar'].lower()}",
+                    "fr": f"Exercice de {name['fr']} pour les {category['fr'].lower()}",
+                },
+                instructions={
+                    "en": [f"Step 1: Set up for {name['en']}", "Step 2: Perform reps", "Step 3: Rest"],
+                    "ar": [f"الخطوة 1: الإعداد لـ {name['ar']}", "الخطوة 2: نفّذ التكرارات", "الخطوة 3: استرح"],
+                    "fr": [f"Étape 1: Préparez-vous pour {name['fr']}", "Étape 2: Effectuez les répétitions", "Étape 3: Reposez-vous"],
+                },
+                category=category,
+                difficulty=level,
+                demo_video_url=video,
+                target_muscles=muscles,
+                main_muscle=category['en'],
+                equipment='barbell' if 'Barbell' in name['en'] else 'dumbbell' if 'Dumbbell' in name['en'] else 'bodyweight',
+                mechanics='compound',
+            ))
+        return self._upsert_by_name(
+            Exercise, rows,
+            ['description', 'instructions', 'category', 'difficulty', 'demo_video_url',
+             'target_muscles', 'main_muscle', 'equipment', 'mechanics'],
+        )
+
+    def seed_categories(self, names):
+        rows = [ProgramCategory(name={lang: name for lang in LANGS}) for name in dict.fromkeys(names)]
+        return self._upsert_by_name(ProgramCategory, rows, [])
+
+    def seed_programs(self, specs, coaches, exercises, owner_id=None):
+        """
+        Upsert programs by English name. Sessions are only created for
+        programs that have none yet, so re-running never duplicates them.
+        """
+        if specs and owner_id is None and not coaches:
+            raise CommandError('Seeding programs needs an owner_id or at least one coach to own them')
+        categories = self.seed_categories(spec['category'] for spec in specs)
+        rows = []
+        for i, spec in enumerate(specs):
+            coach = coaches[i % len(coaches)] if coaches else None
+            rows.append(Program(
+                name=spec['name'],
+                description=spec['description'],
+                difficulty=spec['difficulty'],
+                duration_weeks=spec['weeks'],
+                category_id=categories[spec['category']],
+                coach=coach,
+                created_by_id=owner_id or coach.user_id,
+                is_custom=False,
+            ))
+        programs = self._upsert_by_name(
+            Program, rows, ['description', 'difficulty', 'duration_weeks', 'category', 'coach'],
+            queryset=Program.objects.filter(is_custom=False),
+        )
+
+        seeded = set(
+            ProgramSession.objects.filter(program_id__in=programs.values())
+            .values_list('program_id', flat=True)
+        )
+        pending = [(programs[spec['name']['en']], spec) for spec in specs]
+        pending = [(program_id, spec) for program_id, spec in pending if program_id not in seeded]
+        sessions = [
+            ProgramSession(program_id=program_id, day_number=day, name=session['name'])
+            for program_id, spec in pending
+            for day, session in enumerate(spec['sessions'], 1)
+        ]
+        ProgramSession.objects.bulk_create(sessions, batch_size=self.batch_size)
+        session_ids = {
+            (program_id, day): pk
+            for pk, program_id, day in ProgramSession.objects.filter(
+                program_id__in=[program_id for program_id, _ in pending]
+            ).values_list('id', 'program_id', 'day_number')
+        }
+        self.touched[ProgramSession].update(session_ids.values())
+        session_exercises = []
+        for program_id, spec in pending:
+            for day, session in enumerate(spec['sessions'], 1):
+                for order, (exercise_name, sets, reps) in enumerate(session['exercises'], 1):
+                    exercise_id = exercises.get(exercise_name.lower())
+                    if exercise_id:
+                        session_exercises.append(SessionExercise(
+                            session_id=session_ids[(program_id, day)],
+                            exercise_id=exercise_id,
+                            sets=sets,
+                            reps=reps,
+                            order=order,
+                        ))
+        SessionExercise.objects.bulk_create(session_exercises, batch_size=self.batch_size)
+        return list(programs.values())
+
+    def seed_user_plans(self, client_ids, program_ids):
+        UserPlan.objects.bulk_create(
+            [
+                UserPlan(user_id=user_id, program_id=program_ids[i % len(program_ids)])
+                for i, user_id in enumerate(client_ids)
+            ],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+
+    def _upsert_by_name(self, model, rows, update_fields, queryset=None):
+        """
+        Insert or update ``rows`` keyed by ``name['en']``; return
+        {english name: id}. Exercise names are keyed case-insensitively.
+        """
+        def key(name):
+            name = name.get('en', '')
+            return name.lower() if model is Exercise else name
+
+        queryset = model.objects.all() if queryset is None else queryset
+        existing = {key(name): pk for pk, name in queryset.values_list('id', 'name') if isinstance(name, dict)}
+        new, changed = [], []
+        for row in rows:
+            pk = existing.get(key(row.name))
+            if pk is None:
+                new.append(row)
+            else:
+                row.pk = pk
+                changed.append(row)
+        model.objects.bulk_create(new, batch_size=self.batch_size)
+        if changed and update_fields:
+            model.objects.bulk_update(changed, update_fields, batch_size=self.batch_size)
+        ids = {key(name): pk for pk, name in queryset.values_list('id', 'name') if isinstance(name, dict)}
+        self.touched[model].update(ids[key(row.name)] for row in rows)
+        return ids
+
+
+def base_exercises(count=None):
+    """The seed_data exercises, padded with synthetic ones up to ``count``."""
+    exercises = list(seed_data.EXERCISES)
+    muscles = ['chest', 'back', 'quads', 'hamstrings', 'glutes', 'shoulders', 'biceps', 'triceps', 'core']
+    for i in range(len(exercises) + 1, (count or 0) + 1):
+        muscle = muscles[i % len(muscles)]
+        exercises.append((
+            {lang: f'Synthetic Exercise {i}' for lang in LANGS},
+            {lang: muscle.title() for lang in LANGS},
+            [muscle, muscles[(i + 3) % len(muscles)]],
+            ('beginner', 'intermediate', 'advanced')[i % 3],
+            '',
+        ))
+    return exercises
+
+
+def base_program_specs(exercise_names, count=None):
+    """
+    The seed_data programs, each with three sessions of five exercises,
+    padded with synthetic programs up to ``count``.
+    """
+    programs = list(seed_data.PROGRAMS)
+    for i in range(len(programs) + 1, (count or 0) + 1):
+        programs.append({
+            'name': {lang: f'Synthetic Program {i}' for lang in LANGS},
+            'desc': {lang: f'Synthetic load-test program {i}.' for lang in LANGS},
+            'difficulty': ('beginner', 'intermediate', 'advanced')[i % 3],
+            'weeks': 4 + i % 9,
+            'category_name': 'Synthetic',
+        })
+    specs = []
+    for i, data in enumerate(programs[:count] if count else programs, 1):
+        specs.append({
+            'name': data['name'],
+            'description': data['desc'],
+            'difficulty': data['difficulty'],
+            'weeks': data['weeks'],
+            'category': data['category_name'],
+            'sessions': [
+                {
+                    'name': {
+                        'en': f'Day {day}: Full Body',
+                        'ar': f'اليوم {day}: الجسم بالكامل',
+                        'fr': f'Jour {day}: Corps Entier',
+                    },
+                    'exercises': [
+                        (exercise_names[(i + j) % len(exercise_names)], 5, 5) for j in range(5)
+                    ],
+                }
+                for day in range(1, 4)
+            ],
+        })
+    return specs
@@ -1,7 +1,11 @@
 # backend/programs/serializers.py
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
+from core import images
+from translations.query import localize, resolve
 from .models import Program, ProgramSession, SessionExercise, UserPlan
-from fitness.serializers import ExerciseSerializer
+from fitness.serializers import ExerciseSerializer, exercise_field_plan
 
 class SessionExerciseSerializer(serializers.ModelSerializer):
     exercise_name = serializers.SerializerMethodField()
@@ -13,7 +17,7 @@ class SessionExerciseSerializer(serializers.ModelSerializer):
 
     def get_exercise_name(self, obj):
         lang = self.context.get('lang', 'en')
-        return obj.exercise.name.get(lang, obj.exercise.name.get('en', ''))
+        return resolve(obj.exercise, 'name', lang)
 
     def get_exercise(self, obj):
         return ExerciseSerializer(obj.exercise, context=self.context).data
@@ -28,36 +32,175 @@ class ProgramSessionSerializer(serializers.ModelSerializer):
 
     def get_name(self, obj):
         lang = self.context.get('lang', 'en')
-        return obj.name.get(lang, obj.name.get('en', f'Day {obj.day_number}'))
+        return resolve(obj, 'name', lang, f'Day {obj.day_number}')
 
 class ProgramSerializer(serializers.ModelSerializer):
     sessions = ProgramSessionSerializer(many=True, read_only=True)
     name = serializers.SerializerMethodField()
     description = serializers.SerializerMethodField()
     thumbnail = serializers.SerializerMethodField()
+    thumbnail_srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = Program
         fields = [
             'id', 'name', 'description', 'difficulty', 'duration_weeks',
-            'thumbnail', 'sessions'
+            'thumbnail', 'thumbnail_srcset', 'sessions'
         ]
 
     def get_name(self, obj):
         lang = self.context.get('lang', 'en')
-        return obj.name.get(lang, obj.name.get('en', 'Program'))
+        return resolve(obj, 'name', lang, 'Program')
 
     def get_description(self, obj):
         lang = self.context.get('lang', 'en')
-        return obj.description.get(lang, obj.description.get('en', ''))
+        return resolve(obj, 'description', lang)
 
     def get_thumbnail(self, obj):
         if obj.thumbnail:
             return obj.thumbnail.url
         return None
 
-class UserPlanSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = UserPlan
-        fields = ['id', 'user', 'program', 'created_at']
-        read_only_fields = ['created_at']
\ No newline at end of file
+    def get_thumbnail_srcset(self, obj):
+        return images.srcset(obj.thumbnail, obj.thumbnail_renditions)
+
+MAX_PLAN_CHANGES = 100
+
+
+class UserPlanBatchSerializer(serializers.Serializer):
+    # The user always comes from the request: save(user_id=...).
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                max_length=MAX_PLAN_CHANGES)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False,
+                                   max_length=MAX_PLAN_CHANGES)
+    # Single-program shorthands posted by the frontend and older clients.
+    program_id = serializers.IntegerField(min_value=1, required=False, write_only=True)
+    program = serializers.IntegerField(min_value=1, required=False, write_only=True)
+
+    def validate(self, attrs):
+        add = set(attrs.get('add', []))
+        add.update(attrs[key] for key in ('program_id', 'program') if key in attrs)
+        remove = set(attrs.get('remove', []))
+        if not add and not remove:
+            raise serializers.ValidationError('Give program ids to add and/or remove.')
+        if add & remove:
+            raise serializers.ValidationError(f'Programs both added and removed: {sorted(add & remove)}.')
+        available = set(
+            Program.objects.filter(pk__in=add)
+            .filter(Q(is_custom=False) | Q(created_by_id=self.context['user_id']))
+            .values_list('id', flat=True)
+        )
+        if add - available:
+            raise serializers.ValidationError({'add': f'Unknown programs: {sorted(add - available)}.'})
+        return {'add': add, 'remove': remove}
+
+    def save(self, user_id):
+        with transaction.atomic():
+            if self.validated_data['remove']:
+                UserPlan.objects.filter(user_id=user_id, program_id__in=self.validated_data['remove']).delete()
+            # Programs already in the plan hit the unique (user, program)
+            # constraint and are skipped by the database.
+            UserPlan.objects.bulk_create(
+                [UserPlan(user_id=user_id, program_id=program_id) for program_id in self.validated_data['add']],
+                ignore_conflicts=True,
+            )
+
+
+def serialize_user_plans(user_id, lang):
+    rows = (
+        UserPlan.objects.filter(user_id=user_id).order_by('created_at', 'id')
+        .annotate(program_name=localize(Program, 'name', lang, 'Program', via='program'))
+        .values('id', 'program_id', 'program_name', 'created_at')
+    )
+    return [
+        {'id': row['id'], 'program': row['program_id'], 'program_name': row['program_name'],
+         'created_at': row['created_at']}
+        for row in rows
+    ]
+
+
+# Lean read path: the same output as ProgramSerializer (see the parity tests)
+# for programs loaded with Program.objects.with_sessions() (pass the language
+# to have the names resolved by the query).
+
+def serialize_program(program, lang):
+    exercise_plan = exercise_field_plan(lang)
+    sessions = []
+    for session in program.sessions.all():
+        exercises = []
+        for item in session.exercises.all():
+            exercise = {field: get(item.exercise) for field, get in exercise_plan}
+            exercises.append({
+                'id': item.id,
+                'exercise': exercise,
+                'exercise_name': exercise['name'],
+                'sets': item.sets,
+                'reps': item.reps,
+                'order': item.order,
+            })
+        sessions.append({
+            'id': session.id,
+            'day_number': session.day_number,
+            'name': resolve(session, 'name', lang, f'Day {session.day_number}'),
+            'exercises': exercises,
+        })
+    return {
+        'id': program.id,
+        'name': resolve(program, 'name', lang, 'Program'),
+        'description': resolve(program, 'description', lang),
+        'difficulty': program.difficulty,
+        'duration_weeks': program.duration_weeks,
+        'thumbnail': program.thumbnail.url if program.thumbnail else None,
+        'thumbnail_srcset': images.srcset(program.thumbnail, program.thumbnail_renditions),
+        'sessions': sessions,
+    }
+
+
+def serialize_programs(programs, lang):
+    return [serialize_program(program, lang) for program in programs]
+
+
+def serialize_program_normalized(program, lang):
+    """
+    ``?shape=normalized``: session exercises reference exercises by id, and
+    each exercise is serialized once into the top-level ``exercises`` map.
+    """
+    exercise_plan = exercise_field_plan(lang)
+    exercises = {}
+    sessions = []
+    for session in program.sessions.all():
+        items = []
+        for item in session.exercises.all():
+            if item.exercise_id not in exercises:
+                exercises[item.exercise_id] = {field: get(item.exercise) for field, get in exercise_plan}
+            items.append({
+                'id': item.id,
+                'exercise': item.exercise_id,
+                'sets': item.sets,
+                'reps': item.reps,
+                'order': item.order,
+            })
+        sessions.append({
+            'id': session.id,
+            'day_number': session.day_number,
+            'name': resolve(session, 'name', lang, f'Day {session.day_number}'),
+            'exercises': items,
+        })
+    return {
+        'id': program.id,
+        'name': resolve(program, 'name', lang, 'Program'),
+        'description': resolve(program, 'description', lang),
+        'difficulty': program.difficulty,
+        'duration_weeks': program.duration_weeks,
+        'thumbnail': program.thumbnail.url if program.thumbnail else None,
+        'thumbnail_srcset': images.srcset(program.thumbnail, program.thumbnail_renditions),
+        'sessions': sessions,
+        'exercises': exercises,
+    }
+
+
+# Response shapes of program_detail (?shape=...)
+PROGRAM_SHAPES = {
+    'nested': serialize_program,
+    'normalized': serialize_program_normalized,
+}
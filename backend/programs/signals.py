@@ -0,0 +1,60 @@
+# backend/programs/signals.py
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core import catalog, images
+from fitness.models import Exercise
+from fitness.serializers import ExerciseSerializer
+from . import documents
+from .models import Program, ProgramSession, SessionExercise
+
+
+@receiver(pre_save, sender=Program)
+def program_saving(sender, instance, **kwargs):
+    images.refresh(instance, 'thumbnail', 'thumbnail_renditions')
+
+
+@receiver(post_save, sender=Program)
+def program_saved(sender, instance, using, **kwargs):
+    images.discard_stale(instance, using)
+
+
+@receiver([post_save, post_delete], sender=Program)
+@receiver([post_save, post_delete], sender=ProgramSession)
+@receiver([post_save, post_delete], sender=SessionExercise)
+def program_changed(sender, instance, using, origin=None, **kwargs):
+    # After commit, so no reader caches pre-commit rows under the new version.
+    transaction.on_commit(catalog.invalidate, using=using)
+    if origin is not None and cascaded(sender, origin):
+        # The documents were dropped by the handler of the row the delete
+        # started from, or cascade from a deleted program.
+        return
+    if sender is Program:
+        documents.invalidate([instance.pk])
+    elif sender is ProgramSession:
+        documents.invalidate([instance.program_id])
+    else:
+        documents.invalidate(documents.programs_using(session_id=instance.session_id))
+
+
+def cascaded(sender, origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not sender
+
+
+# Catalog invalidation for exercises happens in fitness.signals.
+
+@receiver(post_save, sender=Exercise)
+def exercise_saved(sender, instance, created, update_fields, **kwargs):
+    # A new exercise is in no program yet.
+    if created or (update_fields is not None and not update_fields & set(ExerciseSerializer.Meta.fields)):
+        return
+    documents.invalidate(documents.programs_using(exercise_id=instance.pk))
+
+
+@receiver(pre_delete, sender=Exercise)
+def exercise_deleting(sender, instance, **kwargs):
+    # Before the cascade takes the session exercises that lead to the programs.
+    documents.invalidate(documents.programs_using(exercise_id=instance.pk))
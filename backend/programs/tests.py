@@ -1,3 +1,545 @@
-from django.test import TestCase
+import io
+import json
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from accounts.tokens import UserRefreshToken
+from coaches.models import Coach
+from core import catalog
+from fitness.models import Exercise
+from .models import ProgramCategory, Program, ProgramDocument, ProgramSession, SessionExercise, UserPlan
+from . import documents, library
+from .seeding import Seeder
+from .serializers import PROGRAM_SHAPES, ProgramSerializer, serialize_programs
+
+
+def make_exercise(name_en, **kwargs):
+    defaults = {
+        'name': {'en': name_en, 'ar': f'{name_en} (ar)', 'fr': f'{name_en} (fr)'},
+        'description': {'en': f'{name_en} description'},
+        'instructions': {'en': ['Step 1', 'Step 2']},
+        'category': {'en': 'Chest'},
+    }
+    defaults.update(kwargs)
+    return Exercise.objects.create(**defaults)
+
+
+def make_program(owner, category, exercises, sessions=2, name_en='Program'):
+    program = Program.objects.create(
+        name={'en': name_en, 'fr': f'{name_en} (fr)'},
+        description={'en': f'{name_en} description'},
+        difficulty='beginner',
+        category=category,
+        created_by=owner,
+    )
+    for day in range(1, sessions + 1):
+        session = ProgramSession.objects.create(
+            program=program, day_number=day, name={'en': f'Day {day}'}
+        )
+        for order, exercise in enumerate(exercises, 1):
+            SessionExercise.objects.create(session=session, exercise=exercise, order=order)
+    return program
+
+
+def make_image(name='thumbnail.png', size=(800, 400), mode='RGB'):
+    buffer = io.BytesIO()
+    Image.new(mode, size, 'orange').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class TemporaryMediaMixin:
+    def setUp(self):
+        super().setUp()
+        self.media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root, IMAGE_RENDITION_WIDTHS=[160, 320, 640]))
+
+
+class ProgramQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='x')
+        self.category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.exercises = [make_exercise(f'Exercise {i}') for i in range(4)]
+
+    def test_program_list_query_count_is_constant(self):
+        make_program(self.owner, self.category, self.exercises[:1], sessions=1)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('program-list'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                make_program(self.owner, self.category, self.exercises, sessions=3, name_en=f'P{i}')
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('program-list'))
+        self.assertEqual(len(response.json()), 6)
+
+    def test_program_list_is_served_from_snapshot(self):
+        program = make_program(self.owner, self.category, self.exercises, name_en='Before')
+        self.client.get(reverse('program-list'), {'lang': 'fr'})
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('program-list'), {'lang': 'fr'})
+        self.assertEqual(response.json()[0]['name'], 'Before (fr)')
+
+        program.name = {'en': 'After'}
+        with self.captureOnCommitCallbacks(execute=True):
+            program.save()
+        response = self.client.get(reverse('program-list'), {'lang': 'fr'})
+        self.assertEqual(response.json()[0]['name'], 'After')
+
+        self.exercises[0].name = {'en': 'Renamed'}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exercises[0].save()
+        response = self.client.get(reverse('program-list'))
+        self.assertEqual(response.json()[0]['sessions'][0]['exercises'][0]['exercise_name'], 'Renamed')
+
+    def test_program_detail_query_count_is_constant(self):
+        program = make_program(self.owner, self.category, self.exercises, sessions=5)
+        # The document is built after commit; until then the detail renders live.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('program-detail', args=[program.pk]))
+        data = response.json()
+        self.assertEqual([s['day_number'] for s in data['sessions']], [1, 2, 3, 4, 5])
+        self.assertEqual([e['order'] for e in data['sessions'][0]['exercises']], [1, 2, 3, 4])
+
+
+class NormalizedProgramDetailTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        owner = User.objects.create_user(email='owner@example.com', password='x')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.exercises = [make_exercise('Squat'), make_exercise('Bench'), make_exercise('Row')]
+        self.program = make_program(owner, category, self.exercises, sessions=6)
+        SessionExercise.objects.create(session=self.program.sessions.get(day_number=1), exercise=self.exercises[0],
+                                       order=4, sets=1, reps=3)
+
+    def test_normalized_matches_nested(self):
+        path = reverse('program-detail', args=[self.program.pk])
+        nested = self.client.get(path, {'lang': 'fr'})
+        with self.assertNumQueries(4):
+            normalized = self.client.get(path, {'lang': 'fr', 'shape': 'normalized'})
+        self.assertNotEqual(nested.headers['ETag'], normalized.headers['ETag'])
+        self.assertLess(len(normalized.content), len(nested.content) / 3)
+
+        nested, normalized = nested.json(), normalized.json()
+        self.assertEqual(sorted(normalized['exercises']), sorted(str(e.pk) for e in self.exercises))
+        self.assertEqual(normalized['exercises'][str(self.exercises[0].pk)]['name'], 'Squat (fr)')
+        self.assertEqual({k: v for k, v in normalized.items() if k not in ('sessions', 'exercises')},
+                         {k: v for k, v in nested.items() if k != 'sessions'})
+        for expanded, compact in zip(nested['sessions'], normalized['sessions']):
+            for item in compact['exercises']:
+                item['exercise'] = normalized['exercises'][str(item['exercise'])]
+                item['exercise_name'] = item['exercise']['name']
+            self.assertEqual(compact, expanded)
+
+        self.assertEqual(self.client.get(reverse('program-detail', args=[self.program.pk]), {'shape': 'flat'})
+                         .status_code, 400)
+
+
+class ProgramDocumentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='x')
+        self.category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.exercises = [make_exercise('Squat'), make_exercise('Row')]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program = make_program(self.owner, self.category, self.exercises, sessions=3)
+            self.other = make_program(self.owner, self.category, self.exercises[1:], sessions=1, name_en='Other')
+
+    def detail(self, program, **params):
+        return self.client.get(reverse('program-detail', args=[program.pk]), params)
+
+    def live(self, program, lang='en', shape='nested'):
+        program = Program.objects.with_sessions().get(pk=program.pk)
+        return JSONRenderer().render(PROGRAM_SHAPES[shape](program, lang))
+
+    def test_detail_is_one_read_and_follows_changes(self):
+        self.assertEqual(ProgramDocument.objects.count(), 2 * 3 * 2)
+        for params in ({}, {'lang': 'ar'}, {'lang': 'fr', 'shape': 'normalized'}):
+            with self.assertNumQueries(1):
+                response = self.detail(self.program, **params)
+            self.assertEqual(response.content, self.live(self.program, params.get('lang', 'en'),
+                                                         params.get('shape', 'nested')))
+
+        # Writes drop the affected documents at once; other programs keep theirs.
+        with self.captureOnCommitCallbacks() as callbacks:
+            item = SessionExercise.objects.filter(session__program=self.program).first()
+            item.sets = 1
+            item.save()
+            self.assertFalse(ProgramDocument.objects.filter(program=self.program).exists())
+            self.assertEqual(ProgramDocument.objects.filter(program=self.other).count(), 6)
+            self.assertEqual(self.detail(self.program).content, self.live(self.program))
+        for callback in callbacks:
+            callback()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.detail(self.program).json()['sessions'][0]['exercises'][0]['sets'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.exercises[1].name = {'en': 'Pendlay Row'}
+            self.exercises[1].save()
+        self.assertIn(b'Pendlay Row', self.detail(self.other).content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.is_custom = True
+            self.other.save()
+        self.assertFalse(ProgramDocument.objects.filter(program=self.other).exists())
+        self.assertEqual(self.detail(self.other).status_code, 404)
+
+    def test_exercise_writes_look_up_programs_once_and_only_when_needed(self):
+        def lookups(queries):
+            return [q for q in queries.captured_queries if 'programs_programsession' in q['sql']]
+
+        with CaptureQueriesContext(connection) as queries:
+            make_exercise('Lunge')
+        self.assertEqual(lookups(queries), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                self.exercises[0].delete()  # in all three sessions of self.program
+            self.assertEqual(len(lookups(queries)), 1)
+            self.assertFalse(ProgramDocument.objects.filter(program=self.program).exists())
+        self.assertEqual(ProgramDocument.objects.filter(program=self.program).count(), 6)
+        self.assertEqual(self.detail(self.program).content, self.live(self.program))
+
+    def test_rebuild_that_raced_a_write_starts_over(self):
+        render, raced = documents.render, []
+
+        def racing(program):
+            # The rows were read; another transaction commits a rename.
+            if not raced:
+                raced.append(program.pk)
+                Program.objects.filter(pk=self.program.pk).update(name={'en': 'Renamed'})
+                catalog.bump_version()
+            return render(program)
+
+        ProgramDocument.objects.all().delete()
+        with mock.patch.object(documents, 'render', side_effect=racing):
+            documents.rebuild([self.program.pk])
+        self.assertEqual(raced, [self.program.pk])
+        self.assertEqual(ProgramDocument.objects.count(), 6)
+        self.assertEqual(self.detail(self.program).content, self.live(self.program))
+        self.assertIn(b'Renamed', self.detail(self.program).content)
+
+    def test_consistency_checker(self):
+        ProgramDocument.objects.filter(program=self.program, lang='fr', shape='nested').update(content='{}')
+        ProgramDocument.objects.filter(program=self.program, lang='ar').delete()
+        Program.objects.filter(pk=self.other.pk).update(is_custom=True)
+
+        out = io.StringIO()
+        with self.assertRaisesMessage(CommandError, '1 stale, 2 missing, 6 orphaned'):
+            call_command('check_program_documents', stdout=out)
+        self.assertEqual(ProgramDocument.objects.count(), 10)
+
+        call_command('check_program_documents', repair=True, stdout=out)
+        self.assertEqual(ProgramDocument.objects.count(), 6)
+        self.assertEqual(self.detail(self.program, lang='fr').content, self.live(self.program, 'fr'))
+        call_command('check_program_documents', stdout=out)
+        self.assertIn('6 documents for 1 programs are up to date', out.getvalue())
+
+
+class FastSerializerParityTests(TemporaryMediaMixin, TestCase):
+    def test_matches_program_serializer(self):
+        owner = User.objects.create_user(email='owner@example.com', password='x')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        exercises = [make_exercise('Squat'), make_exercise('Row', name={'en': 'Row'})]
+        make_program(owner, category, exercises, sessions=3)
+        with_thumbnail = make_program(owner, category, exercises[::-1], sessions=1, name_en='Other')
+        with_thumbnail.thumbnail = make_image()
+        with_thumbnail.save()
+        ProgramSession.objects.create(program=with_thumbnail, day_number=2, name={'fr': 'Jour 2'})
+
+        programs = list(Program.objects.with_sessions().order_by('id'))
+        for lang in ('en', 'fr', 'ar'):
+            expected = ProgramSerializer(programs, many=True, context={'lang': lang}).data
+            self.assertEqual(serialize_programs(programs, lang), expected)
+
+
+class ImageRenditionTests(TemporaryMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.owner = User.objects.create_user(email='owner@example.com', password='x')
+        self.program = make_program(self.owner, ProgramCategory.objects.create(name={'en': 'C'}), [], sessions=0)
+
+    def test_upload_generates_renditions(self):
+        self.program.thumbnail = make_image('squat.png', mode='RGBA')
+        self.program.save()
+        renditions = self.program.thumbnail_renditions
+        self.assertEqual(renditions['source'], 'programs/thumbnails/squat.png')
+        self.assertEqual(renditions['webp']['320'], 'programs/thumbnails/squat.w320.webp')
+        with default_storage.open(renditions['jpeg']['640']) as f:
+            image = Image.open(f)
+            self.assertEqual((image.format, image.size), ('JPEG', (640, 320)))
+
+        data = self.client.get(reverse('program-detail', args=[self.program.pk])).json()
+        self.assertEqual(data['thumbnail'], '/media/programs/thumbnails/squat.png')
+        self.assertEqual(data['thumbnail_srcset']['webp'], ', '.join(
+            f'/media/programs/thumbnails/squat.w{width}.webp {width}w' for width in (160, 320, 640)
+        ))
+
+        # Unchanged images are not re-rendered; replaced ones drop their renditions.
+        self.program.save()
+        self.program.thumbnail = make_image('tiny.png', size=(100, 50))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.program.save()
+            # Until the row is committed it may still point at them.
+            self.assertTrue(default_storage.exists('programs/thumbnails/squat.w320.webp'))
+        self.assertFalse(default_storage.exists('programs/thumbnails/squat.w320.webp'))
+        self.assertEqual(self.program.thumbnail_renditions['jpeg'], {'100': 'programs/thumbnails/tiny.w100.jpg'})
+
+        self.program.thumbnail = None
+        self.program.save()
+        self.assertEqual(self.program.thumbnail_renditions, {})
+        self.assertIsNone(self.client.get(reverse('program-detail', args=[self.program.pk])).json()['thumbnail_srcset'])
+
+    def test_backfill_command(self):
+        name = default_storage.save('programs/thumbnails/old.png', make_image())
+        Program.objects.filter(pk=self.program.pk).update(thumbnail=name)
+        coach = Coach.objects.create(user=self.owner)
+        Coach.objects.filter(pk=coach.pk).update(photo=default_storage.save('coaches/me.png', make_image()))
+        broken = make_program(self.owner, self.program.category, [], sessions=0)
+        Program.objects.filter(pk=broken.pk).update(thumbnail='programs/thumbnails/missing.png')
+        self.client.get(reverse('program-list'))
+
+        out, err = io.StringIO(), io.StringIO()
+        call_command('build_image_renditions', workers=2, stdout=out, stderr=err)
+        self.assertIn('Rendered 2 images (1 failed)', out.getvalue())
+        self.assertIn('missing.png', err.getvalue())
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'coaches'))), 7)
+
+        coach.refresh_from_db()
+        self.assertEqual(coach.photo_renditions['webp']['160'], 'coaches/me.w160.webp')
+        response = self.client.get(reverse('program-list'))
+        self.assertEqual(response.json()[0]['thumbnail_srcset']['jpeg'].count('w,'), 2)
+
+        call_command('build_image_renditions', workers=1, stdout=out, stderr=io.StringIO())
+        self.assertIn('Rendered 0 images (1 failed)', out.getvalue())
+
+
+class UserPlanBatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='planner@example.com', password='pass')
+        self.other = User.objects.create_user(email='other@example.com', password='pass')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.programs = [
+            Program.objects.create(name={'en': f'P{i}', 'fr': f'P{i} (fr)'}, description={}, difficulty='beginner',
+                                   category=category, created_by=self.other)
+            for i in range(4)
+        ]
+        self.own_custom = Program.objects.create(name={'en': 'Mine'}, description={}, difficulty='beginner',
+                                                 category=category, created_by=self.user, is_custom=True)
+        self.foreign_custom = Program.objects.create(name={'en': 'Theirs'}, description={}, difficulty='beginner',
+                                                     category=category, created_by=self.other, is_custom=True)
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {UserRefreshToken.for_user(self.user).access_token}'
+
+    def post(self, data, **params):
+        url = reverse('user-plans')
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(url, data, content_type='application/json')
+
+    def planned(self):
+        return set(UserPlan.objects.filter(user=self.user).values_list('program_id', flat=True))
+
+    def test_batch_add_is_idempotent(self):
+        ids = [program.pk for program in self.programs]
+        first = self.post({'add': ids})
+        self.assertEqual(first.status_code, 200)
+        again = self.post({'add': ids})
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json(), first.json())
+        self.assertEqual(self.planned(), set(ids))
+        self.assertEqual([plan['program'] for plan in first.json()], ids)
+
+    def test_add_and_remove_in_one_request(self):
+        self.post({'add': [self.programs[0].pk, self.programs[1].pk]})
+        response = self.post({'add': [self.programs[2].pk], 'remove': [self.programs[0].pk, self.programs[3].pk]},
+                             lang='fr')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.planned(), {self.programs[1].pk, self.programs[2].pk})
+        self.assertEqual([plan['program_name'] for plan in response.json()], ['P1 (fr)', 'P2 (fr)'])
+
+    def test_single_program_shorthands(self):
+        self.assertEqual(self.post({'program_id': self.programs[0].pk}).status_code, 200)
+        self.assertEqual(self.post({'program': self.programs[1].pk}).status_code, 200)
+        self.assertEqual(self.post({'program_id': self.programs[0].pk}).status_code, 200)
+        self.assertEqual(self.planned(), {self.programs[0].pk, self.programs[1].pk})
+
+    def test_rejects_unknown_and_foreign_programs(self):
+        response = self.post({'add': [self.programs[0].pk, self.foreign_custom.pk, 999999]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(self.foreign_custom.pk), response.json()['add'][0])
+        self.assertEqual(self.planned(), set())
+        self.assertEqual(self.post({'add': [self.own_custom.pk]}).status_code, 200)
+        self.assertEqual(self.planned(), {self.own_custom.pk})
+
+    def test_rejects_empty_and_conflicting_batches(self):
+        self.assertEqual(self.post({}).status_code, 400)
+        self.assertEqual(self.post({'exercise_id': self.programs[0].pk}).status_code, 400)
+        self.assertEqual(self.post({'add': [self.programs[0].pk], 'remove': [self.programs[0].pk]}).status_code, 400)
+        self.assertEqual(self.post({'add': list(range(1, 102))}).status_code, 400)
+
+    def test_user_comes_from_the_token(self):
+        self.post({'add': [self.programs[0].pk], 'user': self.other.pk})
+        self.assertFalse(UserPlan.objects.filter(user=self.other).exists())
+        self.assertEqual(self.planned(), {self.programs[0].pk})
+
+    def test_query_count_is_independent_of_batch_size(self):
+        # Validate, delete, insert and list, plus the savepoint pair the
+        # atomic block takes inside the test transaction.
+        with self.assertNumQueries(6):
+            self.post({'add': [program.pk for program in self.programs], 'remove': [self.own_custom.pk]})
+        response = self.client.get(reverse('user-plans'))
+        self.assertEqual(len(response.json()), 4)
+
+
+class CatalogLibraryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Seeder(log=lambda message: None).run(clients=1, programs=4, plans=0, exercises=30)
+        self.admin = User.objects.get(email='admin@traint.com')
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {UserRefreshToken.for_user(self.admin).access_token}'
+
+    def export(self):
+        response = self.client.get(reverse('library-export'))
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return b''.join(response.streaming_content).decode()
+
+    def import_(self, text):
+        response = self.client.post(reverse('library-import'), text, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_admin_only(self):
+        token = UserRefreshToken.for_user(User.objects.get(email='client1@example.com')).access_token
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+        self.assertEqual(self.client.get(reverse('library-export')).status_code, 403)
+        self.assertEqual(self.client.post(reverse('library-import'), '', content_type='application/x-ndjson')
+                         .status_code, 403)
+
+    def test_round_trip_keeps_ids(self):
+        text = self.export()
+        records = [json.loads(line) for line in text.splitlines()]
+        self.assertEqual([r['type'] for r in records], ['exercise'] * 30 + ['category'] * 4 + ['program'] * 4)
+        self.assertEqual(len(records[-1]['sessions']), 3)
+
+        ids = sorted(SessionExercise.objects.values_list('id', flat=True))
+        result = self.import_(text)
+        self.assertEqual(result['program'], {'created': 0, 'updated': 0, 'unchanged': 4})
+        self.assertEqual(result['exercise'], {'created': 0, 'updated': 0, 'unchanged': 30})
+        self.assertEqual(sorted(SessionExercise.objects.values_list('id', flat=True)), ids)
+        self.assertEqual(self.export(), text)
+
+        Program.objects.all().delete()
+        Exercise.objects.all().delete()
+        ProgramCategory.objects.all().delete()
+        result = self.import_(text)
+        self.assertEqual(result['program'], {'created': 4, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(Program.objects.filter(created_by=self.admin).count(), 4)
+        self.assertEqual(self.export(), text)
+
+    def test_import_upserts_and_reports_errors(self):
+        program = json.loads(self.export().splitlines()[-1])
+        program['sessions'] = program['sessions'][:1]
+        program['sessions'][0]['exercises'][0].update(exercise='new lift', sets=3)
+        broken = dict(program, name={'en': 'Broken'}, sessions=[{'day_number': 1, 'exercises': [
+            {'exercise': 'Nope', 'order': 1}]}])
+        lines = [
+            json.dumps({'type': 'exercise', 'name': {'en': 'New Lift'}, 'main_muscle': 'Back'}),
+            '{not json',
+            json.dumps(program),
+            json.dumps(broken),
+        ]
+        # 20 for the import, 2 for the dropped sessions' translations and 3
+        # to sync the translations of the one new exercise.
+        with self.assertNumQueries(25):
+            result = self.import_('\n'.join(lines))
+        self.assertEqual(result['error_count'], 2)
+        self.assertEqual(result['errors'], [
+            'line 2: Expecting property name enclosed in double quotes: line 1 column 2 (char 1)',
+            "line 4: unknown exercise 'Nope'",
+        ])
+        self.assertEqual(result['exercise'], {'created': 1, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(result['program'], {'created': 0, 'updated': 0, 'unchanged': 1})
+
+        updated = Program.objects.with_sessions().get(name__en=program['name']['en'])
+        self.assertEqual(len(updated.sessions.all()), 1)
+        item = updated.sessions.all()[0].exercises.all()[0]
+        self.assertEqual((item.exercise.name, item.sets), ({'en': 'New Lift'}, 3))
+        self.assertFalse(Program.objects.filter(name__en='Broken').exists())
+
+    def test_import_updates_translated_names(self):
+        records = [json.loads(line) for line in self.export().splitlines()]
+        exercise, program = records[0], records[-1]
+        exercise['name']['fr'] = 'Accroupi'
+        program['name']['ar'] = 'برنامج'
+        result = self.import_('\n'.join(json.dumps(record) for record in (exercise, program)))
+        self.assertEqual(result['exercise'], {'created': 0, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(result['program'], {'created': 0, 'updated': 1, 'unchanged': 0})
+        self.assertEqual(Exercise.objects.get(name__en=exercise['name']['en']).name['fr'], 'Accroupi')
+        self.assertEqual(Program.objects.get(name__en=program['name']['en']).name['ar'], 'برنامج')
+
+    def test_invalid_field_values_are_line_errors(self):
+        program = json.loads(self.export().splitlines()[-1])
+        sessions = [dict(program['sessions'][0], exercises=[dict(program['sessions'][0]['exercises'][0], sets='x')])]
+        lines = [
+            json.dumps({'type': 'exercise', 'name': {'en': 'Lift'}, 'difficulty': 'x' * 30}),
+            json.dumps({'type': 'exercise', 'name': {'en': 'Lift'}, 'main_muscle': ['Back']}),
+            json.dumps(dict(program, duration_weeks=-1)),
+            json.dumps(dict(program, sessions=sessions)),
+            json.dumps({'type': 'exercise', 'name': {'en': 'Valid Lift'}}),
+        ]
+        result = self.import_('\n'.join(lines))
+        self.assertEqual(result['error_count'], 4)
+        self.assertEqual([error.split(':')[0] for error in result['errors']],
+                         ['line 1', 'line 2', 'line 3', 'line 4'])
+        self.assertIn('difficulty', result['errors'][0])
+        self.assertIn('sets', result['errors'][3])
+        self.assertEqual(result['exercise']['created'], 1)
+
+    def test_commands(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'catalog.ndjson')
+        call_command('export_catalog', output=path, chunk_size=2, stderr=io.StringIO())
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), self.export())
+        out = io.StringIO()
+        call_command('import_catalog', path, batch_size=3, stdout=out)
+        self.assertIn('program: 0 created, 0 updated, 4 unchanged; 0 errors', out.getvalue())
+        self.assertEqual(library.Importer(self.admin.id).run([]).stats['program'], {'created': 0, 'updated': 0, 'unchanged': 0})
+
+
+class SeederTests(TestCase):
+    def counts(self):
+        return [m.objects.count() for m in (User, Exercise, Program, ProgramSession, SessionExercise, UserPlan)]
+
+    def test_seeding_is_idempotent_and_scales(self):
+        seeder = Seeder(batch_size=7, log=lambda message: None)
+        seeder.run(clients=20, programs=8, plans=12)
+        self.assertEqual(self.counts(), [24, 10, 8, 24, 120, 12])
+        seeder.run(clients=20, programs=8, plans=12)
+        self.assertEqual(self.counts(), [24, 10, 8, 24, 120, 12])
+
+        client = User.objects.get(email='client1@example.com')
+        self.assertTrue(client.check_password('clientpass123'))
+        self.assertEqual(client.preferred_language, 'ar')
+
+        # Accounts promoted by hand stay promoted.
+        User.objects.filter(pk=client.pk).update(is_staff=True)
+        seeder.run(clients=20, programs=8, plans=12)
+        self.assertTrue(User.objects.get(pk=client.pk).is_staff)
+        self.assertTrue(User.objects.get(email='admin@traint.com').is_superuser)
+
+        with self.assertRaisesMessage(CommandError, 'owner_id or at least one coach'):
+            seeder.seed_programs([{'name': {'en': 'Orphan'}, 'category': 'Strength'}], [], {})
@@ -4,5 +4,19 @@ from . import views
 urlpatterns = [
     path('', views.program_list, name='program-list'),
     path('<int:pk>/', views.program_detail, name='program-detail'),
-    path('user-plans/', views.create_user_plan, name='user-plan-create'),
-]
\ No newline at end of file
+    # Legacy location of /api/user-plans/.
+    path('user-plans/', views.user_plans, name='user-plan-create'),
+    path('library/', views.library_export, name='library-export'),
+    path('library/import/', views.library_import, name='library-import'),
+]
+
+# Served by core.async_urls in front of the routes above.
+async_urlpatterns = [
+    path('', views.program_list_async, name='program-list'),
+    path('<int:pk>/', views.program_detail_async, name='program-detail'),
+]
+
+# Mounted at /api/user-plans/ by core.urls.
+user_plan_urlpatterns = [
+    path('', views.user_plans, name='user-plans'),
+]
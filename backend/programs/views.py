@@ -1,47 +1,108 @@
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from core import catalog, routers
+from core.async_api import json_response
+from core.instrumentation import timer
+from . import documents, library
 from .models import Program
-from .serializers import ProgramSerializer, UserPlanSerializer  # ✅ Now this works
+from .serializers import PROGRAM_SHAPES, UserPlanBatchSerializer, serialize_programs, serialize_user_plans
 
 
 
+@catalog.register_snapshot(catalog.PROGRAMS)
+def build_program_list(lang):
+    programs = list(Program.objects.with_sessions(lang).filter(is_custom=False))
+    with timer('serialize'):
+        return serialize_programs(programs, lang)
+
+@catalog.conditional
 @api_view(['GET'])
 def program_list(request):
     lang = request.GET.get('lang', 'en')
-    if lang not in ['en', 'fr', 'ar']:
+    if lang not in catalog.LANGUAGES:
         lang = 'en'
-    programs = Program.objects.filter(is_custom=False)
-    serializer = ProgramSerializer(programs, many=True, context={'lang': lang})
-    return Response(serializer.data)
+    return catalog.snapshot_response(request, catalog.PROGRAMS, lang)
 
+@catalog.conditional
 @api_view(['GET'])
 def program_detail(request, pk):
     lang = request.GET.get('lang', 'en')
     if lang not in ['en', 'fr', 'ar']:
         lang = 'en'
+    shape = request.GET.get('shape', 'nested')
+    serialize = PROGRAM_SHAPES.get(shape)
+    if serialize is None:
+        return Response({'error': "shape must be 'nested' or 'normalized'"}, status=400)
+    content = documents.get(pk, lang, shape)
+    if content is not None:
+        return HttpResponse(content, content_type='application/json')
     try:
-        program = Program.objects.get(pk=pk, is_custom=False)
-        serializer = ProgramSerializer(program, context={'lang': lang})
-        return Response(serializer.data)
+        program = Program.objects.with_sessions(lang).get(pk=pk, is_custom=False)
+        with timer('serialize'):
+            return Response(serialize(program, lang))
     except Program.DoesNotExist:
         return Response({'error': 'Program not found'}, status=404)
 
+@catalog.aconditional
+@require_GET
+async def program_list_async(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    return await catalog.asnapshot_response(request, catalog.PROGRAMS, lang)
 
-@api_view(['POST'])
+@catalog.aconditional
+@require_GET
+async def program_detail_async(request, pk):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    shape = request.GET.get('shape', 'nested')
+    serialize = PROGRAM_SHAPES.get(shape)
+    if serialize is None:
+        return json_response({'error': "shape must be 'nested' or 'normalized'"}, status=400)
+    content = await documents.aget(pk, lang, shape)
+    if content is not None:
+        return HttpResponse(content, content_type='application/json')
+    try:
+        program = await Program.objects.with_sessions(lang).aget(pk=pk, is_custom=False)
+    except Program.DoesNotExist:
+        return json_response({'error': 'Program not found'}, status=404)
+    with timer('serialize'):
+        return json_response(serialize(program, lang))
+
+
+@api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
-def create_user_plan(request):
-    serializer = UserPlanSerializer(data=request.data)
-    if serializer.is_valid():
-        serializer.save(user=request.user)
-        return Response(serializer.data, status=201)
-    return Response(serializer.errors, status=400)
+def user_plans(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    if request.method == 'POST':
+        # Validate against the primary: a program created moments ago may
+        # not have reached the replica yet.
+        with routers.primary():
+            serializer = UserPlanBatchSerializer(data=request.data, context={'user_id': request.user.id})
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=400)
+            serializer.save(user_id=request.user.id)
+    return Response(serialize_user_plans(request.user.id, lang))
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def library_export(request):
+    response = StreamingHttpResponse(library.export_lines(), content_type='application/x-ndjson')
+    response['Content-Disposition'] = 'attachment; filename="catalog.ndjson"'
+    return response
 
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def create_user_plan(request):
-    serializer = UserPlanSerializer(data=request.data)
-    if serializer.is_valid():
-        serializer.save(user=request.user)
-        return Response(serializer.data, status=201)
-    return Response(serializer.errors, status=400)
\ No newline at end of file
+@permission_classes([IsAdminUser])
+def library_import(request):
+    # Read the NDJSON body line by line instead of through a parser.
+    lines = iter(request.stream.readline, b'') if request.stream else []
+    importer = library.Importer(owner_id=request.user.id).run(lines)
+    return Response({**importer.stats, 'error_count': importer.error_count, 'errors': importer.errors})
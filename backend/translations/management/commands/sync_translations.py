@@ -0,0 +1,34 @@
+# backend/translations/management/commands/sync_translations.py
+from django.core.management.base import BaseCommand, CommandError
+
+from translations import storage
+
+
+class Command(BaseCommand):
+    help = (
+        'Rewrite the Translation table from the JSON translation fields of the catalog. Run once after '
+        'deploying the table, before setting TRANSLATION_STORAGE=table; --check only compares the two and '
+        'exits non-zero on drift.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options['check']:
+            missing = stale = 0
+            for model in storage.models():
+                model_missing, model_stale = storage.drift(model)
+                if model_missing or model_stale:
+                    self.stdout.write(f'{model._meta.label_lower}: {model_missing} missing, {model_stale} stale')
+                missing += model_missing
+                stale += model_stale
+            if missing or stale:
+                raise CommandError(f'{missing} missing, {stale} stale translations; rerun without --check')
+            self.stdout.write(self.style.SUCCESS('Translations are up to date'))
+            return
+        for model in storage.models():
+            written = storage.sync(model, chunk_size=options['chunk_size'])
+            self.stdout.write(f'{model._meta.label_lower}: {written} translations')
+        self.stdout.write(self.style.SUCCESS('Translations synced'))
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:41
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def create_trigram_index(apps, schema_editor):
+    # Substring/prefix name search (see fitness migration 0003); Postgres only.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS translations_name_trgm ON translations_translation '
+        "USING gin ((LOWER(text)) gin_trgm_ops) WHERE field = 'name'"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS translations_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Translation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=50)),
+                ('field', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('lang', models.CharField(max_length=5)),
+                ('text', models.TextField()),
+            ],
+            options={
+                'indexes': [models.Index(models.F('model'), models.F('lang'), django.db.models.functions.text.Lower('text'), condition=models.Q(('field', 'name')), name='translations_name_idx')],
+                'unique_together': {('model', 'object_id', 'field', 'lang')},
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,23 @@
+# backend/translations/models.py
+from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
+
+
+class Translation(models.Model):
+    # One language of one translated field of one catalog row, maintained
+    # from the JSON fields by translations/storage.py (TRANSLATION_STORAGE).
+    model = models.CharField(max_length=50)  # "fitness.exercise"
+    field = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    lang = models.CharField(max_length=5)
+    text = models.TextField()  # list values (instructions) are JSON-encoded
+
+    class Meta:
+        unique_together = ('model', 'object_id', 'field', 'lang')
+        indexes = [
+            # Names per language, for lookups and ordering; the trigram
+            # indexes for substring search are Postgres-only (migration 0001).
+            models.Index(F('model'), F('lang'), Lower('text'), name='translations_name_idx',
+                         condition=models.Q(field='name')),
+        ]
@@ -0,0 +1,62 @@
+# backend/translations/query.py
+"""
+Language resolution in SQL.
+
+``Model.objects.localized(lang)`` annotates ``<field>_l10n`` for the
+translated fields of a catalog model: the value in ``lang``, else English,
+else the field's default. Results can be filtered and ordered on, and
+serializers pick them up through ``resolve()`` instead of walking every
+row's translation dict in Python. With ``TRANSLATION_STORAGE=table`` the
+values are read from the ``Translation`` table instead of the JSON fields.
+"""
+from django.db import models
+from django.db.models import JSONField, TextField, Value
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import Coalesce
+
+from . import storage
+
+
+def localize(model, field, lang, default='', via=None):
+    """
+    ``field`` of ``model`` in ``lang`` with the English fallback. ``via``
+    names the relation to ``model`` when the query is on another model
+    (``localize(Program, 'name', lang, via='program')`` on user plans).
+    """
+    label = model._meta.label_lower
+    if storage.enabled():
+        if not hasattr(default, 'resolve_expression'):
+            # The table stores text; list defaults are encoded like its rows.
+            default = Value(storage.encode(label, field, default))
+        return storage.localized(model, field, lang, default, outer_ref=via or 'pk')
+    if (label, field) in storage.LIST_FIELDS:
+        transform, output_field = KeyTransform, JSONField()
+    else:
+        transform, output_field = KeyTextTransform, TextField()
+    if not hasattr(default, 'resolve_expression'):
+        default = Value(default, output_field=output_field)
+    path = f'{via}__{field}' if via else field
+    keys = [transform(code, path) for code in dict.fromkeys([lang, 'en'])]
+    return Coalesce(*keys, default, output_field=output_field)
+
+
+def resolve(obj, field, lang, default=''):
+    """``obj.field`` in ``lang``: the ``localized(lang)`` annotation when present, else resolved here."""
+    values = obj.__dict__
+    if values.get('l10n_lang') == lang and f'{field}_l10n' in values:
+        return values[f'{field}_l10n']
+    value = getattr(obj, field)
+    return value.get(lang, value.get('en', default))
+
+
+class LocalizedQuerySet(models.QuerySet):
+    # Translated field -> default when neither the language nor English is
+    # set; a value or an expression over the row.
+    localized_fields = {}
+
+    def localized(self, lang, *fields):
+        """Annotate ``<field>_l10n`` (all ``localized_fields`` by default) in ``lang``."""
+        return self.annotate(l10n_lang=Value(lang), **{
+            f'{field}_l10n': localize(self.model, field, lang, self.localized_fields[field])
+            for field in fields or self.localized_fields
+        })
@@ -0,0 +1,24 @@
+# backend/translations/signals.py
+from django.db.models.signals import post_delete, post_save
+
+from . import storage
+
+
+# The table is kept current whatever TRANSLATION_STORAGE says; the setting
+# only chooses where reads come from.
+
+def translated_saved(sender, instance, using, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(storage.FIELDS[sender._meta.label_lower]):
+        return
+    storage.save(instance, using)
+
+
+def translated_deleted(sender, instance, using, **kwargs):
+    storage.delete(instance, using)
+
+
+for model in storage.models():
+    post_save.connect(translated_saved, sender=model, dispatch_uid=f'translations-saved-{model._meta.label_lower}')
+    post_delete.connect(translated_deleted, sender=model, dispatch_uid=f'translations-deleted-{model._meta.label_lower}')
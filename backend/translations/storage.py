@@ -0,0 +1,161 @@
+# backend/translations/storage.py
+"""
+Normalized storage for the multilingual catalog fields.
+
+The catalog keeps its translations in ``{"en": ..., "fr": ..., "ar": ...}``
+JSON fields, so every read loads every language and no language can be
+indexed on its own. Each language of each field in ``FIELDS`` is also
+stored as one ``Translation`` row, and with ``TRANSLATION_STORAGE=table``
+reads use those rows: the query layer fetches a single language with
+``localized()`` (through ``translations.query``) and search matches names
+through ``name_matches()``.
+
+The JSON fields stay the source of truth and the table is maintained
+whatever the setting, so it is current the moment a process switches its
+reads over. The signal handlers in ``translations.signals`` rewrite an
+object's rows whenever it is saved or deleted, and bulk writes (library
+import, seeding) call ``sync_objects`` for the rows they touched.
+``sync_translations`` backfills the data written before the table existed,
+and ``--check`` reports any drift.
+"""
+import json
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import JSONField, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Lower
+
+from .models import Translation
+
+ALL = None
+
+# Model label -> translated fields
+FIELDS = {
+    'fitness.exercise': ('name', 'description', 'instructions', 'category'),
+    'programs.program': ('name', 'description'),
+    'programs.programsession': ('name',),
+    'programs.programcategory': ('name',),
+}
+
+# Fields whose per-language values are lists; stored as JSON text.
+LIST_FIELDS = {('fitness.exercise', 'instructions')}
+
+
+def enabled():
+    return getattr(settings, 'TRANSLATION_STORAGE', 'json') == 'table'
+
+
+def models():
+    return [apps.get_model(label) for label in FIELDS]
+
+
+def encode(label, field, value):
+    return json.dumps(value, ensure_ascii=False) if (label, field) in LIST_FIELDS else str(value)
+
+
+def rows(label, pk, values):
+    """``Translation`` rows for the ``{field: {lang: value}}`` of one object."""
+    return [
+        Translation(model=label, field=field, object_id=pk, lang=lang, text=encode(label, field, value))
+        for field in FIELDS[label]
+        if isinstance(values.get(field), dict)
+        for lang, value in values[field].items()
+        if value is not None
+    ]
+
+
+def save(instance, using=None):
+    """Rewrite the rows of ``instance`` on ``using`` (the database it was saved to)."""
+    label = instance._meta.label_lower
+    translations = Translation.objects.db_manager(using)
+    with transaction.atomic(using=translations.db):
+        translations.filter(model=label, object_id=instance.pk).delete()
+        translations.bulk_create(
+            rows(label, instance.pk, {field: getattr(instance, field) for field in FIELDS[label]})
+        )
+
+
+def delete(instance, using=None):
+    Translation.objects.db_manager(using).filter(model=instance._meta.label_lower, object_id=instance.pk).delete()
+
+
+def sync(model, ids=ALL, chunk_size=500):
+    """Rewrite the rows of ``model`` (all objects by default) from its JSON fields; return how many."""
+    label = model._meta.label_lower
+    objects = model.objects.order_by('pk')
+    stale = Translation.objects.filter(model=label)
+    if ids is not ALL:
+        objects = objects.filter(pk__in=ids)
+        stale = stale.filter(object_id__in=ids)
+    written = 0
+    # Bulk writers call this inside their own transaction.
+    with transaction.atomic(savepoint=False):
+        # Deleting by model also drops the rows of objects that no longer exist.
+        stale.delete()
+        batch = []
+        for pk, *values in objects.values_list('pk', *FIELDS[label]).iterator(chunk_size=chunk_size):
+            batch += rows(label, pk, dict(zip(FIELDS[label], values)))
+            if len(batch) >= chunk_size:
+                written += len(Translation.objects.bulk_create(batch))
+                batch = []
+        written += len(Translation.objects.bulk_create(batch))
+    return written
+
+
+def sync_all():
+    return sum(sync(model) for model in models())
+
+
+def sync_objects(changes, chunk_size=500):
+    """``sync`` the ``{model: ids}`` a bulk write created or changed."""
+    return sum(
+        sync(model, ids, chunk_size) for model, ids in changes.items()
+        if ids and model._meta.label_lower in FIELDS
+    )
+
+
+def drift(model):
+    """``(missing, stale)`` row counts of ``model`` compared to its JSON fields."""
+    label = model._meta.label_lower
+    expected = {
+        (row.object_id, row.field, row.lang): row.text
+        for pk, *values in model.objects.values_list('pk', *FIELDS[label]).iterator()
+        for row in rows(label, pk, dict(zip(FIELDS[label], values)))
+    }
+    stored = {
+        (object_id, field, lang): text
+        for object_id, field, lang, text in Translation.objects.filter(model=label)
+        .values_list('object_id', 'field', 'lang', 'text').iterator()
+    }
+    missing = sum(1 for key in expected if key not in stored)
+    stale = sum(1 for key, text in stored.items() if expected.get(key) != text)
+    return missing, stale
+
+
+def _text(label, field, lang, outer_ref):
+    return Subquery(
+        Translation.objects.filter(model=label, field=field, lang=lang, object_id=OuterRef(outer_ref))
+        .values('text')[:1]
+    )
+
+
+def localized(model, field, lang, default=None, outer_ref='pk'):
+    """``field`` of the outer ``model`` row in ``lang``, falling back to English, read from the table."""
+    label = model._meta.label_lower
+    if (label, field) in LIST_FIELDS:
+        output_field, empty = JSONField(), '[]'
+    else:
+        output_field, empty = TextField(), ''
+    texts = [_text(label, field, code, outer_ref) for code in dict.fromkeys([lang, 'en'])]
+    return Coalesce(*texts, Value(empty) if default is None else default, output_field=output_field)
+
+
+def name_matches(model, langs, lookup, q):
+    """Ids of ``model`` whose lowercased name in one of ``langs`` matches ``lookup`` ``q``."""
+    return (
+        Translation.objects.filter(model=model._meta.label_lower, field='name', lang__in=langs)
+        .alias(lower=Lower('text'))
+        .filter(**{f'lower__{lookup}': q})
+        .values('object_id')
+    )
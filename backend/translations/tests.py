@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import User
+from fitness.models import Exercise
+from fitness.serializers import serialize_exercises
+from fitness.tests import make_exercise
+from programs.models import Program, ProgramCategory, ProgramSession
+from programs.serializers import ProgramSerializer, serialize_programs
+from programs.tests import make_program
+from . import storage
+from .models import Translation
+from .query import resolve
+
+
+@override_settings(TRANSLATION_STORAGE='table')
+class TranslationStorageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def texts(self, exercise, field):
+        return dict(Translation.objects.filter(model='fitness.exercise', object_id=exercise.pk, field=field)
+                    .values_list('lang', 'text'))
+
+    def test_rows_follow_saves_and_deletes(self):
+        exercise = make_exercise('Squat')
+        self.assertEqual(self.texts(exercise, 'name'), {'en': 'Squat', 'ar': 'Squat (ar)', 'fr': 'Squat (fr)'})
+        self.assertEqual(self.texts(exercise, 'instructions')['fr'], '["Étape 1", "Étape 2"]')
+
+        exercise.name = {'en': 'Back Squat'}
+        exercise.save()
+        self.assertEqual(self.texts(exercise, 'name'), {'en': 'Back Squat'})
+        # Saves that touch no translated field leave the rows alone.
+        ids = set(Translation.objects.values_list('pk', flat=True))
+        exercise.equipment = 'Barbell'
+        exercise.save(update_fields=['equipment'])
+        self.assertEqual(set(Translation.objects.values_list('pk', flat=True)), ids)
+
+        exercise.delete()
+        self.assertFalse(Translation.objects.exists())
+
+    @override_settings(TRANSLATION_STORAGE='json')
+    def test_table_is_maintained_before_reads_switch_over(self):
+        exercise = make_exercise('Squat')
+        self.assertEqual(self.texts(exercise, 'name')['fr'], 'Squat (fr)')
+        exercise.delete()
+        self.assertFalse(Translation.objects.exists())
+
+    def test_sync_backfills_and_check_reports_drift(self):
+        make_exercise('Squat')
+        make_exercise('Deadlift')
+        Translation.objects.all().delete()  # rows written before the table existed
+        with self.assertRaisesMessage(CommandError, '18 missing, 0 stale'):
+            call_command('sync_translations', check=True, stdout=StringIO())
+        call_command('sync_translations', stdout=StringIO())
+        call_command('sync_translations', check=True, stdout=StringIO())
+
+        Exercise.objects.update(name={'en': 'Renamed'})
+        self.assertEqual(storage.drift(Exercise), (0, 6))
+
+    def test_localized_falls_back_to_english(self):
+        make_exercise('Only English', name={'en': 'Only English'}, category={'fr': 'Pectoraux'})
+        exercise = Exercise.objects.annotate(
+            name_l10n=storage.localized(Exercise, 'name', 'fr'),
+            category_l10n=storage.localized(Exercise, 'category', 'en'),
+            instructions_l10n=storage.localized(Exercise, 'instructions', 'ar'),
+        ).get()
+        self.assertEqual(exercise.name_l10n, 'Only English')
+        self.assertEqual(exercise.category_l10n, '')
+        self.assertEqual(exercise.instructions_l10n, ['Step 1', 'Step 2'])
+
+    def test_page_and_search_match_json_storage(self):
+        make_exercise('Bench Press', main_muscle='Chest')
+        make_exercise('Incline Bench Press', name={'en': 'Incline Bench Press'})
+        make_exercise('Squat', instructions={'en': ['Sit']})
+        requests = [
+            ('exercise-list', {'lang': 'fr', 'limit': 10}),
+            ('exercise-list', {'lang': 'ar', 'limit': 10, 'fields': 'id,name,instructions'}),
+            ('exercise-search', {'q': 'bench', 'lang': 'fr'}),
+            ('exercise-search', {'q': 'bench press (f', 'lang': 'fr', 'match': 'prefix'}),
+            ('exercise-search', {'q': 'squat', 'lang': 'ar'}),
+        ]
+        for name, params in requests:
+            table = self.client.get(reverse(name), params).json()
+            with override_settings(TRANSLATION_STORAGE='json'):
+                cache.clear()
+                self.assertEqual(table, self.client.get(reverse(name), params).json(), (name, params))
+            cache.clear()
+
+
+class LocalizedQueryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.squat = make_exercise('Squat')
+        self.bench = make_exercise('Bench', name={'en': 'Bench', 'fr': 'Développé'}, category={'fr': 'Pectoraux'})
+
+    def test_falls_back_to_english_then_default(self):
+        for storage_mode in ('json', 'table'):
+            with self.subTest(storage_mode), override_settings(TRANSLATION_STORAGE=storage_mode):
+                storage.sync_all()
+                rows = Exercise.objects.localized('ar').order_by('name_l10n').values(
+                    'name_l10n', 'category_l10n', 'instructions_l10n')
+                self.assertEqual(list(rows), [
+                    {'name_l10n': 'Bench', 'category_l10n': '', 'instructions_l10n': ['Step 1', 'Step 2']},
+                    {'name_l10n': 'Squat (ar)', 'category_l10n': 'Chest', 'instructions_l10n': ['Step 1', 'Step 2']},
+                ])
+                self.assertQuerySetEqual(
+                    Exercise.objects.localized('fr').filter(name_l10n__startswith='D'), [self.bench])
+
+                owner = User.objects.create_user(email=f'{storage_mode}@example.com', password='x')
+                program = make_program(owner, ProgramCategory.objects.create(name={'en': 'Strength'}), [])
+                ProgramSession.objects.filter(program=program, day_number=2).update(name={})
+                names = ProgramSession.objects.filter(program=program).localized('fr').order_by('day_number')
+                self.assertEqual([session.name_l10n for session in names], ['Day 1', 'Day 2'])
+
+    def test_serializers_use_the_annotations(self):
+        exercises = list(Exercise.objects.localized('fr').defer('name', 'description', 'instructions', 'category'))
+        with self.assertNumQueries(0):
+            data = serialize_exercises(exercises, 'fr')
+        self.assertEqual([e['name'] for e in data], ['Squat (fr)', 'Développé'])
+        # An annotation for another language is never used.
+        self.assertEqual(resolve(Exercise.objects.localized('fr').get(pk=self.squat.pk), 'name', 'ar'), 'Squat (ar)')
+
+    def test_program_output_matches_serializer(self):
+        owner = User.objects.create_user(email='owner@example.com', password='x')
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        make_program(owner, category, [self.squat, self.bench], name_en='Five')
+        Program.objects.create(name={'fr': 'Sans anglais'}, description={}, difficulty='beginner',
+                               category=category, created_by=owner)
+        for lang in ('en', 'fr', 'ar'):
+            expected = ProgramSerializer(Program.objects.with_sessions().order_by('id'), many=True,
+                                         context={'lang': lang}).data
+            programs = Program.objects.with_sessions(lang).order_by('id')
+            self.assertEqual(serialize_programs(programs, lang), expected)
@@ -0,0 +1,36 @@
+# backend/workouts/admin.py
+from django.contrib import admin
+from .models import Workout, LoggedSet, ProgressionRule, ProgressionState, WeeklyExerciseStats
+
+
+class LoggedSetInline(admin.TabularInline):
+    model = LoggedSet
+    extra = 0
+    raw_id_fields = ['exercise', 'session_exercise', 'user']
+
+
+@admin.register(Workout)
+class WorkoutAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'session', 'performed_at']
+    list_filter = ['performed_at']
+    raw_id_fields = ['user', 'session']
+    inlines = [LoggedSetInline]
+
+
+@admin.register(ProgressionRule)
+class ProgressionRuleAdmin(admin.ModelAdmin):
+    list_display = ['exercise', 'increment', 'deload_after', 'deload_factor']
+    raw_id_fields = ['exercise']
+
+
+@admin.register(ProgressionState)
+class ProgressionStateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'exercise', 'weight', 'failures', 'last_performed_at']
+    raw_id_fields = ['user', 'exercise', 'last_workout']
+
+
+@admin.register(WeeklyExerciseStats)
+class WeeklyExerciseStatsAdmin(admin.ModelAdmin):
+    list_display = ['user', 'exercise', 'week', 'sets', 'volume', 'best_e1rm']
+    list_filter = ['week']
+    raw_id_fields = ['user', 'exercise']
@@ -0,0 +1,115 @@
+# backend/workouts/management/commands/bench_workout_ingest.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+
+from accounts.models import User
+from accounts.tokens import UserRefreshToken
+from core.benchmarking import summarize, test_database
+from programs.models import SessionExercise
+from programs.seeding import Seeder
+from workouts.models import LoggedSet, Workout
+from workouts.serializers import WorkoutIngestSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure workout ingest throughput (sets/second) through /api/workouts/ and compare it with '
+        'saving the same sets one row at a time, in a throwaway test database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workouts', type=int, default=200)
+        parser.add_argument('--sets', type=int, default=25, help='Sets per workout.')
+        parser.add_argument('--users', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with test_database():
+            Seeder(log=lambda message: None).run(clients=options['users'], programs=10, plans=0)
+            users = list(User.objects.filter(role='client').order_by('id'))
+            planned = list(SessionExercise.objects.select_related('session').order_by('session_id', 'order'))
+            payloads = [self._payload(planned, options['sets']) for _ in range(options['workouts'])]
+
+            self._report('per-row save', self._per_row(users, payloads))
+            self._report('batch ingest', self._save(users, payloads))
+            self._report('batch ingest API', self._ingest(users, payloads))
+
+            user = users[0]
+            exercise_id = planned[0].exercise_id
+            timings = []
+            for _ in range(50):
+                started = time.perf_counter()
+                list(LoggedSet.objects.filter(user_id=user.id, exercise_id=exercise_id)
+                     .order_by('-performed_at').values('weight', 'reps', 'performed_at')[:50])
+                timings.append((time.perf_counter() - started) * 1000)
+            stats = summarize(timings)
+            self.stdout.write(
+                f'history (user, exercise) over {LoggedSet.objects.count()} sets: '
+                f'p50={stats["p50_ms"]:.2f}ms p95={stats["p95_ms"]:.2f}ms ({connection.vendor})'
+            )
+
+    @staticmethod
+    def _payload(planned, count):
+        session_id = planned[0].session_id
+        items = [item for item in planned if item.session_id == session_id]
+        return {
+            'session': session_id,
+            'sets': [
+                {'session_exercise': items[i % len(items)].pk, 'weight': '100.0', 'reps': 5, 'rpe': '8.5'}
+                for i in range(count)
+            ],
+        }
+
+    def _per_row(self, users, payloads):
+        exercises = dict(SessionExercise.objects.values_list('id', 'exercise_id'))
+        timings = []
+        for i, payload in enumerate(payloads):
+            user = users[i % len(users)]
+            started = time.perf_counter()
+            with transaction.atomic():
+                workout = Workout.objects.create(user=user, session_id=payload['session'])
+                for number, item in enumerate(payload['sets'], 1):
+                    LoggedSet.objects.create(
+                        workout=workout, user=user, exercise_id=exercises[item['session_exercise']],
+                        session_exercise_id=item['session_exercise'], set_number=number,
+                        weight=item['weight'], reps=item['reps'], rpe=item['rpe'],
+                        performed_at=workout.performed_at,
+                    )
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, sum(len(p['sets']) for p in payloads)
+
+    def _save(self, users, payloads):
+        timings = []
+        for i, payload in enumerate(payloads):
+            started = time.perf_counter()
+            user_id = users[i % len(users)].id
+            serializer = WorkoutIngestSerializer(data=payload, context={'user_id': user_id})
+            serializer.is_valid(raise_exception=True)
+            serializer.save(user_id=user_id)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings, sum(len(p['sets']) for p in payloads)
+
+    def _ingest(self, users, payloads):
+        client = Client()
+        headers = [
+            {'HTTP_AUTHORIZATION': f'Bearer {UserRefreshToken.for_user(user).access_token}'} for user in users
+        ]
+        url = reverse('workout-ingest')
+        timings = []
+        for i, payload in enumerate(payloads):
+            started = time.perf_counter()
+            response = client.post(url, payload, content_type='application/json', **headers[i % len(headers)])
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 201, response.content
+        return timings, sum(len(p['sets']) for p in payloads)
+
+    def _report(self, name, result):
+        timings, sets = result
+        stats = summarize(timings)
+        self.stdout.write(
+            f'{name}: {sets / (sum(timings) / 1000):.0f} sets/s, '
+            f'p50={stats["p50_ms"]:.1f}ms p95={stats["p95_ms"]:.1f}ms per workout ({connection.vendor})'
+        )
@@ -0,0 +1,41 @@
+# backend/workouts/management/commands/rebuild_training_stats.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.models import User
+from workouts import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the weekly per-exercise training stats from logged sets, a chunk of users at a time. '
+        'Run after backfilling or editing sets outside the ingest API.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Users per grouped query.')
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Only rebuild these user ids.')
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('id')
+        if options['users']:
+            users = users.filter(id__in=options['users'])
+        ids = users.values_list('id', flat=True).iterator(chunk_size=options['chunk_size'])
+
+        started = time.perf_counter()
+        total_users = total_rows = 0
+        chunk = []
+        for user_id in ids:
+            chunk.append(user_id)
+            if len(chunk) == options['chunk_size']:
+                total_rows += stats.rebuild(chunk)
+                total_users += len(chunk)
+                self.stdout.write(f'{total_users} users, {total_rows} rows ({time.perf_counter() - started:.1f}s)')
+                chunk = []
+        if chunk:
+            total_rows += stats.rebuild(chunk)
+            total_users += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {total_rows} weekly rows for {total_users} users in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 06:53
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fitness', '0003_search_trigram_indexes'),
+        ('workouts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressionRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('increment', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('deload_after', models.PositiveSmallIntegerField(default=3)),
+                ('deload_factor', models.DecimalField(decimal_places=2, default=Decimal('0.90'), max_digits=3)),
+                ('exercise', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='progression_rule', to='fitness.exercise')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ProgressionState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weight', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('failures', models.PositiveSmallIntegerField(default=0)),
+                ('last_performed_at', models.DateTimeField()),
+                ('exercise', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='fitness.exercise')),
+                ('last_workout', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='workouts.workout')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progression', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'exercise')},
+            },
+        ),
+    ]
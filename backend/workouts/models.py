@@ -0,0 +1,86 @@
+# backend/workouts/models.py
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+from accounts.models import User
+
+
+class Workout(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='workouts')
+    session = models.ForeignKey('programs.ProgramSession', on_delete=models.SET_NULL, null=True, blank=True)
+    performed_at = models.DateTimeField(default=timezone.now)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['user', 'performed_at'], name='workouts_user_time_idx')]
+
+    def __str__(self):
+        return f"Workout {self.pk} ({self.user_id})"
+
+
+class LoggedSet(models.Model):
+    # Append-only and written in bulk: keep indexes to the history lookup
+    # (user, exercise, performed_at) plus the FK indexes needed for deletes.
+    workout = models.ForeignKey(Workout, on_delete=models.CASCADE, related_name='sets')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)  # copied from workout
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE)
+    session_exercise = models.ForeignKey('programs.SessionExercise', on_delete=models.SET_NULL, null=True, blank=True)
+    set_number = models.PositiveSmallIntegerField()
+    weight = models.DecimalField(max_digits=6, decimal_places=2)  # kg
+    reps = models.PositiveSmallIntegerField()
+    rpe = models.DecimalField(max_digits=3, decimal_places=1, null=True, blank=True)
+    performed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'exercise', 'performed_at'], name='workouts_set_user_ex_time_idx'),
+        ]
+
+
+class ProgressionRule(models.Model):
+    """Per-exercise overrides of the PROGRESSION_* settings."""
+    exercise = models.OneToOneField('fitness.Exercise', on_delete=models.CASCADE, related_name='progression_rule')
+    increment = models.DecimalField(max_digits=5, decimal_places=2)  # kg added after a successful session
+    deload_after = models.PositiveSmallIntegerField(default=3)  # consecutive failed sessions
+    deload_factor = models.DecimalField(max_digits=3, decimal_places=2, default=Decimal('0.90'))
+
+    def __str__(self):
+        return f"+{self.increment} kg for exercise {self.exercise_id}"
+
+
+class ProgressionState(models.Model):
+    # One row per (user, exercise), advanced by each recorded workout so the
+    # next session never has to look at past sets.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='progression')
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE)
+    weight = models.DecimalField(max_digits=6, decimal_places=2)  # next working weight, kg
+    failures = models.PositiveSmallIntegerField(default=0)  # consecutive failed sessions at this weight
+    last_workout = models.ForeignKey(Workout, on_delete=models.SET_NULL, null=True, blank=True)
+    last_performed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'exercise')
+
+    def __str__(self):
+        return f"{self.user_id}/{self.exercise_id}: {self.weight} kg"
+
+
+class WeeklyExerciseStats(models.Model):
+    # Materialized from LoggedSet: kept current by the workout ingest and
+    # recomputed by the rebuild_training_stats command.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)  # leads the unique index
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE)
+    week = models.DateField()  # Monday
+    sets = models.PositiveIntegerField(default=0)
+    reps = models.PositiveIntegerField(default=0)
+    volume = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # sum of weight x reps, kg
+    max_weight = models.DecimalField(max_digits=6, decimal_places=2, default=0)
+    best_e1rm = models.DecimalField(max_digits=7, decimal_places=2, default=0)  # Epley
+
+    class Meta:
+        unique_together = ('user', 'exercise', 'week')
+
+    def __str__(self):
+        return f"{self.user_id}/{self.exercise_id} week of {self.week}"
@@ -0,0 +1,192 @@
+# backend/workouts/progression.py
+"""
+5x5 progressive overload.
+
+Each (user, exercise) has a ``ProgressionState`` holding the next working
+weight and the number of consecutive failed sessions. ``record_workout``
+advances it from a single workout's sets, so neither recording a workout nor
+computing the next one ever replays past sets:
+
+* every target set completed at the working weight: add the increment;
+* otherwise count a failure, and after ``deload_after`` failures in a row
+  drop the weight by ``deload_factor``, rounded down to the increment.
+
+The first workout logged for an exercise establishes its working weight
+from the heaviest set.
+"""
+from collections import defaultdict, namedtuple
+from decimal import Decimal, ROUND_DOWN
+
+from django.conf import settings
+from django.db.models import BooleanField, ExpressionWrapper, Q
+
+from fitness.models import Exercise
+from programs.models import ProgramSession, SessionExercise, UserPlan
+from translations.query import localize
+from .models import ProgressionRule, ProgressionState, Workout
+
+# (sets, reps) for exercises logged outside a planned session.
+DEFAULT_TARGET = (5, 5)
+
+Rule = namedtuple('Rule', 'increment deload_after deload_factor')
+
+
+def default_rule():
+    return Rule(
+        Decimal(settings.PROGRESSION_INCREMENT_KG),
+        settings.PROGRESSION_DELOAD_AFTER,
+        Decimal(settings.PROGRESSION_DELOAD_FACTOR),
+    )
+
+
+def get_rules(exercise_ids):
+    """{exercise id: Rule} for ``exercise_ids``, in one query."""
+    default = default_rule()
+    overrides = {
+        exercise_id: Rule(*values)
+        for exercise_id, *values in ProgressionRule.objects.filter(exercise_id__in=exercise_ids)
+        .values_list('exercise_id', 'increment', 'deload_after', 'deload_factor')
+    }
+    return {exercise_id: overrides.get(exercise_id, default) for exercise_id in exercise_ids}
+
+
+def advance(weight, failures, sets, target, rule):
+    """
+    Return the ``(weight, failures)`` that follow one session of ``sets``
+    (``(weight, reps)`` pairs) against a ``(sets, reps)`` target.
+    """
+    if weight is None:
+        weight = max(lifted for lifted, _ in sets)
+    target_sets, target_reps = target
+    completed = sum(1 for lifted, reps in sets if lifted >= weight and reps >= target_reps)
+    if completed >= target_sets:
+        return weight + rule.increment, 0
+    failures += 1
+    if failures >= rule.deload_after:
+        return deload(weight, rule), 0
+    return weight, failures
+
+
+def deload(weight, rule):
+    step = rule.increment if rule.increment > 0 else Decimal('0.01')
+    return (weight * rule.deload_factor / step).to_integral_value(ROUND_DOWN) * step
+
+
+def record_workout(workout, logged_sets):
+    """
+    Advance the user's progression for every exercise in ``workout``. Must
+    run inside the transaction that saved the sets.
+    """
+    sets = defaultdict(list)
+    planned = {}
+    for logged in logged_sets:
+        sets[logged.exercise_id].append((Decimal(logged.weight), logged.reps))
+        if logged.session_exercise_id:
+            planned.setdefault(logged.exercise_id, logged.session_exercise_id)
+    if not sets:
+        return
+
+    targets = {}
+    if planned:
+        targets = {
+            pk: (planned_sets, planned_reps)
+            for pk, planned_sets, planned_reps in SessionExercise.objects.filter(id__in=planned.values())
+            .values_list('id', 'sets', 'reps')
+        }
+    rules = get_rules(list(sets))
+    states = {
+        state.exercise_id: state
+        for state in ProgressionState.objects.select_for_update()
+        .filter(user_id=workout.user_id, exercise_id__in=list(sets))
+    }
+
+    rows = []
+    for exercise_id, performed in sets.items():
+        state = states.get(exercise_id)
+        if state is not None and state.last_performed_at >= workout.performed_at:
+            continue  # back-dated workout: the state already reflects a later session
+        weight, failures = advance(
+            state.weight if state else None,
+            state.failures if state else 0,
+            performed,
+            targets.get(planned.get(exercise_id), DEFAULT_TARGET),
+            rules[exercise_id],
+        )
+        rows.append(ProgressionState(
+            user_id=workout.user_id,
+            exercise_id=exercise_id,
+            weight=weight,
+            failures=failures,
+            last_workout=workout,
+            last_performed_at=workout.performed_at,
+        ))
+    ProgressionState.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user', 'exercise'],
+        update_fields=['weight', 'failures', 'last_workout', 'last_performed_at'],
+    )
+
+
+def next_session(user_id, lang, program_id=None):
+    """
+    The next session of the user's plan (the most recent one unless
+    ``program_id`` is given) with a working weight per exercise, or None if
+    the user has no such plan. Cost is O(exercises in the session).
+    """
+    plans = UserPlan.objects.filter(user_id=user_id)
+    if program_id is not None:
+        plans = plans.filter(program_id=program_id)
+    plan = plans.order_by('-created_at', '-id').values('id', 'program_id').first()
+    if plan is None:
+        return None
+
+    last_day = (
+        Workout.objects.filter(user_id=user_id, session__program_id=plan['program_id'])
+        .order_by('-performed_at').values_list('session__day_number', flat=True).first()
+    )
+    # The first session after the last one trained, wrapping around to day 1.
+    sessions = ProgramSession.objects.filter(program_id=plan['program_id'])
+    if last_day is not None:
+        sessions = sessions.annotate(
+            done=ExpressionWrapper(Q(day_number__lte=last_day), output_field=BooleanField())
+        ).order_by('done', 'day_number')
+    else:
+        sessions = sessions.order_by('day_number')
+    session = sessions.localized(lang).values('id', 'day_number', 'name_l10n').first()
+    if session is None:
+        return {'plan': plan['id'], 'program': plan['program_id'], 'session': None, 'exercises': []}
+
+    items = list(
+        SessionExercise.objects.filter(session_id=session['id']).order_by('order')
+        .annotate(exercise_name=localize(Exercise, 'name', lang, via='exercise'))
+        .values('id', 'exercise_id', 'exercise_name', 'sets', 'reps')
+    )
+    states = {
+        exercise_id: (weight, failures)
+        for exercise_id, weight, failures in ProgressionState.objects.filter(
+            user_id=user_id, exercise_id__in=[item['exercise_id'] for item in items]
+        ).values_list('exercise_id', 'weight', 'failures')
+    }
+    exercises = []
+    for item in items:
+        weight, failures = states.get(item['exercise_id'], (None, 0))
+        exercises.append({
+            'session_exercise': item['id'],
+            'exercise': item['exercise_id'],
+            'exercise_name': item['exercise_name'],
+            'sets': item['sets'],
+            'reps': item['reps'],
+            'weight': None if weight is None else str(weight),
+            'failures': failures,
+        })
+    return {
+        'plan': plan['id'],
+        'program': plan['program_id'],
+        'session': {
+            'id': session['id'],
+            'day_number': session['day_number'],
+            'name': session['name_l10n'],
+        },
+        'exercises': exercises,
+    }
@@ -0,0 +1,115 @@
+# backend/workouts/serializers.py
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import serializers
+
+from fitness.models import Exercise
+from programs.models import ProgramSession, SessionExercise, UserPlan
+from . import progression, stats
+from .models import Workout, LoggedSet
+
+MAX_SETS_PER_WORKOUT = 500
+
+
+def visible_programs(user_id, prefix):
+    """Rows under ``prefix`` (a path to a program ending in ``__``) in a program the user may log against."""
+    return (
+        Q(**{f'{prefix}is_custom': False})
+        | Q(**{f'{prefix}created_by_id': user_id})
+        | Q(**{f'{prefix}in': UserPlan.objects.filter(user_id=user_id).values('program_id')})
+    )
+
+
+class LoggedSetInputSerializer(serializers.Serializer):
+    # References are plain ids, resolved for the whole batch at once in
+    # WorkoutIngestSerializer.validate instead of one query per set.
+    exercise = serializers.IntegerField(required=False)
+    session_exercise = serializers.IntegerField(required=False)
+    set_number = serializers.IntegerField(min_value=1, required=False)
+    weight = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0)
+    reps = serializers.IntegerField(min_value=0, max_value=1000)
+    rpe = serializers.DecimalField(max_digits=3, decimal_places=1, min_value=1, max_value=10,
+                                   required=False, allow_null=True)
+    performed_at = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if 'exercise' not in attrs and 'session_exercise' not in attrs:
+            raise serializers.ValidationError('Either exercise or session_exercise is required.')
+        return attrs
+
+
+class WorkoutIngestSerializer(serializers.Serializer):
+    session = serializers.IntegerField(required=False, allow_null=True)
+    performed_at = serializers.DateTimeField(required=False)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    sets = LoggedSetInputSerializer(many=True, allow_empty=False)
+
+    def validate_sets(self, sets):
+        if len(sets) > MAX_SETS_PER_WORKOUT:
+            raise serializers.ValidationError(f'At most {MAX_SETS_PER_WORKOUT} sets per workout.')
+        return sets
+
+    def validate(self, attrs):
+        sets = attrs['sets']
+        session_id = attrs.get('session')
+        # Other users' custom programs are as good as missing.
+        user_id = self.context['user_id']
+        sessions = ProgramSession.objects.filter(visible_programs(user_id, 'program__'))
+        if session_id is not None and not sessions.filter(pk=session_id).exists():
+            raise serializers.ValidationError({'session': 'Unknown session.'})
+
+        planned = {
+            pk: (session, exercise)
+            for pk, session, exercise in SessionExercise.objects.filter(
+                visible_programs(user_id, 'session__program__'),
+                id__in={s['session_exercise'] for s in sets if 'session_exercise' in s},
+            ).values_list('id', 'session_id', 'exercise_id')
+        }
+        for item in sets:
+            if 'session_exercise' not in item:
+                continue
+            if item['session_exercise'] not in planned:
+                raise serializers.ValidationError({'sets': f"Unknown session_exercise {item['session_exercise']}."})
+            planned_session, planned_exercise = planned[item['session_exercise']]
+            if session_id is not None and planned_session != session_id:
+                raise serializers.ValidationError({'sets': f"session_exercise {item['session_exercise']} is not part of this session."})
+            if item.setdefault('exercise', planned_exercise) != planned_exercise:
+                raise serializers.ValidationError({'sets': f"session_exercise {item['session_exercise']} is not exercise {item['exercise']}."})
+
+        exercise_ids = {item['exercise'] for item in sets}
+        known = set(Exercise.objects.filter(id__in=exercise_ids).values_list('id', flat=True))
+        if exercise_ids - known:
+            raise serializers.ValidationError({'sets': f'Unknown exercises: {sorted(exercise_ids - known)}.'})
+        return attrs
+
+    def create(self, validated_data):
+        user_id = validated_data['user_id']
+        performed_at = validated_data.get('performed_at') or timezone.now()
+        counters = {}
+        with transaction.atomic():
+            workout = Workout.objects.create(
+                user_id=user_id,
+                session_id=validated_data.get('session'),
+                performed_at=performed_at,
+                notes=validated_data.get('notes', ''),
+            )
+            rows = []
+            for item in validated_data['sets']:
+                # Number sets per exercise in submission order unless given.
+                counters[item['exercise']] = counters.get(item['exercise'], 0) + 1
+                rows.append(LoggedSet(
+                    workout=workout,
+                    user_id=user_id,
+                    exercise_id=item['exercise'],
+                    session_exercise_id=item.get('session_exercise'),
+                    set_number=item.get('set_number', counters[item['exercise']]),
+                    weight=item['weight'],
+                    reps=item['reps'],
+                    rpe=item.get('rpe'),
+                    performed_at=item.get('performed_at') or performed_at,
+                ))
+            workout.logged_sets = LoggedSet.objects.bulk_create(rows)
+            progression.record_workout(workout, workout.logged_sets)
+            stats.record_sets(user_id, workout.logged_sets)
+        return workout
@@ -0,0 +1,146 @@
+# backend/workouts/stats.py
+"""
+Per-(user, exercise, week) training statistics.
+
+``WeeklyExerciseStats`` rows are merged with each workout's sets as they
+are ingested, so dashboards read a handful of pre-aggregated rows instead
+of aggregating every logged set. ``rebuild`` recomputes the rows of a
+group of users with one grouped query over their sets.
+
+Both lock the users' rows first (``lock_users``). A rebuild then sees every
+workout committed before it and an ingest that is still running merges its
+sets into the rebuilt rows afterwards, instead of being deleted with the
+rows it merged into.
+
+Weeks start on Monday in the current time zone, matching ``TruncWeek``.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Case, Count, DateField, DecimalField, F, FloatField, Max, Sum, Value, When
+from django.db.models.functions import Cast, TruncWeek
+from django.utils import timezone
+
+from accounts.models import User
+from .models import LoggedSet, WeeklyExerciseStats
+
+CENT = Decimal('0.01')
+MERGED_FIELDS = ['sets', 'reps', 'volume', 'max_weight', 'best_e1rm']
+
+
+def week_start(performed_at):
+    local = timezone.localtime(performed_at)
+    return local.date() - timedelta(days=local.weekday())
+
+
+def e1rm(weight, reps):
+    """Epley estimated one-rep max; a single is its own max, a failed set counts for nothing."""
+    if reps <= 0:
+        return Decimal(0)
+    if reps == 1:
+        return Decimal(weight).quantize(CENT)
+    # Same float arithmetic as aggregate_weeks, so rebuilds round identically.
+    return to_cents(float(weight) * (1 + reps / 30))
+
+
+def to_cents(value):
+    return Decimal(repr(float(value))).quantize(CENT, ROUND_HALF_UP)
+
+
+def lock_users(user_ids):
+    """Lock the ``User`` rows of ``user_ids`` until the transaction ends."""
+    list(User.objects.select_for_update().filter(pk__in=user_ids).order_by('pk').values_list('pk', flat=True))
+
+
+def record_sets(user_id, logged_sets):
+    """
+    Merge ``logged_sets`` into the user's weekly rows. Must run inside the
+    transaction that saved the sets.
+    """
+    totals = defaultdict(lambda: {'sets': 0, 'reps': 0, 'volume': Decimal(0),
+                                  'max_weight': Decimal(0), 'best_e1rm': Decimal(0)})
+    for logged in logged_sets:
+        weight = Decimal(logged.weight)
+        row = totals[(logged.exercise_id, week_start(logged.performed_at))]
+        row['sets'] += 1
+        row['reps'] += logged.reps
+        row['volume'] += weight * logged.reps
+        row['max_weight'] = max(row['max_weight'], weight)
+        row['best_e1rm'] = max(row['best_e1rm'], e1rm(weight, logged.reps))
+    if not totals:
+        return
+
+    lock_users([user_id])
+    existing = {
+        (row.exercise_id, row.week): row
+        for row in WeeklyExerciseStats.objects.select_for_update().filter(
+            user_id=user_id,
+            exercise_id__in={exercise_id for exercise_id, _ in totals},
+            week__in={week for _, week in totals},
+        )
+    }
+    rows = []
+    for (exercise_id, week), delta in totals.items():
+        row = existing.get((exercise_id, week)) or WeeklyExerciseStats(
+            user_id=user_id, exercise_id=exercise_id, week=week, volume=Decimal(0),
+            max_weight=Decimal(0), best_e1rm=Decimal(0),
+        )
+        row.sets += delta['sets']
+        row.reps += delta['reps']
+        row.volume = (row.volume + delta['volume']).quantize(CENT)
+        row.max_weight = max(row.max_weight, delta['max_weight'])
+        row.best_e1rm = max(row.best_e1rm, delta['best_e1rm'])
+        rows.append(row)
+    WeeklyExerciseStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user', 'exercise', 'week'],
+        update_fields=MERGED_FIELDS,
+    )
+
+
+def aggregate_weeks(user_ids):
+    """Weekly stats of ``user_ids`` computed from scratch, grouped in the database."""
+    weight = Cast('weight', FloatField())
+    return (
+        LoggedSet.objects.filter(user_id__in=user_ids)
+        .annotate(week=TruncWeek('performed_at', output_field=DateField()))
+        .values('user_id', 'exercise_id', 'week')
+        .annotate(
+            set_count=Count('id'),
+            rep_count=Sum('reps'),
+            total_volume=Sum(F('weight') * F('reps'), output_field=DecimalField(max_digits=12, decimal_places=2)),
+            heaviest=Max('weight'),
+            best=Max(Case(
+                When(reps__lte=0, then=Value(0.0)),
+                When(reps=1, then=weight),
+                default=weight * (1 + Cast('reps', FloatField()) / 30),
+                output_field=FloatField(),
+            )),
+        )
+        .order_by()
+    )
+
+
+def rebuild(user_ids):
+    """Replace the weekly rows of ``user_ids``; returns the number of rows written."""
+    with transaction.atomic():
+        lock_users(user_ids)
+        rows = [
+            WeeklyExerciseStats(
+                user_id=group['user_id'],
+                exercise_id=group['exercise_id'],
+                week=group['week'],
+                sets=group['set_count'],
+                reps=group['rep_count'],
+                volume=Decimal(str(group['total_volume'])).quantize(CENT),
+                max_weight=group['heaviest'],
+                best_e1rm=to_cents(group['best']),
+            )
+            for group in aggregate_weeks(user_ids)
+        ]
+        WeeklyExerciseStats.objects.filter(user_id__in=user_ids).delete()
+        WeeklyExerciseStats.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
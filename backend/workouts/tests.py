@@ -0,0 +1,198 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from programs.models import ProgramCategory, UserPlan
+from programs.tests import make_exercise, make_program
+from .models import LoggedSet, ProgressionRule, ProgressionState, WeeklyExerciseStats, Workout
+from .progression import Rule, advance
+
+
+class WorkoutTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='lifter@example.com', password='x')
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(self.user).access_token}'}
+        category = ProgramCategory.objects.create(name={'en': 'Strength'})
+        self.squat, self.bench = make_exercise('Squat'), make_exercise('Bench')
+        self.program = make_program(self.user, category, [self.squat, self.bench])
+        self.session = self.program.sessions.get(day_number=1)
+        self.planned = list(self.session.exercises.order_by('order'))
+
+    def post(self, payload):
+        return self.client.post(reverse('workout-ingest'), payload, content_type='application/json', **self.auth)
+
+
+class WorkoutIngestTests(WorkoutTestCase):
+    def test_ingest_inserts_sets_in_constant_queries(self):
+        sets = [{'session_exercise': item.pk, 'weight': '100', 'reps': 5, 'rpe': '8'}
+                for item in self.planned for _ in range(5)]
+        # auth user, session, session exercises, exercises, savepoint,
+        # workout, sets, progression (targets, rules, states, upsert), weekly
+        # stats (user lock, rows, upsert), release.
+        with self.assertNumQueries(15):
+            response = self.post({'session': self.session.pk, 'sets': sets})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['sets'], 10)
+
+        workout = Workout.objects.get(pk=response.json()['id'])
+        self.assertEqual(workout.user, self.user)
+        logged = list(workout.sets.order_by('id'))
+        self.assertEqual([s.exercise_id for s in logged], [self.squat.pk] * 5 + [self.bench.pk] * 5)
+        self.assertEqual([s.set_number for s in logged], [1, 2, 3, 4, 5] * 2)
+        self.assertTrue(all(s.user_id == self.user.pk and s.performed_at == workout.performed_at for s in logged))
+
+    def test_ingest_without_session(self):
+        response = self.post({'sets': [{'exercise': self.bench.pk, 'weight': '60.5', 'reps': 8}]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(LoggedSet.objects.get().rpe, None)
+
+    def test_invalid_batches_are_rejected_whole(self):
+        other_session = self.program.sessions.get(day_number=2).exercises.first()
+        for sets in (
+            [],
+            [{'weight': '100', 'reps': 5}],
+            [{'exercise': 999999, 'weight': '100', 'reps': 5}],
+            [{'session_exercise': self.planned[0].pk, 'exercise': self.bench.pk, 'weight': '100', 'reps': 5}],
+            [{'session_exercise': other_session.pk, 'weight': '100', 'reps': 5}],
+            [{'exercise': self.bench.pk, 'weight': '100', 'reps': 5, 'rpe': '11'}],
+        ):
+            response = self.post({'session': self.session.pk, 'sets': sets})
+            self.assertEqual(response.status_code, 400, sets)
+        self.assertFalse(Workout.objects.exists())
+
+    def test_other_users_custom_sessions_are_unknown(self):
+        owner = User.objects.create_user(email='owner@example.com', password='x')
+        custom = make_program(owner, self.program.category, [self.squat], name_en='Private')
+        custom.is_custom = True
+        custom.save()
+        session = custom.sessions.get(day_number=1)
+        item = session.exercises.get()
+        for payload in (
+            {'session': session.pk, 'sets': [{'exercise': self.squat.pk, 'weight': '100', 'reps': 5}]},
+            {'sets': [{'session_exercise': item.pk, 'weight': '100', 'reps': 5}]},
+        ):
+            self.assertEqual(self.post(payload).status_code, 400, payload)
+        self.assertFalse(Workout.objects.exists())
+
+        # Once it is in the user's plan it may be logged against.
+        UserPlan.objects.create(user=self.user, program=custom)
+        self.assertEqual(self.post({'session': session.pk, 'sets': [
+            {'session_exercise': item.pk, 'weight': '100', 'reps': 5}]}).status_code, 201)
+
+    def test_requires_authentication(self):
+        response = self.client.post(reverse('workout-ingest'), {}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class ProgressionTests(WorkoutTestCase):
+    def log(self, day, weight, reps=5):
+        session = self.program.sessions.get(day_number=day)
+        sets = [{'session_exercise': item.pk, 'weight': str(weight), 'reps': reps}
+                for item in session.exercises.all() for _ in range(item.sets)]
+        response = self.post({'session': session.pk, 'sets': sets})
+        self.assertEqual(response.status_code, 201)
+
+    def next_session(self, **params):
+        response = self.client.get(reverse('workout-next'), params, **self.auth)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_advance(self):
+        rule = Rule(Decimal('2.5'), 3, Decimal('0.9'))
+        five_by_five = [(Decimal(100), 5)] * 5
+        self.assertEqual(advance(Decimal(100), 2, five_by_five, (5, 5), rule), (Decimal('102.5'), 0))
+        self.assertEqual(advance(None, 0, [(Decimal(60), 5)] + five_by_five, (5, 5), rule), (Decimal('102.5'), 0))
+        missed = five_by_five[:4] + [(Decimal(100), 3)]
+        self.assertEqual(advance(Decimal(100), 0, missed, (5, 5), rule), (Decimal(100), 1))
+        self.assertEqual(advance(Decimal(100), 2, missed, (5, 5), rule), (Decimal('90.0'), 0))
+        self.assertEqual(advance(Decimal(50), 2, missed, (5, 5), rule._replace(increment=Decimal(5))), (Decimal(45), 0))
+
+    def test_next_session_cycles_days_and_progresses(self):
+        UserPlan.objects.create(user=self.user, program=self.program)
+        data = self.next_session(lang='fr')
+        self.assertEqual(data['session']['day_number'], 1)
+        self.assertEqual([e['exercise_name'] for e in data['exercises']], ['Squat (fr)', 'Bench (fr)'])
+        self.assertEqual([e['weight'] for e in data['exercises']], [None, None])
+
+        ProgressionRule.objects.create(exercise=self.bench, increment=Decimal('1.25'))
+        self.log(1, 100)
+        data = self.next_session()
+        self.assertEqual(data['session']['day_number'], 2)
+        self.assertEqual([e['weight'] for e in data['exercises']], ['102.50', '101.25'])
+
+        for day in (2, 1, 2):
+            self.log(day, 102.5, reps=4)
+        data = self.next_session()
+        self.assertEqual(data['session']['day_number'], 1)
+        squat = data['exercises'][0]
+        self.assertEqual((squat['weight'], squat['failures']), ('90.00', 0))
+
+    def test_next_session_cost_does_not_grow_with_history(self):
+        UserPlan.objects.create(user=self.user, program=self.program)
+        self.log(1, 100)
+        # plan, last workout, session, session exercises, states; the auth
+        # user was cached by the first request
+        with self.assertNumQueries(5):
+            self.next_session()
+        for i in range(10):
+            self.log((i + 1) % 2 + 1, Decimal('102.5') + Decimal('2.5') * i)
+        with self.assertNumQueries(5):
+            self.next_session()
+        self.assertEqual(ProgressionState.objects.get(exercise=self.squat).weight, Decimal('127.5'))
+
+    def test_back_dated_workouts_do_not_rewind_progression(self):
+        self.log(1, 100)
+        sets = [{'exercise': self.squat.pk, 'weight': '60', 'reps': 5}] * 5
+        self.post({'performed_at': '2020-01-01T00:00:00Z', 'sets': sets})
+        self.assertEqual(ProgressionState.objects.get(exercise=self.squat).weight, Decimal('102.5'))
+
+    def test_next_session_without_plan(self):
+        response = self.client.get(reverse('workout-next'), **self.auth)
+        self.assertEqual(response.status_code, 404)
+
+
+class TrainingStatsTests(WorkoutTestCase):
+    FIELDS = ('exercise_id', 'week', 'sets', 'reps', 'volume', 'max_weight', 'best_e1rm')
+
+    def rows(self):
+        return list(WeeklyExerciseStats.objects.order_by('week', 'exercise_id').values_list(*self.FIELDS))
+
+    def test_incremental_rows_match_rebuild(self):
+        squat = [{'exercise': self.squat.pk, 'weight': '100', 'reps': 5}] * 3
+        self.post({'performed_at': '2026-03-02T18:00:00Z', 'sets': squat})  # Monday
+        self.post({'performed_at': '2026-03-08T18:00:00Z', 'sets': squat + [  # Sunday, same week
+            {'exercise': self.squat.pk, 'weight': '122.5', 'reps': 1},
+            {'exercise': self.bench.pk, 'weight': '62.5', 'reps': 7},
+        ]})
+        self.post({'performed_at': '2026-03-09T18:00:00Z', 'sets': [  # next Monday
+            {'exercise': self.squat.pk, 'weight': '102.5', 'reps': 0},
+        ]})
+        incremental = self.rows()
+        self.assertEqual([row[:4] for row in incremental], [
+            (self.squat.pk, date(2026, 3, 2), 7, 31),
+            (self.bench.pk, date(2026, 3, 2), 1, 7),
+            (self.squat.pk, date(2026, 3, 9), 1, 0),
+        ])
+        self.assertEqual(incremental[0][4:], (Decimal('3122.50'), Decimal('122.50'), Decimal('122.50')))
+        self.assertEqual(incremental[1][6], Decimal('77.08'))
+
+        WeeklyExerciseStats.objects.all().delete()
+        call_command('rebuild_training_stats', chunk_size=1, stdout=StringIO())
+        self.assertEqual(self.rows(), incremental)
+
+    def test_endpoint_returns_recent_weeks_and_records(self):
+        self.post({'performed_at': '2020-01-06T12:00:00Z',
+                   'sets': [{'exercise': self.squat.pk, 'weight': '140', 'reps': 3}]})
+        self.post({'sets': [{'exercise': self.squat.pk, 'weight': '100', 'reps': 5}]})
+        response = self.client.get(reverse('workout-stats'), {'exercise': self.squat.pk}, **self.auth)
+        data = response.json()
+        self.assertEqual([row['max_weight'] for row in data['weeks']], [100])
+        self.assertEqual(data['records'], [
+            {'exercise_id': self.squat.pk, 'max_weight': 140, 'best_e1rm': 154},
+        ])
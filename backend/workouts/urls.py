@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.ingest_workout, name='workout-ingest'),
+    path('next/', views.next_session, name='workout-next'),
+    path('stats/', views.training_stats, name='workout-stats'),
+]
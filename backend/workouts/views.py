@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core import catalog
+from . import progression, stats
+from .models import WeeklyExerciseStats
+from .serializers import WorkoutIngestSerializer
+
+MAX_STATS_WEEKS = 104
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def ingest_workout(request):
+    serializer = WorkoutIngestSerializer(data=request.data, context={'user_id': request.user.id})
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=400)
+    workout = serializer.save(user_id=request.user.id)
+    return Response({
+        'id': workout.id,
+        'performed_at': workout.performed_at,
+        'sets': len(workout.logged_sets),
+    }, status=201)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def next_session(request):
+    lang = request.GET.get('lang', 'en')
+    if lang not in catalog.LANGUAGES:
+        lang = 'en'
+    program_id = request.GET.get('program')
+    if program_id is not None and not program_id.isdigit():
+        return Response({'error': 'program must be an id'}, status=400)
+    result = progression.next_session(request.user.id, lang, int(program_id) if program_id else None)
+    if result is None:
+        return Response({'error': 'No plan found'}, status=404)
+    return Response(result)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def training_stats(request):
+    """Weekly volume/e1RM per exercise for the last ``weeks`` weeks, plus all-time records."""
+    try:
+        weeks = min(int(request.GET.get('weeks', 12)), MAX_STATS_WEEKS)
+        exercise_id = int(request.GET['exercise']) if 'exercise' in request.GET else None
+    except ValueError:
+        return Response({'error': 'weeks and exercise must be integers'}, status=400)
+
+    rows = WeeklyExerciseStats.objects.filter(user_id=request.user.id)
+    if exercise_id is not None:
+        rows = rows.filter(exercise_id=exercise_id)
+    since = stats.week_start(timezone.now()) - timedelta(weeks=max(weeks, 1) - 1)
+    return Response({
+        'weeks': list(
+            rows.filter(week__gte=since).order_by('week', 'exercise_id')
+            .values('exercise_id', 'week', 'sets', 'reps', 'volume', 'max_weight', 'best_e1rm')
+        ),
+        'records': list(
+            rows.values('exercise_id').annotate(max_weight=Max('max_weight'), best_e1rm=Max('best_e1rm'))
+            .order_by('exercise_id')
+        ),
+    })